@@ -6,6 +6,11 @@ Source for rules: Wikipedia - "Texas Hold em"
 #####################################################################################
 """
 
+import argparse
+
+from .poker.enums.pacing_mode import PacingMode
+from .poker.hand_history import HandHistoryWriter, HandRecorder
+from .poker.pacing import Pacer
 from .poker.pokergamestate import PokerGameState
 
 
@@ -17,7 +22,26 @@ from .poker.pokergamestate import PokerGameState
 # TODO: Look for bugs
 # TODO: Expand on current functionality
 def main():
-    PokerGameState().play()
+    parser = argparse.ArgumentParser(description="Texas Hold 'em poker in the terminal.")
+    parser.add_argument('--pacing', choices=[mode.name.lower() for mode in PacingMode], default='realtime',
+                        help='realtime keeps the pauses between moves, accelerated shortens them by --speed, '
+                             'and zero skips them')
+    parser.add_argument('--speed', type=float, default=10.0, help='how many times faster accelerated pacing is')
+    parser.add_argument('--render-every', type=int, default=1,
+                        help='only show every Nth hand played by computer players alone')
+    parser.add_argument('--hand-history', metavar='PATH', help='append a record of every hand played to this file')
+    parser.add_argument('--seed', type=int, help='seed the game, so it can be played again')
+    parser.add_argument('--mcts-workers', type=int, default=1,
+                        help='number of processes each Monte Carlo tree search player searches with')
+    args = parser.parse_args()
+    pacer = Pacer(PacingMode[args.pacing.upper()], speed=args.speed, render_every=args.render_every)
+    with PokerGameState(pacer=pacer, seed=args.seed, mcts_workers=args.mcts_workers) as game:
+        if args.hand_history is None:
+            game.play()
+            return
+        with HandHistoryWriter(args.hand_history) as writer:
+            game.events.subscribe(HandRecorder(writer))
+            game.play()
 
 
 if __name__ == '__main__':
@@ -1,48 +1,207 @@
-from ..pokergamestate import PokerGameState
-
-class Expectiminimax:
-
-    def getAction(self, gameState: PokerGameState):
-        legalMoves = gameState.getLegalActions()
-
-        for action in legalMoves:
-            newState = gameState.getSuccessorState(0, action)
-            actionCost = gameState.players[0]
-
-    def getMaxAction(self, gameState: PokerGameState, depth):
-        depth += 1
-
-        if gameState.check_game_over():
-            return self.evaluationFunction(gameState)
-
-        bestScore = -999
-
-        for action in gameState.getLegalActions():
-            newState = gameState.getSuccessorState(0, action)
-            bestScore = max(bestScore, self.getExpectedCost(newState, depth))
-
-        return bestScore
-
-    def getOpponentMaxAction(self, gameState, depth):
-        if gameState.check_game_over():
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from ..enums.betting_move import BettingMove
+from ..enums.computer_playing_style import ComputerPlayingStyle
+from ..hand_state import HandState
+from ..players.player import Player
+from ..utils import isomorphism
+from ..utils import zobrist
+from ..utils.cache_utils import LRUCache, TranspositionTable
+from ..utils.equity import ENUMERATION_LIMIT, calculate_equity
+from ..utils.preflop_equity import MAX_OPPONENTS, preflop_equity
+
+# Probabilities of the moves a computer player of each style makes, in the order HandState.legal_actions lists them,
+# for each of the four situations a player can be in (see Computer.safe_play, risky_play, and random_play)
+_STYLE_PROBABILITIES = {
+    ComputerPlayingStyle.SAFE: {'all_in_or_fold': (.6, .4), 'short': (.6, .2, .2), 'normal': (.7, .2, .1),
+                                'capped': (.9, .1)},
+    ComputerPlayingStyle.RISKY: {'all_in_or_fold': (.9, .1), 'short': (.4, .5, .1), 'normal': (.4, .5, .1),
+                                 'capped': (.9, .1)},
+    ComputerPlayingStyle.RANDOM: {'all_in_or_fold': (.5, .5), 'short': (.3, .36, .34), 'normal': (.33, .33, .34),
+                                  'capped': (.66, .34)},
+}
+
+
+def uniform_opponent_model(state: HandState, legal_actions: list[BettingMove]) -> list[float]:
+    """An opponent model where every legal move is equally likely."""
+    return [1 / len(legal_actions)] * len(legal_actions)
+
+
+def style_opponent_model(playing_style: ComputerPlayingStyle):
+    """Returns an opponent model that plays like a computer player of the given style.
+
+    Styles without fixed move probabilities are modelled as choosing uniformly at random.
+    """
+    if playing_style not in _STYLE_PROBABILITIES:
+        return uniform_opponent_model
+    probabilities = _STYLE_PROBABILITIES[playing_style]
+
+    def opponent_model(state: HandState, legal_actions: list[BettingMove]) -> list[float]:
+        if len(legal_actions) == 2:
+            situation = 'all_in_or_fold' if legal_actions[0] is BettingMove.ALL_IN else 'capped'
+        else:
+            situation = 'short' if legal_actions[1] is BettingMove.ALL_IN else 'normal'
+        return list(probabilities[situation])
+
+    return opponent_model
+
+
+@dataclass(frozen=True)
+class DecisionStats:
+    """Statistics of the search behind one decision.
+
+    Attributes:
+        nodes: Number of nodes visited
+        seconds: Wall clock duration of the search
+    """
+    nodes: int
+    seconds: float
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+
+class Expectiminimax(Player):
+    """A computer player that chooses moves by depth limited expectiminimax search.
+
+    The agent's own decisions are max nodes, opponents' decisions are weighted by an opponent model, and the
+    dealing of community cards are chance nodes. Opponents' hole cards are never dealt: a hand that reaches the
+    showdown or the depth limit is valued by the agent's equity against random hands.
+
+    Args:
+        name: The name of the player
+        game: The game the player plays in, which the player reads the hand from
+        depth: Number of betting decisions to search before evaluating a hand
+        opponent_model: Called with a state and its legal moves, returns the probability of each move
+        chance_samples: Number of deals searched at each chance node, or None to enumerate every deal
+        equity_samples: Number of rollouts used to estimate equity where it is not enumerated
+        enumeration_limit: Largest number of outcomes whose equity is enumerated instead of estimated
+        seed: Seeds the sampling, for reproducible decisions
+        transposition_size: Number of slots of the transposition table, which is kept between decisions
+        equity_cache_size: Number of equities remembered between decisions
+    """
+
+    def __init__(self, name: str, game, depth: int = 2, opponent_model=uniform_opponent_model,
+                 chance_samples: int | None = 4, equity_samples: int = 300, enumeration_limit: int = ENUMERATION_LIMIT,
+                 seed: int | None = None, transposition_size: int = 1 << 16, equity_cache_size: int = 4096):
+        super().__init__(name)
+        self.playing_style = ComputerPlayingStyle.EXPECTIMINIMAX
+        self.game = game
+        self.depth = depth
+        self.opponent_model = opponent_model
+        self.chance_samples = chance_samples
+        self.equity_samples = equity_samples
+        self.enumeration_limit = enumeration_limit
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.default_rng(seed)
+        self.nodes = 0
+        self.last_decision: DecisionStats | None = None
+        self.transpositions = TranspositionTable(transposition_size)
+        self.equities = LRUCache(equity_cache_size)
+        self._agent_index = 0
+        self._hole_cards: tuple[int, int] = ()
+        self._perspective_key = 0
+
+    def choose_next_move(self, table_raise_amount: int, num_times_table_raised: int,
+                         table_last_bet: int) -> BettingMove:
+        """Chooses the move with the highest expected chips won.
+
+        The table arguments are not needed, since the search reads the whole hand from the game.
+        """
+        return self.getAction(self.game.to_hand_state(viewer=self))
+
+    def getAction(self, gameState: HandState) -> BettingMove:
+        """Returns the best move for the player to act in a hand, searched from that player's point of view."""
+        start = time.perf_counter()
+        self.nodes = 0
+        self._agent_index = gameState.to_act
+        self._hole_cards = gameState.holes[self._agent_index]
+        # Values depend on whose point of view they are searched from
+        self._perspective_key = zobrist.SEAT_KEYS[self._agent_index]
+        for card in self._hole_cards:
+            self._perspective_key ^= zobrist.HOLE_KEYS[card]
+        legal_actions = gameState.legal_actions()
+        best_action = legal_actions[0]
+        best_score = -float('inf')
+        for action in legal_actions:
+            score = self.getValue(gameState.apply(action), self.depth - 1)
+            if score > best_score:
+                best_action = action
+                best_score = score
+        self.last_decision = DecisionStats(nodes=self.nodes, seconds=time.perf_counter() - start)
+        return best_action
+
+    def getValue(self, gameState: HandState, depth: int) -> float:
+        """Returns the expected chips the agent wins over the hand from a state."""
+        self.nodes += 1
+        if gameState.is_terminal():
             return self.evaluationFunction(gameState)
-
-        probability = 0.25 # this would be pulled into another method to calculate based on cards to be played
-        expectedValue = 0
-
-        for action in gameState.getLegalActions():
-            currentState = gameState.getSuccessorState(0, action)
-            newScore = self.getMaxAction(currentState, depth)
-            expectedValue += probability * newScore
-        return expectedValue
-
-
-    def evaluationFunction(self, gameState): # this is where we evaluate based on hand value and table value
-        pots = gameState.table.pots
-        lastBet = gameState.table.last_bet
-
-        visibleCards = gameState.table.community
-
-        return 1
-
-
+        key = gameState.key ^ self._perspective_key
+        value = self.transpositions.get(key, depth)
+        if value is not None:
+            return value
+        if gameState.is_chance():
+            value = self.getChanceValue(gameState, depth)
+        elif depth <= 0:
+            value = self.evaluationFunction(gameState)
+        elif gameState.to_act == self._agent_index:
+            value = self.getMaxValue(gameState, depth)
+        else:
+            value = self.getOpponentValue(gameState, depth)
+        self.transpositions.put(key, depth, value)
+        return value
+
+    def getMaxValue(self, gameState: HandState, depth: int) -> float:
+        return max(self.getValue(gameState.apply(action), depth - 1) for action in gameState.legal_actions())
+
+    def getOpponentValue(self, gameState: HandState, depth: int) -> float:
+        legal_actions = gameState.legal_actions()
+        probabilities = self.opponent_model(gameState, legal_actions)
+        return sum(probability * self.getValue(gameState.apply(action), depth - 1)
+                   for action, probability in zip(legal_actions, probabilities) if probability > 0)
+
+    def getChanceValue(self, gameState: HandState, depth: int) -> float:
+        """Averages over the community cards that could be dealt, enumerated or sampled."""
+        unseen = gameState.unseen_cards()
+        n = gameState.pending
+        if self.chance_samples is None or comb(len(unseen), n) <= self.chance_samples:
+            deals = list(combinations(unseen, n))
+        else:
+            deals = [self.rng.sample(unseen, n) for _ in range(self.chance_samples)]
+        return sum(self.getValue(gameState.deal(cards), depth) for cards in deals) / len(deals)
+
+    def evaluationFunction(self, gameState: HandState) -> float:
+        """Estimates the chips the agent wins over the hand.
+
+        If everyone else folded the result is known. Otherwise the agent is expected to win its equity's share
+        of the pot against the opponents still in the hand, treating all bets as called and ignoring side pots.
+        """
+        me = self._agent_index
+        contributed = gameState.committed[me] + gameState.bets[me]
+        if gameState.folded >> me & 1:
+            return -contributed
+        num_opponents = gameState.num_players - 1 - bin(gameState.folded).count('1')
+        if num_opponents == 0:
+            return gameState.pot - contributed
+        return self.getEquity(gameState.board, num_opponents) * gameState.pot - contributed
+
+    def getEquity(self, board: tuple[int, ...], num_opponents: int) -> float:
+        if not board:
+            return preflop_equity(self._hole_cards, min(num_opponents, MAX_OPPONENTS))
+        # Spots that only differ by a relabelling of suits have the same equity
+        key = (isomorphism.canonical_index(self._hole_cards, board), len(board), num_opponents)
+        equity = self.equities.get(key)
+        if equity is None:
+            equity = calculate_equity(self._hole_cards, board, num_opponents, samples=self.equity_samples,
+                                      rng=self.np_rng, enumeration_limit=self.enumeration_limit).equity
+            self.equities.put(key, equity)
+        return equity
@@ -6,6 +6,9 @@ term = Terminal()
 class Card:
     """A standard playing card.
 
+    There are only 52 Cards, created when this module is imported. Card(rank, suit) returns the existing card rather
+    than a new one, so cards are immutable and equal only to themselves.
+
     Attributes:
         rank_value: A number representing the card's rank
             (e.g. 5 for 5, or 12 for Queen)
@@ -16,10 +19,12 @@ class Card:
         suit_symbol: A print symbol representing the card's suit
             (e.g. ♥ for Hearts)
     """
+    __slots__ = ('rank_value', 'suit_value', 'rank_symbol', 'suit_symbol', '_str', '_hash')
+
     RANK_LOWEST = 2
     RANK_HIGHEST = 14
 
-    rank_symbol = {
+    RANK_SYMBOLS = {
         2: '2',
         3: '3',
         4: '4',
@@ -34,18 +39,34 @@ class Card:
         13: 'K',
         14: 'A'
     }
-    suit_symbol = {
+    SUIT_SYMBOLS = {
         'C': term.green('♣'),
         'D': term.cyan('♦'),
         'H': term.red('♥'),
         'S': term.yellow('♠')
     }
 
-    def __init__(self, rank: int, suit: str) -> None:
-        self.rank_value = rank
-        self.suit_value = suit
-        self.rank_symbol = self.rank_symbol[rank]
-        self.suit_symbol = self.suit_symbol[suit]
+    _cards: dict = {}
+
+    def __new__(cls, rank: int, suit: str) -> 'Card':
+        try:
+            return cls._cards[rank, suit]
+        except KeyError:
+            raise ValueError(f'No playing card has rank {rank!r} and suit {suit!r}') from None
+
+    @classmethod
+    def _create(cls, rank: int, suit: str, index: int) -> 'Card':
+        """Creates one of the 52 cards, which only happens when this module is imported."""
+        card = object.__new__(cls)
+        for name, value in (('rank_value', rank),
+                            ('suit_value', suit),
+                            ('rank_symbol', cls.RANK_SYMBOLS[rank]),
+                            ('suit_symbol', cls.SUIT_SYMBOLS[suit]),
+                            ('_hash', index)):
+            object.__setattr__(card, name, value)
+        object.__setattr__(card, '_str', f'[{card.rank_symbol:<2}{card.suit_symbol}]')
+        cls._cards[rank, suit] = card
+        return card
 
     def __str__(self) -> str:
         """Returns a readable string representation of a Card.
@@ -54,15 +75,24 @@ class Card:
             [A ♦]
             [10♥]
         """
-        return f'[{self.rank_symbol:<2}{self.suit_symbol}]'
-
-    def __eq__(self, other: object) -> bool:
-        """Returns true if other card is equal to this one."""
-        if not isinstance(other, Card):
-            return False
-        return (self.rank_value == other.rank_value and
-                self.suit_value == other.suit_value)
+        return self._str
 
     def __hash__(self) -> int:
-        """Returns true if other card is equal to this one."""
-        return hash((self.rank_value, self.suit_value))
+        """Returns the card's position in a fresh deck, so cards hash without collisions."""
+        return self._hash
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __reduce__(self):
+        """Copies and unpickled cards are the same card."""
+        return Card, (self.rank_value, self.suit_value)
+
+
+for suit_index, suit in enumerate(Card.SUIT_SYMBOLS):
+    for rank in range(Card.RANK_LOWEST, Card.RANK_HIGHEST + 1):
+        Card._create(rank, suit, suit_index * (Card.RANK_HIGHEST - Card.RANK_LOWEST + 1) + rank - Card.RANK_LOWEST)
+del suit_index, suit, rank
@@ -1,35 +1,72 @@
+from __future__ import annotations
+
 import random
 
+import numpy as np
+
 from .card import Card
+from .utils import card_utils
+
+# Every deck is filled from the same 52 cards, which are never modified, so refilling allocates only the list holding them
+_INT_CARDS = tuple(range(card_utils.NUM_CARDS))
+_CARDS = tuple(card_utils.ints_to_cards(_INT_CARDS))
+
 
 class Deck:
     """A standard deck of 52 playing cards.
 
+    Args:
+        as_ints: If True, the deck holds int encoded cards (see card_utils) instead of Cards,
+            for headless games and simulations
+        rng: Shuffles the deck, for reproducible deals. A fresh unseeded stream if not given.
+
     Attributes:
-        cards: A list of playing cards remaining in the deck
+        cards: A list of playing cards remaining in the deck, dealt from the end
+        rng: The random stream shuffling the deck, which games replace for every hand
     """
 
-    def __init__(self) -> None:
+    def __init__(self, as_ints: bool = False, rng: random.Random | None = None) -> None:
+        self.as_ints = as_ints
+        self.rng = rng or random.Random()
         self.cards = []
         self.refill()
 
     def refill(self) -> None:
         """Refills deck with 52 standard playing cards."""
-        suits = ['C', 'D', 'H', 'S']
-        self.cards = [Card(rank, suit) for suit in suits for rank in
-                      range(Card.RANK_LOWEST, Card.RANK_HIGHEST + 1)]
+        self.cards = list(_INT_CARDS if self.as_ints else _CARDS)
+
+    def shuffle(self, num_cards: int | None = None) -> None:
+        """Shuffles the deck with a Fisher-Yates shuffle.
 
-    def shuffle(self) -> None:
-        """Shuffles the deck."""
-        random.shuffle(self.cards)
+        Args:
+            num_cards: Only shuffle the cards at the top of the deck, for when no more than this many will be dealt.
+                Each step of the shuffle settles one card from the top, so the top cards are as random as after a
+                full shuffle but the rest of the deck is left unshuffled. Shuffles the whole deck if not given.
+        """
+        cards = self.cards
+        draw = self.rng.random
+        last = len(cards) - 1
+        stop = 0 if num_cards is None else max(last - num_cards, 0)
+        for i in range(last, stop, -1):
+            j = int(draw() * (i + 1))
+            cards[i], cards[j] = cards[j], cards[i]
 
-    def deal(self, n: int) -> list[Card]:
+    def deal(self, n: int) -> list[Card] | list[int]:
         """Deals the specified number of cards from the deck.
 
         Args:
             n: The number of cards to return
+
+        Raises:
+            ValueError: If the deck holds fewer than n cards
         """
-        return [self.cards.pop() for _ in range(n)]
+        split = len(self.cards) - n
+        if split < 0:
+            raise ValueError(f'Cannot deal {n} cards from a deck of {len(self.cards)}.')
+        dealt = self.cards[split:]
+        del self.cards[split:]
+        dealt.reverse()
+        return dealt
 
     def burn(self) -> None:
         """Discards one card from the deck.
@@ -38,10 +75,29 @@ class Deck:
         """
         self.cards.pop()
 
+    @staticmethod
+    def shuffled_decks(num_decks: int, num_cards: int = card_utils.NUM_CARDS,
+                       rng: np.random.Generator | None = None) -> np.ndarray:
+        """Shuffles many int encoded decks at once, for simulations that deal a batch of hands.
+
+        Args:
+            num_decks: The number of decks to shuffle
+            num_cards: The number of cards to keep from the top of each deck
+            rng: The random generator to shuffle with. A fresh unseeded one if not given.
+
+        Returns:
+            A (num_decks, num_cards) uint8 array, each row the top cards of a shuffled deck in the order they
+            would be dealt
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        # Sorting random keys gives each row an independent uniform permutation
+        order = np.argsort(rng.random((num_decks, card_utils.NUM_CARDS)), axis=1)
+        return order[:, :num_cards].astype(np.uint8)
+
     def __str__(self) -> str:
         """Returns a readable string representation of a Deck.
 
         Example:
             [2 ♣] [3 ♣] [4 ♣] [5 ♣] [6 ♣]
         """
-        return ' '.join(str(card) for card in self.cards)
+        return ' '.join(str(card_utils.int_to_card(card) if self.as_ints else card) for card in self.cards)
@@ -0,0 +1,7 @@
+from enum import Enum, auto
+
+
+class PacingMode(Enum):
+    REALTIME = auto()
+    ACCELERATED = auto()
+    ZERO = auto()
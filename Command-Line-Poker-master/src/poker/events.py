@@ -0,0 +1,157 @@
+"""Events the game engine emits while a hand is played, and the bus that delivers them to sinks.
+
+The engine does no I/O of its own. It emits events to an EventBus, and everything that presents or records the game
+(the terminal UI, loggers, stats collectors) is a sink subscribed to the bus. A sink is any callable taking an event.
+
+Events hold references to the live players, so sinks that keep them past the call should copy what they need, and
+every sink sees the same event objects, which sinks must not modify. The engine checks whether the bus has sinks before
+building an event, so a game with no sinks (e.g. a headless one) pays no more than that check. Events are plain
+slotted dataclasses rather than frozen ones, as a hand emits dozens of them and frozen ones are several times slower
+to build.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable
+
+from .enums.betting_move import BettingMove
+from .enums.phase import Phase
+from .players.player import Player
+from .pot import Pot
+
+
+@dataclass(slots=True)
+class HandStarted:
+    """A hand is starting, with the deck shuffled and positions assigned.
+
+    Attributes:
+        hand_number: Number of hands played before this one
+        dealer: The player on the button
+        players: The players dealt into the hand
+        big_blind: The big blind of the hand
+        blinds_increased: Whether the big blind went up for this hand
+    """
+    hand_number: int
+    dealer: Player
+    players: list[Player]
+    big_blind: int
+    blinds_increased: bool
+
+
+@dataclass(slots=True)
+class CardsDealt:
+    """Cards were dealt to the players or the community.
+
+    Attributes:
+        phase: The phase the cards were dealt for
+        cards: Every hole card dealt preflop, or the community cards dealt otherwise
+        run_out: Whether the cards complete the board for a showdown with no betting left, in which case
+            phase is the river
+    """
+    phase: Phase
+    cards: list
+    run_out: bool = False
+
+
+@dataclass(slots=True)
+class BetPlaced:
+    """A player made a move in a round of betting, or posted a blind.
+
+    Attributes:
+        player: The player who moved
+        move: The move made, BET for a blind the player could cover
+        bet: The player's bet in the round after the move
+        blind: 'small' or 'big' if the move posted a blind, else None
+    """
+    player: Player
+    move: BettingMove
+    bet: int
+    blind: str | None = None
+
+
+@dataclass(slots=True)
+class PotsUpdated:
+    """A round of betting ended and its bets were collected into the pots.
+
+    Attributes:
+        pots: The main pot followed by the side pots
+    """
+    pots: list[Pot]
+
+
+@dataclass(slots=True)
+class PotUncontested:
+    """A player was awarded chips without a showdown.
+
+    Attributes:
+        winner: The player awarded the chips
+        pot_num: The side pot only the winner was eligible for, or None if all other players folded and the
+            winner took every pot
+        amount: The number of chips awarded
+    """
+    winner: Player
+    pot_num: int | None
+    amount: int
+
+
+@dataclass(slots=True)
+class Showdown:
+    """A pot was awarded at showdown.
+
+    Attributes:
+        pot_num: Which pot was awarded, 0 for the main pot
+        amount: The number of chips in the pot
+        showdown_players: The players eligible for the pot
+        winners: The players who split the pot
+    """
+    pot_num: int
+    amount: int
+    showdown_players: list[Player]
+    winners: list[Player]
+
+
+@dataclass(slots=True)
+class HandEnded:
+    """Every pot of a hand was awarded.
+
+    Attributes:
+        hand_number: Number of hands played before this one
+    """
+    hand_number: int
+
+
+@dataclass(slots=True)
+class GameOver:
+    """The game ended.
+
+    Attributes:
+        winners: The players with the most chips
+    """
+    winners: list[Player]
+
+
+class EventBus:
+    """Delivers the events emitted by a game to its sinks, in the order they subscribed.
+
+    The bus is falsy while it has no sinks, so emitters can skip building events nobody receives:
+
+        if self.events:
+            self.events.emit(PotsUpdated(self.table.pots))
+    """
+
+    def __init__(self):
+        self.sinks: list[Callable[[object], None]] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.sinks)
+
+    def subscribe(self, sink: Callable[[object], None]) -> None:
+        self.sinks.append(sink)
+
+    def unsubscribe(self, sink: Callable[[object], None]) -> None:
+        self.sinks.remove(sink)
+
+    def emit(self, event) -> None:
+        for sink in self.sinks:
+            sink(event)
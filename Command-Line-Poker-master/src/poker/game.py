@@ -6,10 +6,13 @@ from .deck import Deck
 from .enums.betting_move import BettingMove
 from .enums.computer_playing_style import ComputerPlayingStyle
 from .enums.phase import Phase
+from .events import (BetPlaced, CardsDealt, EventBus, GameOver, HandEnded, HandStarted, PotsUpdated, PotUncontested,
+                     Showdown)
 from .players.computer import Computer
 from .players.human import Human
 from .players.player import Player
 from .prompts import text_prompt
+from .prompts.terminal_sink import TerminalSink
 from .table import Table
 from .utils import hand_ranking_utils
 from .utils import io_utils
@@ -26,6 +29,8 @@ class Game:
         self.players = []
         self.dealer = None
         self.table = Table()
+        self.events = EventBus()
+        self.events.subscribe(TerminalSink(self))
         self.short_pause = 1.0
         self.pause = 2.0
         self.long_pause = 3.0
@@ -42,6 +47,8 @@ class Game:
                 if self.check_hand_over():
                     break
             self.determine_winners()
+            if self.events:
+                self.events.emit(HandEnded(self.table.hands_played))
             self.table.hands_played += 1
             if self.check_game_over():
                 break
@@ -76,27 +83,30 @@ class Game:
         else:
             self.set_game_speed(is_fast=True)
         self.reset_players()
-        self.reset_table()
+        blinds_increased = self.reset_table()
         self.reset_deck()
+        if self.events:
+            self.events.emit(HandStarted(self.table.hands_played, self.dealer, self.get_active_players(),
+                                         self.table.big_blind, blinds_increased))
 
     def reset_players(self) -> None:
         for player in self.players:
             player.reset()
         self.assign_positions()
 
-    def reset_table(self) -> None:
+    def reset_table(self) -> bool:
+        """Resets the table for the active players.
+
+        Returns:
+            True if the big blind increased, False otherwise
+        """
         active_players = self.get_active_players()
         self.table.reset(active_players)
-        if self.table.check_increase_big_blind():
-            text_prompt.clear_screen()
-            text_prompt.show_table(self.players, self.table)
-            text_prompt.show_blind_increase(self.table.big_blind, self.long_pause)
+        return self.table.check_increase_big_blind()
 
     def reset_deck(self) -> None:
         self.deck.refill()
         self.deck.shuffle()
-        text_prompt.clear_screen()
-        text_prompt.show_shuffling(self.pause)
 
     def set_game_speed(self, is_fast: bool) -> None:
         pass
@@ -161,40 +171,45 @@ class Game:
     def deal_cards(self) -> None:
         """Deals cards to the hold and the community."""
         if self.phase is Phase.PREFLOP:
-            text_prompt.show_table(self.players, self.table)
-            text_prompt.show_phase_change_alert(self.phase, self.dealer.name, self.long_pause)
-            self.deal_hole()
+            cards = self.deal_hole()
         elif self.phase is Phase.FLOP:
-            text_prompt.show_phase_change_alert(self.phase, self.dealer.name, self.long_pause)
-            self.deal_community(3)
+            cards = self.deal_community(3)
         else:
-            text_prompt.show_phase_change_alert(self.phase, self.dealer.name, self.long_pause)
-            self.deal_community(1)
-        text_prompt.show_table(self.players, self.table)
+            cards = self.deal_community(1)
+        if self.events:
+            self.events.emit(CardsDealt(self.phase, cards))
 
-    def deal_hole(self) -> None:
+    def deal_hole(self) -> list:
         """Deals two cards to each player.
 
         In poker, you deal one card to each player at a time.
+
+        Returns:
+            The cards dealt, in the order they were dealt
         """
-        text_prompt.show_table(self.players, self.table, self.short_pause)
-        text_prompt.show_dealing_hole(self.dealer.name, self.pause)
+        cards = []
         for i in range(2):
             for player in self.get_active_players():
                 card = self.deck.deal(1)
                 player.hand.extend(card)
+                cards.extend(card)
+        return cards
 
-    def deal_community(self, n: int) -> None:
+    def deal_community(self, n: int) -> list:
         """Deals cards to the community.
 
         In poker, a card is burned before dealing to the community.
 
         Args:
             n: The number of cards to deal to the community
+
+        Returns:
+            The cards dealt
         """
         self.deck.burn()
         cards = self.deck.deal(n)
         self.table.community.extend(cards)
+        return cards
 
     def run_round_of_betting(self):
         """Runs a round of betting."""
@@ -209,24 +224,23 @@ class Game:
         for player in active_players:
             if not player.is_folded and not player.is_all_in:
                 player.is_locked = False
-        self.table.calculate_side_pots(active_players)
-        text_prompt.show_table(self.players, self.table)
+        self.table.collect_bets(active_players)
+        if self.events:
+            self.events.emit(PotsUpdated(self.table.pots))
 
     def run_small_blind_bet(self) -> None:
         player = next(player for player in self.players if player.is_SB)
-        text_prompt.show_bet_blind(player.name, 'small', self.pause)
         wentAllIn = self.table.take_small_blind(player)
-        if wentAllIn:
-            text_prompt.show_player_move(player, BettingMove.ALL_IN, self.pause)
-        text_prompt.show_table(self.players, self.table)
+        if self.events:
+            move = BettingMove.ALL_IN if wentAllIn else BettingMove.BET
+            self.events.emit(BetPlaced(player, move, player.bet, blind='small'))
 
     def run_big_blind_bet(self) -> None:
         player = next(player for player in self.players if player.is_BB)
-        text_prompt.show_bet_blind(player.name, 'big', self.pause)
         wentAllIn = self.table.take_big_blind(player)
-        if wentAllIn:
-            text_prompt.show_player_move(player, BettingMove.ALL_IN, self.pause)
-        text_prompt.show_table(self.players, self.table)
+        if self.events:
+            move = BettingMove.ALL_IN if wentAllIn else BettingMove.BET
+            self.events.emit(BetPlaced(player, move, player.bet, blind='big'))
 
     def get_index_first_act(self) -> int:
         """Determines the index of the first act.
@@ -262,7 +276,8 @@ class Game:
             move = betting_player.choose_next_move(self.table.raise_amount, self.table.num_times_raised,
                                                    self.table.last_bet)
             self.table.take_bet(betting_player, move)
-            text_prompt.show_player_move(betting_player, move, self.pause, betting_player.bet)
+            if self.events:
+                self.events.emit(BetPlaced(betting_player, move, betting_player.bet))
             if move is BettingMove.RAISED or move is BettingMove.BET:
                 for active_player in active_players:
                     if not active_player.is_folded:
@@ -277,7 +292,6 @@ class Game:
                 self.set_game_speed(is_fast=True)
             betting_player.is_locked = True
             betting_index += 1
-            text_prompt.show_table(self.players, self.table)
 
     def check_hand_over(self) -> bool:
         """Checks if the current hand is over.
@@ -293,50 +307,37 @@ class Game:
 
     def determine_winners(self):
         """Determine the winners of each pot and award them their chips."""
-        if self.table.pots[-1][0] == 0:
-            self.table.pots = self.table.pots[:-1]
         unfolded_players = [player for player in self.get_active_players() if not player.is_folded]
         if len(unfolded_players) == 1:
-            winnings = 0
-            for pot in self.table.pots:
-                winnings += pot[0]
             winner = unfolded_players[0]
-            winner.chips += winnings
-            text_prompt.show_table(self.players, self.table)
-            text_prompt.show_default_winner_fold(winner.name)
+            winner.chips += self.table.pot_total
+            if self.events:
+                self.events.emit(PotUncontested(winner, None, self.table.pot_total))
         else:
             # If only 1 player is eligible for last side pot (i.e. other players folded/all-in), award player that pot
-            players_eligible_last_pot = []
-            for player in self.table.pots[-1][1]:
-                if not player.is_folded:
-                    players_eligible_last_pot.append(player)
+            players_eligible_last_pot = self.table.eligible_players(len(self.table.pots) - 1)
             if len(players_eligible_last_pot) == 1:
                 hand_winner = players_eligible_last_pot[0]
-                text_prompt.show_table(self.players, self.table)
-                text_prompt.show_default_winner_eligibility(hand_winner.name, len(self.table.pots) - 1)
-                hand_winner.chips += self.table.pots[-1][0]
+                pot_num = len(self.table.pots) - 1
+                self.table.award_pot(pot_num, [hand_winner])
+                if self.events:
+                    self.events.emit(PotUncontested(hand_winner, pot_num, self.table.pots[pot_num].amount))
                 self.table.pots = self.table.pots[:-1]
-            while len(self.table.community) < 5:
-                self.table.community.extend(self.deck.deal(1))
+            run_out = self.deck.deal(5 - len(self.table.community))
+            self.table.community.extend(run_out)
+            if run_out and self.events:
+                self.events.emit(CardsDealt(Phase.RIVER, run_out, run_out=True))
             self.showdown()
 
     def showdown(self):
         """Runs the showdown phase."""
-        text_prompt.show_table(self.players, self.table)
-
-        # Need to fix this
-        # text_prompt.show_phase_change_alert('Showdown', self.dealer, self.pause)
-
         # Divvy chips to the winner(s) of each pot/side pot
         for i in reversed(range(len(self.table.pots))):
-            showdown_players = []
-            for player in self.table.pots[i][1]:
-                if not player.is_folded:
-                    showdown_players.append(player)
+            showdown_players = self.table.eligible_players(i)
             hand_winners = hand_ranking_utils.determine_showdown_winner(showdown_players, self.table.community)
-            for winner in hand_winners:
-                winner.chips += int(self.table.pots[i][0] / len(hand_winners))
-            text_prompt.show_showdown_results(self.players, self.table, hand_winners, showdown_players, pot_num=i)
+            self.table.award_pot(i, hand_winners)
+            if self.events:
+                self.events.emit(Showdown(i, self.table.pots[i].amount, showdown_players, hand_winners))
 
     def check_game_over(self):
         """Checks if the game is over.
@@ -352,8 +353,8 @@ class Game:
                 player.is_in_game = False
         active_players = self.get_active_players()
         if len(active_players) == 1:
-            text_prompt.show_table(self.players, self.table)
-            text_prompt.show_game_winners(self.players, [active_players[0].name])
+            if self.events:
+                self.events.emit(GameOver(active_players))
             return True
         else:
             while True:
@@ -362,9 +363,9 @@ class Game:
                     "Continue on to next hand? Press (enter) to continue or (n) to stop.   ")
                 if 'n' in user_choice.lower():
                     max_chips = max(self.get_active_players(), key=lambda player: player.chips).chips
-                    winners_names = [player.name for player in self.get_active_players() if player.chips == max_chips]
-                    text_prompt.show_table(self.players, self.table)
-                    text_prompt.show_game_winners(self.players, winners_names)
+                    winners = [player for player in self.get_active_players() if player.chips == max_chips]
+                    if self.events:
+                        self.events.emit(GameOver(winners))
                     return True
                 return False
 
@@ -0,0 +1,332 @@
+"""
+#######################################################################################################################
+A compact binary log of played hands, written by a sink of the game's events and read back as a stream.
+
+A log file starts with a 5 byte header (b'PKHH' and the format version) followed by one record per hand. Each record
+is its length as a little endian uint32, then:
+
+    hand header   hand number (uint32), seats (uint8), dealer seat (uint8), big blind (uint64), board cards (uint8),
+                  actions (uint16), pots (uint8), awards (uint8)
+    per seat      name length (uint8) and UTF-8 name, starting stack (uint64), playing style (uint8, 0 for none),
+                  hole cards (2 x uint8)
+    board         int encoded cards (uint8 each), see card_utils
+    per action    seat (uint8), phase (uint8), move (uint8, any blind in its high bits), bet after the move (uint64)
+    per pot       amount (uint64), bitmask of the eligible seats (uint16)
+    per award     pot number (int8, -1 if everyone else folded), amount (uint64), bitmask of the winning seats (uint16)
+
+Enums are stored as their position in their Enum class. Records are appended through a large buffer, so recording
+costs a list append per action and a buffered write per hand. Reading yields one hand at a time, so logs of any size
+are read in constant memory.
+
+Example:
+    with HandHistoryWriter('hands.pkhh') as writer:
+        game.events.subscribe(HandRecorder(writer))
+        game.play()
+    for hand in read_hand_history('hands.pkhh'):
+        ...
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from typing import Iterator
+
+from .enums.betting_move import BettingMove
+from .enums.computer_playing_style import ComputerPlayingStyle
+from .enums.phase import Phase
+from .events import BetPlaced, CardsDealt, HandEnded, HandStarted, PotsUpdated, PotUncontested, Showdown
+from .pot import Pot
+from .utils import card_utils
+
+MAGIC = b'PKHH'
+VERSION = 1
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+# Layout of the parts of a record
+HAND_HEADER = struct.Struct('<IBBQBHBB')
+SEAT = struct.Struct('<QBBB')
+ACTION = struct.Struct('<BBBQ')
+POT = struct.Struct('<QH')
+AWARD = struct.Struct('<bQH')
+_FILE_HEADER = struct.Struct('<4sB')
+_RECORD_LENGTH = struct.Struct('<I')
+
+# Each enum is stored as its index in these lists
+PHASES = list(Phase)
+MOVES = list(BettingMove)
+STYLES = [None] + list(ComputerPlayingStyle)
+BLINDS = [None, 'small', 'big']
+BLIND_SHIFT = 4
+MOVE_MASK = (1 << BLIND_SHIFT) - 1
+_PHASE_CODES = {phase: code for code, phase in enumerate(PHASES)}
+_MOVE_CODES = {move: code for code, move in enumerate(MOVES)}
+_STYLE_CODES = {style: code for code, style in enumerate(STYLES)}
+_BLIND_CODES = {blind: code for code, blind in enumerate(BLINDS)}
+
+
+@dataclass(frozen=True)
+class Action:
+    """A move made in a hand.
+
+    Attributes:
+        seat: The seat of the player who moved
+        phase: The phase the move was made in
+        move: The move made
+        bet: The player's bet in the round after the move
+        blind: 'small' or 'big' if the move posted a blind, else None
+    """
+    seat: int
+    phase: Phase
+    move: BettingMove
+    bet: int
+    blind: str | None = None
+
+
+@dataclass(frozen=True)
+class Award:
+    """Chips awarded at the end of a hand.
+
+    Attributes:
+        pot_num: The pot awarded, or None if all other players folded and the winner took every pot
+        amount: The number of chips awarded
+        winners: Bitmask of the seats that split the chips
+    """
+    pot_num: int | None
+    amount: int
+    winners: int
+
+
+@dataclass(frozen=True)
+class HandRecord:
+    """Everything that happened in a hand.
+
+    Seats are numbered by the order of the players dealt into the hand.
+
+    Attributes:
+        hand_number: Number of hands the game played before this one
+        dealer: The dealer's seat
+        big_blind: The big blind of the hand
+        names: Name of the player in each seat
+        styles: Playing style of each seat's player, None for players without one
+        stacks: Chips of each seat's player before the blinds
+        hole_cards: Int encoded hole cards of each seat
+        board: Int encoded community cards
+        actions: Every move made, blinds included, in order
+        pots: The main pot followed by the side pots, as the last round of betting left them
+        awards: The chips awarded, in the order they were awarded
+    """
+    hand_number: int
+    dealer: int
+    big_blind: int
+    names: tuple[str, ...]
+    styles: tuple[ComputerPlayingStyle | None, ...]
+    stacks: tuple[int, ...]
+    hole_cards: tuple[tuple[int, int], ...]
+    board: tuple[int, ...]
+    actions: tuple[Action, ...]
+    pots: tuple[Pot, ...]
+    awards: tuple[Award, ...]
+
+
+def pack_action(seat: int, phase: Phase, move: BettingMove, bet: int, blind: str | None = None) -> bytes:
+    """Returns the binary encoding of an action."""
+    return ACTION.pack(seat, _PHASE_CODES[phase], _MOVE_CODES[move] | _BLIND_CODES[blind] << BLIND_SHIFT, bet)
+
+
+def encode_hand(hand: HandRecord) -> bytes:
+    """Returns the binary record of a hand, without its length prefix."""
+    actions = b''.join(pack_action(action.seat, action.phase, action.move, action.bet, action.blind)
+                       for action in hand.actions)
+    return _encode_hand(hand.hand_number, hand.dealer, hand.big_blind, hand.names, hand.styles, hand.stacks,
+                        hand.hole_cards, hand.board, actions, hand.pots, hand.awards)
+
+
+def _encode_hand(hand_number, dealer, big_blind, names, styles, stacks, hole_cards, board, actions: bytes, pots,
+                 awards) -> bytes:
+    """Encodes the fields of a HandRecord, with its actions already packed by pack_action."""
+    parts = [HAND_HEADER.pack(hand_number, len(names), dealer, big_blind, len(board), len(actions) // ACTION.size,
+                               len(pots), len(awards))]
+    for name, style, stack, cards in zip(names, styles, stacks, hole_cards):
+        name_bytes = name.encode()
+        parts.append(bytes((len(name_bytes),)) + name_bytes)
+        parts.append(SEAT.pack(stack, _STYLE_CODES[style], *cards))
+    parts.append(bytes(board))
+    parts.append(actions)
+    for pot in pots:
+        parts.append(POT.pack(pot.amount, pot.eligible))
+    for award in awards:
+        parts.append(AWARD.pack(-1 if award.pot_num is None else award.pot_num, award.amount, award.winners))
+    return b''.join(parts)
+
+
+def decode_hand(data: bytes) -> HandRecord:
+    """Returns the hand encoded by a binary record, without its length prefix."""
+    hand_number, num_seats, dealer, big_blind, num_board, num_actions, num_pots, num_awards = \
+        HAND_HEADER.unpack_from(data)
+    offset = HAND_HEADER.size
+    names, styles, stacks, hole_cards = [], [], [], []
+    for _ in range(num_seats):
+        name_length = data[offset]
+        names.append(data[offset + 1:offset + 1 + name_length].decode())
+        offset += 1 + name_length
+        stack, style_code, first_card, second_card = SEAT.unpack_from(data, offset)
+        offset += SEAT.size
+        stacks.append(stack)
+        styles.append(STYLES[style_code])
+        hole_cards.append((first_card, second_card))
+    board = tuple(data[offset:offset + num_board])
+    offset += num_board
+    actions = []
+    for seat, phase_code, move_code, bet in ACTION.iter_unpack(data[offset:offset + num_actions * ACTION.size]):
+        actions.append(Action(seat, PHASES[phase_code], MOVES[move_code & MOVE_MASK], bet,
+                              BLINDS[move_code >> BLIND_SHIFT]))
+    offset += num_actions * ACTION.size
+    pots = tuple(Pot(amount, eligible)
+                 for amount, eligible in POT.iter_unpack(data[offset:offset + num_pots * POT.size]))
+    offset += num_pots * POT.size
+    awards = tuple(Award(None if pot_num == -1 else pot_num, amount, winners)
+                   for pot_num, amount, winners in AWARD.iter_unpack(data[offset:offset + num_awards * AWARD.size]))
+    return HandRecord(hand_number, dealer, big_blind, tuple(names), tuple(styles), tuple(stacks), tuple(hole_cards),
+                      board, tuple(actions), pots, awards)
+
+
+class HandHistoryWriter:
+    """Appends hand records to a log file through a buffer.
+
+    Args:
+        path: The log file, created with a header if it does not exist
+        buffer_size: Bytes buffered before they are written to the file
+    """
+
+    def __init__(self, path, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.file = open(path, 'ab', buffering=buffer_size)
+        if self.file.tell() == 0:
+            self.file.write(_FILE_HEADER.pack(MAGIC, VERSION))
+
+    def write(self, hand: HandRecord) -> None:
+        self.write_encoded(encode_hand(hand))
+
+    def write_encoded(self, data: bytes) -> None:
+        """Appends a hand already encoded by encode_hand."""
+        self.file.write(_RECORD_LENGTH.pack(len(data)))
+        self.file.write(data)
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self) -> HandHistoryWriter:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_hand_history(path, buffer_size: int = DEFAULT_BUFFER_SIZE) -> Iterator[HandRecord]:
+    """Yields the hands of a log file in the order they were written, reading one record at a time.
+
+    Raises:
+        ValueError: If the file is not a hand history log, or its last record was cut short
+    """
+    for data in read_encoded_hands(path, buffer_size):
+        yield decode_hand(data)
+
+
+def read_encoded_hands(path, buffer_size: int = DEFAULT_BUFFER_SIZE) -> Iterator[bytes]:
+    """Yields the records of a log file as encode_hand returned them, for readers that decode only part of them.
+
+    Raises:
+        ValueError: If the file is not a hand history log, or its last record was cut short
+    """
+    with open(path, 'rb', buffering=buffer_size) as file:
+        header = file.read(_FILE_HEADER.size)
+        if len(header) < _FILE_HEADER.size or _FILE_HEADER.unpack(header) != (MAGIC, VERSION):
+            raise ValueError(f'{path} is not a version {VERSION} hand history log.')
+        while True:
+            length_bytes = file.read(_RECORD_LENGTH.size)
+            if not length_bytes:
+                return
+            if len(length_bytes) < _RECORD_LENGTH.size:
+                raise ValueError(f'The last hand of {path} was cut short.')
+            (length,) = _RECORD_LENGTH.unpack(length_bytes)
+            data = file.read(length)
+            if len(data) < length:
+                raise ValueError(f'The last hand of {path} was cut short.')
+            yield data
+
+
+class HandRecorder:
+    """Records every hand of a game, as a sink of its events.
+
+    Args:
+        writer: Where each hand is written once it ends, a HandHistoryWriter or a hand_store.HandStoreWriter
+    """
+
+    def __init__(self, writer: HandHistoryWriter):
+        self.writer = writer
+        self.seats = {}
+        self.handlers = {
+            HandStarted: self.start_hand,
+            CardsDealt: self.record_cards,
+            BetPlaced: self.record_bet,
+            PotsUpdated: self.record_pots,
+            PotUncontested: self.record_uncontested_pot,
+            Showdown: self.record_showdown,
+            HandEnded: self.end_hand,
+        }
+
+    def __call__(self, event) -> None:
+        handler = self.handlers.get(type(event))
+        if handler is not None:
+            handler(event)
+
+    def start_hand(self, event: HandStarted) -> None:
+        self.hand_number = event.hand_number
+        self.big_blind = event.big_blind
+        self.seats = {player: seat for seat, player in enumerate(event.players)}
+        self.dealer = self.seats[event.dealer]
+        self.names = tuple(player.name for player in event.players)
+        self.styles = tuple(getattr(player, 'playing_style', None) for player in event.players)
+        self.stacks = tuple(player.chips for player in event.players)
+        self.hole_cards = ()
+        self.board = []
+        self.phase_code = _PHASE_CODES[Phase.PREFLOP]
+        # Actions are packed as they are made, so a hand's record is ready when it ends
+        self.actions = bytearray()
+        self.pots = ()
+        self.awards = []
+
+    def record_cards(self, event: CardsDealt) -> None:
+        cards = card_utils.cards_to_ints(event.cards)
+        if event.phase is Phase.PREFLOP:
+            # One card is dealt to each player at a time
+            num_seats = len(self.seats)
+            self.hole_cards = tuple(zip(cards[:num_seats], cards[num_seats:]))
+        else:
+            self.board.extend(cards)
+        if not event.run_out:
+            self.phase_code = _PHASE_CODES[event.phase]
+
+    def record_bet(self, event: BetPlaced) -> None:
+        # pack_action, inlined as it runs for every move of the game
+        move_code = _MOVE_CODES[event.move] | _BLIND_CODES[event.blind] << BLIND_SHIFT
+        self.actions += ACTION.pack(self.seats[event.player], self.phase_code, move_code, event.bet)
+
+    def record_pots(self, event: PotsUpdated) -> None:
+        self.pots = tuple(event.pots)
+
+    def record_uncontested_pot(self, event: PotUncontested) -> None:
+        self.awards.append(Award(event.pot_num, event.amount, 1 << self.seats[event.winner]))
+
+    def record_showdown(self, event: Showdown) -> None:
+        winners = sum(1 << self.seats[player] for player in event.winners)
+        self.awards.append(Award(event.pot_num, event.amount, winners))
+
+    def end_hand(self, event: HandEnded) -> None:
+        self.writer.write_encoded(_encode_hand(self.hand_number, self.dealer, self.big_blind, self.names, self.styles,
+                                               self.stacks, self.hole_cards, self.board, bytes(self.actions),
+                                               self.pots, self.awards))
@@ -0,0 +1,470 @@
+"""
+#######################################################################################################################
+A compact snapshot of a hand in progress, for search agents.
+
+A HandState follows the same betting rules as Table and PokerGameState, but holds everything in ints, tuples, and
+bitmasks so that expanding a node is cheap: apply(move) returns a new state and never changes the old one.
+Cards are int encoded (see card_utils) and players are referred to by their index among the players in the hand.
+
+Board cards that have not been dealt yet make a state a chance node. A state given a runout (the cards still to come,
+in order) deals from it automatically, which is how search agents play out a determinized hand.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+import random
+
+from .enums.betting_move import BettingMove
+from .enums.phase import Phase
+from .utils import card_utils
+from .utils import hand_evaluator
+from .utils import zobrist
+
+_NEXT_PHASE = {Phase.PREFLOP: Phase.FLOP, Phase.FLOP: Phase.TURN, Phase.TURN: Phase.RIVER}
+_NUM_CARDS_DEALT = {Phase.FLOP: 3, Phase.TURN: 1, Phase.RIVER: 1}
+# Moves that re-open the betting for every player still in the hand
+_RAISES = (BettingMove.BET, BettingMove.RAISED)
+MAX_RAISES = 4
+
+
+class HandState:
+    """An immutable snapshot of a hand of poker.
+
+    Attributes:
+        stacks: Chips each player has left to bet
+        bets: Chips each player has bet in the current round of betting
+        committed: Chips each player put in the pot in earlier rounds of betting
+        folded: Bitmask of players who folded
+        all_in: Bitmask of players who are all-in
+        locked: Bitmask of players whose bet is locked in for the current round of betting
+        to_act: Index of the player whose turn it is
+        phase: The current round of betting
+        last_bet: The bet players must match to stay in the hand
+        num_raises: Number of bets and raises in the current round of betting
+        big_blind: The big blind
+        dealer: Index of the dealer
+        board: The community cards dealt so far
+        holes: Each player's two hole cards, or None where unknown
+        runout: Community cards still to come, in the order they will be dealt
+        pending: Number of community cards that must be dealt before play continues
+        terminal: True once the hand is over
+        key: Zobrist hash of the public state (see zobrist), kept up to date as moves are made
+    """
+    __slots__ = ('stacks', 'bets', 'committed', 'folded', 'all_in', 'locked', 'to_act', 'phase', 'last_bet',
+                 'num_raises', 'big_blind', 'dealer', 'board', 'holes', 'runout', 'pending', 'terminal', 'key')
+
+    def __init__(self, stacks: tuple[int, ...], bets: tuple[int, ...], committed: tuple[int, ...], folded: int,
+                 all_in: int, locked: int, to_act: int, phase: Phase, last_bet: int, num_raises: int,
+                 big_blind: int, dealer: int, board: tuple[int, ...] = (),
+                 holes: tuple[tuple[int, int] | None, ...] | None = None, runout: tuple[int, ...] = (),
+                 pending: int = 0, terminal: bool = False) -> None:
+        self.stacks = stacks
+        self.bets = bets
+        self.committed = committed
+        self.folded = folded
+        self.all_in = all_in
+        self.locked = locked
+        self.to_act = to_act
+        self.phase = phase
+        self.last_bet = last_bet
+        self.num_raises = num_raises
+        self.big_blind = big_blind
+        self.dealer = dealer
+        self.board = board
+        self.holes = holes if holes is not None else (None,) * len(stacks)
+        self.runout = runout
+        self.pending = pending
+        self.terminal = terminal
+        self.key = zobrist.hash_state(self)
+
+    @classmethod
+    def new_hand(cls, stacks, big_blind: int, dealer: int = 0, holes=None, runout=()) -> HandState:
+        """Starts a hand: the blinds are posted and the first player is about to act preflop.
+
+        Args:
+            stacks: Chips of each player at the start of the hand
+            big_blind: The big blind
+            dealer: Index of the dealer
+            holes: Each player's two int encoded hole cards, or None where unknown
+            runout: The five community cards to deal, if known
+        """
+        n = len(stacks)
+        state = cls(tuple(stacks), (0,) * n, (0,) * n, 0, 0, 0, dealer, Phase.PREFLOP, 0, 0, big_blind, dealer,
+                    holes=tuple(holes) if holes is not None else None, runout=tuple(runout))
+        # In 2 player poker, the dealer is SB
+        small_blind_index = dealer if n == 2 else (dealer + 1) % n
+        big_blind_index = (small_blind_index + 1) % n
+        state._post_blind(small_blind_index, int(big_blind / 2))
+        state._post_blind(big_blind_index, big_blind)
+        state._advance_to_next_player(dealer if n == 2 else big_blind_index + 1)
+        return state
+
+    @classmethod
+    def from_game(cls, game, viewer=None) -> HandState:
+        """Takes a snapshot of a hand being played by a PokerGameState.
+
+        Args:
+            game (PokerGameState): the game whose current hand is copied
+            viewer (Player): if given, only this player's hole cards are copied, as that player would see the hand
+
+        Returns:
+            HandState: the hand, with players indexed by their position among the game's active players
+        """
+        players = game.get_active_players()
+        table = game.table
+        acting_player = game.acting_player or next(player for player in players
+                                                   if not player.is_folded and not player.is_all_in)
+        folded = all_in = locked = 0
+        for i, player in enumerate(players):
+            folded |= player.is_folded << i
+            all_in |= player.is_all_in << i
+            locked |= player.is_locked << i
+        holes = tuple(tuple(card_utils.cards_to_ints(player.hand)) if viewer is None or player is viewer else None
+                      for player in players)
+        return cls(stacks=tuple(player.chips for player in players), bets=tuple(player.bet for player in players),
+                   committed=tuple(table.contributions.get(player, 0) for player in players), folded=folded,
+                   all_in=all_in, locked=locked, to_act=players.index(acting_player), phase=game.phase,
+                   last_bet=table.last_bet, num_raises=table.num_times_raised, big_blind=table.big_blind,
+                   dealer=next(i for i, player in enumerate(players) if player.is_dealer),
+                   board=tuple(card_utils.cards_to_ints(table.community)), holes=holes)
+
+    @property
+    def num_players(self) -> int:
+        return len(self.stacks)
+
+    @property
+    def current_player(self) -> int:
+        return self.to_act
+
+    @property
+    def pot(self) -> int:
+        return sum(self.committed) + sum(self.bets)
+
+    @property
+    def raise_amount(self) -> int:
+        """The bet a player raises to, as in Table.update_raise_amount."""
+        if self.phase is Phase.PREFLOP or self.phase is Phase.FLOP:
+            return self.last_bet + self.big_blind
+        return self.last_bet + 2 * self.big_blind
+
+    def is_terminal(self) -> bool:
+        return self.terminal
+
+    def is_chance(self) -> bool:
+        """Returns True if community cards must be dealt before play continues."""
+        return self.pending > 0
+
+    def legal_actions(self) -> list[BettingMove]:
+        """Returns the moves the player to act may choose from, following the same rules as the computer players."""
+        if self.terminal or self.pending:
+            return []
+        i = self.to_act
+        chips = self.stacks[i]
+        bet = self.bets[i]
+        last_bet = self.last_bet
+        # If player doesn't have enough chips to raise or just enough chips to raise
+        if chips <= abs(bet - self.raise_amount):
+            # If not enough chips to call
+            if chips <= abs(bet - last_bet):
+                return [BettingMove.ALL_IN, BettingMove.FOLDED]
+            check_or_call = BettingMove.CHECKED if bet == last_bet else BettingMove.CALLED
+            return [check_or_call, BettingMove.ALL_IN, BettingMove.FOLDED]
+        if self.num_raises < MAX_RAISES:
+            if bet == last_bet:
+                return [BettingMove.CHECKED, BettingMove.BET, BettingMove.FOLDED]
+            return [BettingMove.CALLED, BettingMove.RAISED, BettingMove.FOLDED]
+        # If there have been 4 bets/raises in current round
+        return [BettingMove.CHECKED if bet == last_bet else BettingMove.CALLED, BettingMove.FOLDED]
+
+    def apply(self, move: BettingMove) -> HandState:
+        """Returns the state after the player to act makes a move, as in Table.take_bet."""
+        if self.terminal or self.pending:
+            raise ValueError('No player can act in a finished hand or before community cards are dealt.')
+        state = self._copy()
+        i = self.to_act
+        bit = 1 << i
+        if move is BettingMove.CHECKED or move is BettingMove.CALLED:
+            state._match_bet(i, self.last_bet)
+        elif move is BettingMove.BET or move is BettingMove.RAISED:
+            state._set_num_raises(self.num_raises + 1)
+            state._set_last_bet(state._match_bet(i, self.raise_amount))
+            # Every player still in the hand must respond to the raise
+            state._set_locked(state.folded | state.all_in)
+        elif move is BettingMove.ALL_IN:
+            state._go_all_in(i)
+        else:
+            state._set_folded(state.folded | bit)
+        state._set_locked(state.locked | bit)
+        everyone = (1 << len(self.stacks)) - 1
+        unfolded = everyone & ~state.folded
+        # End round of betting when all but one player fold or when all unfolded players have locked in their bets
+        if state.locked | state.all_in == everyone or unfolded & (unfolded - 1) == 0:
+            state._end_round()
+        else:
+            state._advance_to_next_player(i + 1)
+        return state
+
+    def deal(self, cards) -> HandState:
+        """Returns the state after dealing community cards to a chance node.
+
+        Args:
+            cards: int encoded cards, no more than the number pending
+        """
+        cards = tuple(cards)
+        if len(cards) > self.pending:
+            raise ValueError(f'Only {self.pending} community cards are pending, got {len(cards)}.')
+        state = self._copy()
+        state._add_to_board(cards)
+        state._set_pending(self.pending - len(cards))
+        if not state.pending:
+            state._continue_after_deal()
+        return state
+
+    def unseen_cards(self) -> list[int]:
+        """Returns the int encoded cards not on the board or in any known hand."""
+        known = card_utils.cards_to_mask(self.board)
+        for hole in self.holes:
+            if hole is not None:
+                known |= card_utils.cards_to_mask(hole)
+        return card_utils.mask_to_ints(card_utils.FULL_DECK_MASK & ~known)
+
+    def determinize(self, rng: random.Random | None = None, unseen: list[int] | None = None) -> HandState:
+        """Returns a copy with every unknown hole card and every card still to come dealt at random.
+
+        Args:
+            rng: Source of randomness, defaults to the random module
+            unseen: The result of unseen_cards(), for callers that determinize the same state many times
+        """
+        rng = rng or random
+        num_unknown = sum(hole is None for hole in self.holes)
+        num_to_come = 5 - len(self.board)
+        dealt = rng.sample(unseen if unseen is not None else self.unseen_cards(), 2 * num_unknown + num_to_come)
+        state = self._copy()
+        if num_unknown:
+            holes = []
+            for hole in self.holes:
+                if hole is None:
+                    hole = (dealt.pop(), dealt.pop())
+                holes.append(hole)
+            state.holes = tuple(holes)
+        state.runout = tuple(dealt)
+        if state.pending:
+            state = state.deal(state._take_runout(state.pending))
+        return state
+
+    def result(self) -> tuple[int, ...]:
+        """Returns each player's chips won (or lost, if negative) over the hand, once it is over."""
+        if not self.terminal:
+            raise ValueError('The hand is not over.')
+        contributed = [c + b for c, b in zip(self.committed, self.bets)]
+        payouts = self._payouts(contributed)
+        return tuple(payout - contribution for payout, contribution in zip(payouts, contributed))
+
+    # Names used by the search agents
+    get_legal_actions = legal_actions
+    apply_action = apply
+
+    def get_result(self, player: int) -> int:
+        """Returns a player's chips won (or lost, if negative) over the hand, once it is over."""
+        return self.result()[player]
+
+    def _copy(self) -> HandState:
+        state = HandState.__new__(HandState)
+        state.stacks = self.stacks
+        state.bets = self.bets
+        state.committed = self.committed
+        state.folded = self.folded
+        state.all_in = self.all_in
+        state.locked = self.locked
+        state.to_act = self.to_act
+        state.phase = self.phase
+        state.last_bet = self.last_bet
+        state.num_raises = self.num_raises
+        state.big_blind = self.big_blind
+        state.dealer = self.dealer
+        state.board = self.board
+        state.holes = self.holes
+        state.runout = self.runout
+        state.pending = self.pending
+        state.terminal = self.terminal
+        state.key = self.key
+        return state
+
+    # The methods below only ever modify a freshly copied state
+
+    def _post_blind(self, i: int, blind: int) -> None:
+        """Posts a blind, as in Table.take_small_blind and Table.take_big_blind."""
+        if self.stacks[i] > blind:
+            self._set_last_bet(self._match_bet(i, blind))
+        else:
+            self._go_all_in(i)
+
+    def _match_bet(self, i: int, amount: int) -> int:
+        n = amount - self.bets[i]
+        if n < 0 or n > self.stacks[i]:
+            raise ValueError(f'Player {i} made an illegal bet of {amount}.')
+        self._set_chips(i, self.stacks[i] - n, amount)
+        return amount
+
+    def _go_all_in(self, i: int) -> None:
+        bet = self.bets[i] + self.stacks[i]
+        self._set_chips(i, 0, bet)
+        self._set_all_in(self.all_in | 1 << i)
+        if bet > self.last_bet:
+            self._set_last_bet(bet)
+
+    def _advance_to_next_player(self, start: int) -> None:
+        """Passes the turn to the first player from start on who has not folded or gone all-in."""
+        n = len(self.stacks)
+        unable = self.folded | self.all_in
+        for offset in range(n):
+            i = (start + offset) % n
+            if not unable >> i & 1:
+                self._set_to_act(i)
+                return
+
+    def _end_round(self) -> None:
+        """Ends a round of betting, moving on to the next one or to the end of the hand."""
+        n = len(self.stacks)
+        unfolded = ~self.folded & ((1 << n) - 1)
+        if unfolded & (unfolded - 1) == 0 or self.phase is Phase.RIVER:
+            self._set_terminal()
+            return
+        # Bets are moved into the pot
+        for i in range(n):
+            if self.bets[i]:
+                self._set_chips(i, self.stacks[i], 0, self.committed[i] + self.bets[i])
+        self._set_last_bet(0)
+        self._set_num_raises(0)
+        self._set_locked(self.folded)
+        self._set_phase(_NEXT_PHASE[self.phase])
+        able = unfolded & ~self.all_in
+        if able & (able - 1) == 0:
+            # Fewer than two players can bet, so the rest of the board is dealt and the hand goes to showdown
+            self._set_pending(5 - len(self.board))
+        else:
+            self._set_pending(_NUM_CARDS_DEALT[self.phase])
+        if self.runout:
+            cards = self._take_runout(self.pending)
+            self._add_to_board(cards)
+            self._set_pending(self.pending - len(cards))
+            if not self.pending:
+                self._continue_after_deal()
+
+    def _take_runout(self, n: int) -> tuple[int, ...]:
+        cards = self.runout[:n]
+        self.runout = self.runout[n:]
+        return cards
+
+    def _continue_after_deal(self) -> None:
+        """Starts the round of betting the dealt cards belong to, or ends the hand if no more betting is possible."""
+        if len(self.board) == 5 and (self.phase is not Phase.RIVER or self._num_able() < 2):
+            self._set_phase(Phase.RIVER)
+            self._set_terminal()
+            return
+        # In 2 player poker, the dealer acts first
+        n = len(self.stacks)
+        self._advance_to_next_player(self.dealer if n == 2 else self.dealer + 1)
+
+    # The setters below keep the Zobrist hash up to date
+
+    def _set_chips(self, i: int, stack: int, bet: int, committed: int | None = None) -> None:
+        slot = 3 * i
+        self.key ^= (zobrist.chip_key(slot + zobrist.STACK, self.stacks[i])
+                     ^ zobrist.chip_key(slot + zobrist.STACK, stack)
+                     ^ zobrist.chip_key(slot + zobrist.BET, self.bets[i])
+                     ^ zobrist.chip_key(slot + zobrist.BET, bet))
+        self.stacks = self.stacks[:i] + (stack,) + self.stacks[i + 1:]
+        self.bets = self.bets[:i] + (bet,) + self.bets[i + 1:]
+        if committed is not None:
+            self.key ^= (zobrist.chip_key(slot + zobrist.COMMITTED, self.committed[i])
+                         ^ zobrist.chip_key(slot + zobrist.COMMITTED, committed))
+            self.committed = self.committed[:i] + (committed,) + self.committed[i + 1:]
+
+    def _set_last_bet(self, last_bet: int) -> None:
+        self.key ^= zobrist.chip_key(zobrist.LAST_BET, self.last_bet) ^ zobrist.chip_key(zobrist.LAST_BET, last_bet)
+        self.last_bet = last_bet
+
+    def _set_num_raises(self, num_raises: int) -> None:
+        self.key ^= (zobrist.chip_key(zobrist.NUM_RAISES, self.num_raises)
+                     ^ zobrist.chip_key(zobrist.NUM_RAISES, num_raises))
+        self.num_raises = num_raises
+
+    def _set_folded(self, folded: int) -> None:
+        self.key ^= zobrist.flag_key(zobrist.FOLDED, self.folded ^ folded)
+        self.folded = folded
+
+    def _set_all_in(self, all_in: int) -> None:
+        self.key ^= zobrist.flag_key(zobrist.ALL_IN, self.all_in ^ all_in)
+        self.all_in = all_in
+
+    def _set_locked(self, locked: int) -> None:
+        self.key ^= zobrist.flag_key(zobrist.LOCKED, self.locked ^ locked)
+        self.locked = locked
+
+    def _set_to_act(self, to_act: int) -> None:
+        self.key ^= zobrist.TO_ACT_KEYS[self.to_act] ^ zobrist.TO_ACT_KEYS[to_act]
+        self.to_act = to_act
+
+    def _set_phase(self, phase: Phase) -> None:
+        self.key ^= zobrist.PHASE_KEYS[self.phase.value - 1] ^ zobrist.PHASE_KEYS[phase.value - 1]
+        self.phase = phase
+
+    def _set_pending(self, pending: int) -> None:
+        self.key ^= zobrist.PENDING_KEYS[self.pending] ^ zobrist.PENDING_KEYS[pending]
+        self.pending = pending
+
+    def _set_terminal(self) -> None:
+        if not self.terminal:
+            self.key ^= zobrist.TERMINAL_KEY
+            self.terminal = True
+
+    def _add_to_board(self, cards: tuple[int, ...]) -> None:
+        for card in cards:
+            self.key ^= zobrist.CARD_KEYS[card]
+        self.board += cards
+
+    def _num_able(self) -> int:
+        return (~(self.folded | self.all_in) & ((1 << len(self.stacks)) - 1)).bit_count()
+
+    def _payouts(self, contributed: list[int]) -> list[int]:
+        """Splits the pots among the players who win them.
+
+        Pots are layered by contribution level, and each is won by the best hand among the unfolded players
+        who contributed at least that level. Odd chips go to the winners closest to the left of the dealer.
+        """
+        n = len(self.stacks)
+        payouts = [0] * n
+        unfolded = [i for i in range(n) if not self.folded >> i & 1]
+        if len(unfolded) == 1:
+            payouts[unfolded[0]] = sum(contributed)
+            return payouts
+        board_mask = card_utils.cards_to_mask(self.board)
+        scores = {}
+        for i in unfolded:
+            if self.holes[i] is None:
+                raise ValueError(f'The hole cards of player {i} are needed for the showdown.')
+            scores[i] = hand_evaluator.evaluate_mask(board_mask | card_utils.cards_to_mask(self.holes[i]))
+        previous_level = 0
+        carried = 0
+        for level in sorted(set(contributed)):
+            amount = carried + sum(min(c, level) - min(c, previous_level) for c in contributed)
+            previous_level = level
+            eligible = [i for i in unfolded if contributed[i] >= level]
+            if not eligible:
+                carried = amount
+                continue
+            carried = 0
+            best = max(scores[i] for i in eligible)
+            winners = sorted((i for i in eligible if scores[i] == best), key=lambda i: (i - self.dealer - 1) % n)
+            share, odd_chips = divmod(amount, len(winners))
+            for k, i in enumerate(winners):
+                payouts[i] += share + (k < odd_chips)
+        if carried:
+            payouts[max(unfolded, key=lambda i: contributed[i])] += carried
+        return payouts
+
+    def __repr__(self) -> str:
+        return (f'HandState(phase={self.phase.name}, to_act={self.to_act}, stacks={self.stacks}, bets={self.bets}, '
+                f'committed={self.committed}, board={self.board}, terminal={self.terminal})')
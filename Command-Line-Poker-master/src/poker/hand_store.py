@@ -0,0 +1,295 @@
+"""
+#######################################################################################################################
+A columnar on-disk store of recorded hands, for offline analysis of bot behavior over billions of actions.
+
+A store is a directory holding a hands table and an actions table. Tables are split into chunks of whole hands, and
+each chunk is a directory with one .npy file per column, each of a fixed width dtype:
+
+    hands      hand (uint64), hand_number (uint32), num_seats (uint8), dealer (uint8), big_blind (uint64),
+               board (5 x uint8, NO_CARD past the last card dealt), pot (uint64)
+    actions    hand (uint64), seat (uint8), style (uint8), phase (uint8), move (uint8), blind (uint8), bet (uint64),
+               facing (uint8)
+
+The hand column numbers hands across the whole store, so actions can be joined to their hands. Enums are stored as
+their index in the hand_history lists (PHASES, MOVES, STYLES, BLINDS). An action's facing is the last BET, RAISED or
+ALL_IN move (blinds included) made before it in the same round of betting, or NO_MOVE.
+
+Columns are opened with numpy.memmap, so queries read them straight from the page cache without copies, and
+aggregate each chunk with vectorized NumPy.
+
+Hands are added as hand_history records: live, by subscribing a HandRecorder writing to a HandStoreWriter to a game's
+events, or offline, by converting a hand history log with convert_hand_history.
+
+Example:
+    with HandStoreWriter('hands') as writer:
+        game.events.subscribe(HandRecorder(writer))
+        game.play()
+    # Fold frequency of RISKY players on the turn facing a raise
+    HandStore('hands').move_frequency(BettingMove.FOLDED, phase=Phase.TURN, style=ComputerPlayingStyle.RISKY,
+                                      facing=BettingMove.RAISED)
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from .enums.betting_move import BettingMove
+from .enums.computer_playing_style import ComputerPlayingStyle
+from .enums.phase import Phase
+from .hand_history import (ACTION, BLIND_SHIFT, HAND_HEADER, MOVE_MASK, MOVES, PHASES, POT, SEAT, STYLES, HandRecord,
+                           encode_hand, read_encoded_hands)
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+NO_CARD = 0xFF
+NO_MOVE = 0xFF
+MAX_SEATS = 16
+
+HAND_COLUMNS = {
+    'hand': np.dtype('<u8'),
+    'hand_number': np.dtype('<u4'),
+    'num_seats': np.dtype('u1'),
+    'dealer': np.dtype('u1'),
+    'big_blind': np.dtype('<u8'),
+    'board': np.dtype('u1'),
+    'pot': np.dtype('<u8'),
+}
+ACTION_COLUMNS = {
+    'hand': np.dtype('<u8'),
+    'seat': np.dtype('u1'),
+    'style': np.dtype('u1'),
+    'phase': np.dtype('u1'),
+    'move': np.dtype('u1'),
+    'blind': np.dtype('u1'),
+    'bet': np.dtype('<u8'),
+    'facing': np.dtype('u1'),
+}
+TABLES = {'hands': HAND_COLUMNS, 'actions': ACTION_COLUMNS}
+
+# The packed actions of a hand_history record, read as a NumPy array
+_RECORD_ACTION = np.dtype([('seat', 'u1'), ('phase', 'u1'), ('move', 'u1'), ('bet', '<u8')])
+_AGGRESSIVE_MOVES = [MOVES.index(move) for move in (BettingMove.BET, BettingMove.RAISED, BettingMove.ALL_IN)]
+
+
+def _chunk_dirs(path: str, table: str) -> list[str]:
+    table_dir = os.path.join(path, table)
+    if not os.path.isdir(table_dir):
+        return []
+    return [os.path.join(table_dir, name) for name in sorted(os.listdir(table_dir)) if name.startswith('chunk_')]
+
+
+def facing_moves(hands: np.ndarray, phases: np.ndarray, moves: np.ndarray) -> np.ndarray:
+    """Returns the move each action faced: the last aggressive move before it in its round of betting, or NO_MOVE.
+
+    Args:
+        hands: Hand of each action, with the actions of a hand in the order they were made
+        phases: Phase code of each action
+        moves: Move code of each action
+    """
+    index = np.arange(len(moves))
+    last_aggressive = np.maximum.accumulate(np.where(np.isin(moves, _AGGRESSIVE_MOVES), index, -1))
+    previous = np.concatenate(([-1], last_aggressive[:-1]))
+    # The last aggressive move before an action may belong to an earlier round, in which case its round had none
+    source = np.maximum(previous, 0)
+    same_round = (previous >= 0) & (hands[source] == hands) & (phases[source] == phases)
+    return np.where(same_round, moves[source], NO_MOVE).astype(np.uint8)
+
+
+class HandStoreWriter:
+    """Adds hands to a store, writing a chunk each time enough actions are buffered.
+
+    Args:
+        path: The store's directory, created if it does not exist. Hands are appended to an existing store.
+        chunk_size: Number of actions buffered before a chunk is written. Chunks hold whole hands, so they can run a
+            hand over.
+    """
+
+    def __init__(self, path, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        chunks = _chunk_dirs(path, 'hands')
+        self.num_chunks = len(chunks)
+        self.next_hand = sum(np.load(os.path.join(chunk, 'hand.npy'), mmap_mode='r').shape[0] for chunk in chunks)
+        self.reset_buffers()
+
+    def reset_buffers(self) -> None:
+        self.hands = {column: [] for column in HAND_COLUMNS}
+        self.styles = []
+        self.action_counts = []
+        self.actions = bytearray()
+
+    def write(self, hand: HandRecord) -> None:
+        self.write_encoded(encode_hand(hand))
+
+    def write_encoded(self, data: bytes) -> None:
+        """Adds a hand encoded by hand_history.encode_hand."""
+        hand_number, num_seats, dealer, big_blind, num_board, num_actions, num_pots, _ = HAND_HEADER.unpack_from(data)
+        offset = HAND_HEADER.size
+        styles = [0] * MAX_SEATS
+        for seat in range(num_seats):
+            # Skip the seat's name
+            offset += 1 + data[offset]
+            styles[seat] = SEAT.unpack_from(data, offset)[1]
+            offset += SEAT.size
+        board = data[offset:offset + num_board]
+        offset += num_board
+        self.actions += data[offset:offset + num_actions * ACTION.size]
+        offset += num_actions * ACTION.size
+        pot = sum(amount for amount, _ in POT.iter_unpack(data[offset:offset + num_pots * POT.size]))
+
+        hands = self.hands
+        hands['hand'].append(self.next_hand)
+        hands['hand_number'].append(hand_number)
+        hands['num_seats'].append(num_seats)
+        hands['dealer'].append(dealer)
+        hands['big_blind'].append(big_blind)
+        hands['board'].append(board + bytes((NO_CARD,)) * (5 - num_board))
+        hands['pot'].append(pot)
+        self.styles.append(styles)
+        self.action_counts.append(num_actions)
+        self.next_hand += 1
+        if len(self.actions) >= self.chunk_size * ACTION.size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes the buffered hands as a new chunk."""
+        if not self.action_counts:
+            return
+        hand_columns = {column: np.array(values, dtype=HAND_COLUMNS[column])
+                        for column, values in self.hands.items() if column != 'board'}
+        hand_columns['board'] = np.frombuffer(b''.join(self.hands['board']), dtype=np.uint8).reshape(-1, 5)
+
+        actions = np.frombuffer(bytes(self.actions), dtype=_RECORD_ACTION)
+        # Index of each action's hand within the chunk
+        local_hands = np.repeat(np.arange(len(self.action_counts)), self.action_counts)
+        hands = hand_columns['hand'][local_hands]
+        moves = actions['move'] & MOVE_MASK
+        action_columns = {
+            'hand': hands,
+            'seat': actions['seat'],
+            'style': np.array(self.styles, dtype=np.uint8)[local_hands, actions['seat']],
+            'phase': actions['phase'],
+            'move': moves,
+            'blind': actions['move'] >> BLIND_SHIFT,
+            'bet': actions['bet'],
+            'facing': facing_moves(hands, actions['phase'], moves),
+        }
+        for table, columns in (('hands', hand_columns), ('actions', action_columns)):
+            chunk_dir = os.path.join(self.path, table, f'chunk_{self.num_chunks:06d}')
+            os.makedirs(chunk_dir)
+            for column, values in columns.items():
+                np.save(os.path.join(chunk_dir, f'{column}.npy'), values.astype(TABLES[table][column], copy=False))
+        self.num_chunks += 1
+        self.reset_buffers()
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> HandStoreWriter:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def convert_hand_history(log_path, store_path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+    """Adds every hand of a hand history log to a store."""
+    with HandStoreWriter(store_path, chunk_size) as writer:
+        for data in read_encoded_hands(log_path):
+            writer.write_encoded(data)
+
+
+def _codes(values, enum_list: list) -> list[int] | None:
+    """Returns the codes of a filter value, which is None, an enum member, or an iterable of members."""
+    if values is None:
+        return None
+    if not isinstance(values, Iterable):
+        values = [values]
+    return [enum_list.index(value) for value in values]
+
+
+class HandStore:
+    """Read only, memory mapped access to a store.
+
+    Filters of the query methods take an enum member, an iterable of members, or None to not filter.
+
+    Args:
+        path: The store's directory
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def chunks(self, table: str = 'actions', columns: Iterable[str] | None = None) -> Iterator[dict[str, np.memmap]]:
+        """Yields the chunks of a table, each a dict of its columns, for queries the methods do not cover.
+
+        Chunks are mapped one at a time, so a store of any number of chunks stays within the process' memory map
+        limit.
+
+        Args:
+            table: 'hands' or 'actions'
+            columns: If given, only map these columns
+        """
+        columns = TABLES[table] if columns is None else columns
+        for chunk in _chunk_dirs(self.path, table):
+            yield {column: np.load(os.path.join(chunk, f'{column}.npy'), mmap_mode='r') for column in columns}
+
+    @property
+    def num_hands(self) -> int:
+        return sum(len(chunk['hand']) for chunk in self.chunks('hands', ['hand']))
+
+    @property
+    def num_actions(self) -> int:
+        return sum(len(chunk['hand']) for chunk in self.chunks('actions', ['hand']))
+
+    def action_mask(self, chunk: dict[str, np.memmap], phase: Phase | Iterable[Phase] | None = None,
+                    move: BettingMove | Iterable[BettingMove] | None = None,
+                    style: ComputerPlayingStyle | Iterable[ComputerPlayingStyle] | None = None,
+                    facing: BettingMove | Iterable[BettingMove] | None = None) -> np.ndarray:
+        """Returns which actions of a chunk pass the filters."""
+        mask = np.ones(len(chunk['move']), dtype=bool)
+        for column, codes in (('phase', _codes(phase, PHASES)), ('move', _codes(move, MOVES)),
+                              ('style', _codes(style, STYLES)), ('facing', _codes(facing, MOVES))):
+            if codes is not None:
+                mask &= np.isin(chunk[column], codes)
+        return mask
+
+    def _action_chunks(self, **filters) -> Iterator[dict[str, np.memmap]]:
+        """Yields the chunks of the actions table, mapping only the columns the filters need."""
+        columns = ['move'] + [column for column, value in filters.items() if value is not None]
+        return self.chunks('actions', columns)
+
+    def move_counts(self, phase: Phase | Iterable[Phase] | None = None,
+                    style: ComputerPlayingStyle | Iterable[ComputerPlayingStyle] | None = None,
+                    facing: BettingMove | Iterable[BettingMove] | None = None) -> dict[BettingMove, int]:
+        """Returns how often each move was made by the actions that pass the filters."""
+        counts = np.zeros(len(MOVES), dtype=np.int64)
+        for chunk in self._action_chunks(phase=phase, style=style, facing=facing):
+            mask = self.action_mask(chunk, phase=phase, style=style, facing=facing)
+            counts += np.bincount(chunk['move'][mask], minlength=len(MOVES))
+        return dict(zip(MOVES, counts.tolist()))
+
+    def count_actions(self, phase: Phase | Iterable[Phase] | None = None,
+                      move: BettingMove | Iterable[BettingMove] | None = None,
+                      style: ComputerPlayingStyle | Iterable[ComputerPlayingStyle] | None = None,
+                      facing: BettingMove | Iterable[BettingMove] | None = None) -> int:
+        """Returns the number of actions that pass the filters."""
+        return sum(int(np.count_nonzero(self.action_mask(chunk, phase, move, style, facing)))
+                   for chunk in self._action_chunks(phase=phase, style=style, facing=facing))
+
+    def move_frequency(self, move: BettingMove | Iterable[BettingMove],
+                       phase: Phase | Iterable[Phase] | None = None,
+                       style: ComputerPlayingStyle | Iterable[ComputerPlayingStyle] | None = None,
+                       facing: BettingMove | Iterable[BettingMove] | None = None) -> float:
+        """Returns the fraction of the actions that pass the filters that made the move (or one of the moves).
+
+        Returns NaN if no action passes the filters.
+        """
+        counts = self.move_counts(phase=phase, style=style, facing=facing)
+        total = sum(counts.values())
+        if not total:
+            return float('nan')
+        return sum(counts[MOVES[code]] for code in _codes(move, MOVES)) / total
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from src.poker.enums.pacing_mode import PacingMode
+
+
+class Pacer:
+    """Decides how long the game pauses to let moves be read, whether it waits for a key press, and which hands
+    are shown.
+
+    The game asks for pauses in real time seconds, and the pacer scales them for its mode: REALTIME keeps them,
+    ACCELERATED divides them by speed, and ZERO skips them. Outside of REALTIME the game only waits for a key press
+    while a person is playing (see attended), so computer players' games run without stopping.
+
+    Args:
+        mode: How pauses are scaled
+        speed: How many times faster than real time an ACCELERATED game is
+        render_every: Show only every Nth hand played by computer players alone, playing the others unseen.
+            Hands a person plays in are always shown.
+    """
+
+    def __init__(self, mode: PacingMode = PacingMode.REALTIME, speed: float = 1.0, render_every: int = 1):
+        if speed <= 0:
+            raise ValueError(f'Speed must be positive, got {speed}.')
+        if render_every < 1:
+            raise ValueError(f'Hands must be rendered at least every 1 hand, got {render_every}.')
+        self.mode = mode
+        self.speed = speed
+        self.render_every = render_every
+        # Whether a person is playing the current hand
+        self.attended = False
+
+    def delay(self, seconds: float) -> float:
+        """Returns how long to pause for a pause of the given real time length."""
+        if self.mode is PacingMode.ZERO:
+            return 0.0
+        if self.mode is PacingMode.ACCELERATED:
+            return seconds / self.speed
+        return seconds
+
+    @property
+    def waits_for_input(self) -> bool:
+        """Whether the game stops until a key is pressed after showing results."""
+        return self.attended or self.mode is PacingMode.REALTIME
+
+    def renders_hand(self, hand_number: int) -> bool:
+        """Whether a hand played by computer players alone is shown, counting hands from 0."""
+        return hand_number % self.render_every == 0
+
+    def shows_hand(self, hand_number: int) -> bool:
+        """Whether the current hand is shown, counting hands from 0."""
+        return self.attended or self.renders_hand(hand_number)
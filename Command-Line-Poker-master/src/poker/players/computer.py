@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import random
 
 from src.poker.enums.betting_move import BettingMove
@@ -11,11 +13,13 @@ class Computer(Player):
     Args:
         name: The name of the player
         playing_style: An enum which determines how computer will make its next move
+        rng: Source of the player's random choices, for reproducible moves. A fresh unseeded stream if not given.
     """
 
-    def __init__(self, name: str, playing_style: ComputerPlayingStyle):
+    def __init__(self, name: str, playing_style: ComputerPlayingStyle, rng: random.Random | None = None):
         super().__init__(name)
         self.playing_style = playing_style
+        self.rng = rng or random.Random()
 
     def choose_next_move(self, table_raise_amount: int, times_table_raised: int, last_table_bet: int) -> BettingMove:
         """Allows human player to choose their next move (call, raise, fold, etc.).
@@ -37,7 +41,7 @@ class Computer(Player):
 
     def risky_play(self, table_raise_amount: int, num_times_table_raised: int, table_last_bet: int) -> BettingMove:
         """Computer choice to check, call, raise, bet, fold, or go all-in. Player more likely to bet and raise."""
-        x = random.random()
+        x = self.rng.random()
         # If player doesn't have enough chips to raise or just enough chips to raise
         if self.chips <= abs(self.bet - table_raise_amount):
             # If not enough chips to call
@@ -80,7 +84,7 @@ class Computer(Player):
 
     def safe_play(self, table_raise_amount: int, num_times_table_raised: int, table_last_bet: int) -> BettingMove:
         """Computer choice to check, call, raise, bet, fold, or go all-in. Player less likely to bet and raise."""
-        x = random.random()
+        x = self.rng.random()
         # If player doesn't have enough chips to raise or just enough chips to raise
         if self.chips <= abs(self.bet - table_raise_amount):
             # If not enough chips to call
@@ -123,7 +127,7 @@ class Computer(Player):
 
     def random_play(self, table_raise_amount: int, num_times_table_raised: int, table_last_bet: int) -> BettingMove:
         """Computer choice to check, call, raise, bet, fold, or go all-in at random."""
-        x = random.random()
+        x = self.rng.random()
         # If player doesn't have enough chips to raise or just enough chips to raise
         if self.chips <= abs(self.bet - table_raise_amount):
             # If not enough chips to call
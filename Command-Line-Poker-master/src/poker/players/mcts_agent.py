@@ -1,126 +1,334 @@
-from abc import ABC
+from __future__ import annotations
 
-from .player import Player
-from ..enums.betting_move import BettingMove
+import argparse
 import math
+import os
 import random
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
 
-import random
-import math
+from .player import Player
+from ..enums.betting_move import BettingMove
+from ..enums.computer_playing_style import ComputerPlayingStyle
+from ..hand_state import HandState
 
-class MCTSNode:
-    def __init__(self, game_state, parent=None, move=None):
-        self.game_state = game_state
-        self.parent = parent
-        self.move = move
-        self.children = []
-        self.wins = 0
-        self.visits = 0
-        self.untried_actions = game_state.get_legal_actions()
 
-    def ucb1(self, exploration_constant=1.41):
-        if self.visits == 0:
-            return float('inf')
-        return (self.wins / self.visits) + exploration_constant * math.sqrt(math.log(self.parent.visits) / self.visits)
+@dataclass(frozen=True)
+class SearchStats:
+    """Statistics of the search behind one decision.
+
+    Attributes:
+        iterations: Number of playouts run
+        seconds: Wall clock duration of the search
+        nodes: Number of nodes in the tree
+    """
+    iterations: int
+    seconds: float
+    nodes: int
+
+    @property
+    def iterations_per_second(self) -> float:
+        return self.iterations / self.seconds if self.seconds else 0.0
+
 
-    def is_fully_expanded(self):
-        return len(self.untried_actions) == 0
+class MCTSNode:
+    """A node of the search tree, reached by a sequence of moves from the root.
 
-    def add_child(self, child_node):
-        self.children.append(child_node)
-        self.untried_actions.remove(child_node.move)
+    Nodes are shared by every determinization of the hand, so a node stands for what the searching player
+    can observe (the moves made) rather than for one deal of the cards. The moves available depend only on
+    the moves made, so they are the same in every determinization.
 
-    def update(self, win):
-        self.visits += 1
-        self.wins += win
+    Attributes:
+        move: The move that led to this node
+        player: Index of the player who made that move
+        moves: The legal moves from this node, in the order they are expanded
+        children: Child nodes, one for each of the first len(children) moves
+        visits: Number of playouts through this node
+        total: Sum of the rewards of those playouts, for the player who made the move
+    """
+    __slots__ = ('move', 'player', 'parent', 'moves', 'children', 'visits', 'total')
 
-    def select_child(self):
-        return max(self.children, key=lambda node: node.ucb1())
+    def __init__(self, move: BettingMove | None = None, player: int = -1, parent: MCTSNode | None = None):
+        self.move = move
+        self.player = player
+        self.parent = parent
+        self.moves: list[BettingMove] | None = None
+        self.children: list[MCTSNode] = []
+        self.visits = 0
+        self.total = 0.0
 
-    def expand(self):
-        action = self.untried_actions.pop()
-        new_state = self.game_state.apply_action(action)
-        child_node = MCTSNode(game_state=new_state, parent=self, move=action)
-        self.add_child(child_node)
-        return child_node
+    def select_child(self, exploration: float) -> MCTSNode:
+        """Returns the child with the highest upper confidence bound (UCB1)."""
+        log_visits = math.log(self.visits)
+        best_child = None
+        best_ucb = -math.inf
+        for child in self.children:
+            ucb = child.total / child.visits + exploration * math.sqrt(log_visits / child.visits)
+            if ucb > best_ucb:
+                best_child = child
+                best_ucb = ucb
+        return best_child
 
-    def simulate(self):
-        current_state = self.game_state
-        while not current_state.is_terminal():
-            possible_moves = current_state.get_legal_actions()
-            action = random.choice(possible_moves)
-            current_state = current_state.apply_action(action)
-        return current_state.get_result(self.parent.game_state.current_player)
+    def count_nodes(self) -> int:
+        return 1 + sum(child.count_nodes() for child in self.children)
 
 
 class MCTSTree:
-    def __init__(self, root_game_state):
-        self.root = MCTSNode(game_state=root_game_state)
+    """Information set Monte Carlo tree search over a hand.
 
-    def select_promising_node(self):
-        """
-        Selects a node in the tree to expand. Chooses nodes with a balance of high win rates and unexplored potential.
-        """
-        current_node = self.root
-        while current_node.is_fully_expanded() and not current_node.is_leaf():
-            current_node = current_node.select_child()
-        return current_node
+    Every iteration deals the cards the searching player cannot see (opponents' hole cards and the community
+    cards still to come) at random, then selects, expands, plays out, and backpropagates as in ordinary MCTS.
 
-    def expand_node(self, node):
-        """
-        Expands the given node by adding one child node for each untried action.
-        """
-        if not node.is_fully_expanded():
-            return node.expand()
+    Args:
+        root_state: The hand, with only the searching player's hole cards known
+        exploration: The UCB1 exploration constant
+        rng: Source of randomness
+    """
 
-    def backpropagate(self, node, result):
-        """
-        Updates the node and its ancestors with the result of the simulation.
+    def __init__(self, root_state: HandState, exploration: float = 1.41, rng: random.Random | None = None):
+        self.root_state = root_state
+        self.root = MCTSNode()
+        self.exploration = exploration
+        self.rng = rng or random.Random()
+        self.iterations = 0
+        self.unseen = root_state.unseen_cards()
+        # Rewards are chips won, scaled so that they lie in [-1, 1]
+        self.reward_scale = 1 / sum(root_state.stacks[i] + root_state.bets[i] + root_state.committed[i]
+                                    for i in range(root_state.num_players))
+
+    def search(self, time_limit: float | None = None, iterations: int | None = None) -> SearchStats:
+        """Runs iterations until the time limit passes or the number of iterations is reached.
+
+        Args:
+            time_limit: Seconds to search for
+            iterations: Number of iterations to run
         """
+        if time_limit is None and iterations is None:
+            raise ValueError('The search needs a time limit or a number of iterations.')
+        start = time.perf_counter()
+        deadline = start + time_limit if time_limit is not None else math.inf
+        target = self.iterations + iterations if iterations is not None else math.inf
+        # Checking the clock every iteration costs more than a playout, so check it in batches
+        batch = 64 if iterations is None else min(64, iterations)
+        while self.iterations < target and time.perf_counter() < deadline:
+            for _ in range(int(min(batch, target - self.iterations))):
+                self.run_iteration()
+        seconds = time.perf_counter() - start
+        return SearchStats(iterations=self.iterations, seconds=seconds, nodes=self.root.count_nodes())
+
+    def run_iteration(self) -> None:
+        rng = self.rng
+        state = self.root_state.determinize(rng, self.unseen)
+        node = self.root
+        # Selection and expansion
+        while not state.terminal:
+            if node.moves is None:
+                node.moves = state.legal_actions()
+                rng.shuffle(node.moves)
+            children = node.children
+            if len(children) < len(node.moves):
+                move = node.moves[len(children)]
+                node = MCTSNode(move, state.to_act, node)
+                children.append(node)
+                state = state.apply(move)
+                break
+            node = node.select_child(self.exploration)
+            state = state.apply(node.move)
+        # Playout
+        while not state.terminal:
+            legal_actions = state.legal_actions()
+            state = state.apply(legal_actions[int(rng.random() * len(legal_actions))])
+        result = state.result()
+        # Backpropagation
+        scale = self.reward_scale
         while node is not None:
-            node.update(result)
+            node.visits += 1
+            if node.player >= 0:
+                node.total += result[node.player] * scale
             node = node.parent
+        self.iterations += 1
 
-    def best_move(self, simulations_number):
-        """
-        Executes the Monte Carlo Tree Search algorithm for a given number of simulations.
-        """
-        for _ in range(simulations_number):
-            promising_node = self.select_promising_node()
-            if not promising_node.game_state.is_terminal():
-                self.expand_node(promising_node)
-            simulation_result = promising_node.simulate()
-            self.backpropagate(promising_node, simulation_result)
+    def best_move(self) -> BettingMove:
+        """Returns the most visited move from the root."""
+        return max(self.root.children, key=lambda child: child.visits).move
 
-        return self.select_best_move()
+    def root_statistics(self) -> dict[BettingMove, tuple[int, float]]:
+        """Returns the visits and total reward of each move from the root."""
+        return {child.move: (child.visits, child.total) for child in self.root.children}
 
-    def select_best_move(self):
-        """
-        Selects the best move from the root node, based on the highest win rate among its children.
-        """
-        best_win_rate = -1
-        best_move = None
-        for child in self.root.children:
-            if child.visits > 0:
-                win_rate = child.wins / child.visits
-                if win_rate > best_win_rate:
-                    best_win_rate = win_rate
-                    best_move = child.move
-        return best_move
-
-
-class MCTSAgent(Player, ABC):
-    def __init__(self, name, mcts_iterations=100):
+
+def parallel_search(root_state: HandState, num_workers: int, time_limit: float | None = None,
+                    iterations: int | None = None, exploration: float = 1.41, rng: random.Random | None = None,
+                    executor: Executor | None = None) -> tuple[BettingMove, SearchStats]:
+    """Searches a hand with independent trees in worker processes and merges their root statistics.
+
+    Each worker searches for the whole time limit, or for its share of the iterations, so more workers
+    means more playouts for the same wall clock budget.
+
+    Args:
+        root_state: The hand, with only the searching player's hole cards known
+        num_workers: Number of independent searches
+        time_limit: Seconds to search for
+        iterations: Total number of iterations over all workers
+        exploration: The UCB1 exploration constant
+        rng: Seeds the workers' searches
+        executor: Pool to run the searches in, a new pool is started (and shut down) if not given
+
+    Returns:
+        The move with the most visits over all trees, and the combined statistics of the searches
+    """
+    if time_limit is None and iterations is None:
+        raise ValueError('The search needs a time limit or a number of iterations.')
+    rng = rng or random.Random()
+    shares = [None] * num_workers if iterations is None else \
+        [iterations // num_workers + (i < iterations % num_workers) for i in range(num_workers)]
+    seeds = [rng.getrandbits(64) for _ in range(num_workers)]
+    start = time.perf_counter()
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=num_workers) as pool:
+            results = list(pool.map(_search_root, [root_state] * num_workers, [time_limit] * num_workers, shares,
+                                    [exploration] * num_workers, seeds))
+    else:
+        results = list(executor.map(_search_root, [root_state] * num_workers, [time_limit] * num_workers, shares,
+                                    [exploration] * num_workers, seeds))
+    seconds = time.perf_counter() - start
+    merged: dict[BettingMove, list] = {}
+    for _, root_statistics in results:
+        for move, (visits, total) in root_statistics.items():
+            statistics = merged.setdefault(move, [0, 0.0])
+            statistics[0] += visits
+            statistics[1] += total
+    best_move = max(merged, key=lambda move: merged[move][0])
+    stats = SearchStats(iterations=sum(stats.iterations for stats, _ in results), seconds=seconds,
+                        nodes=sum(stats.nodes for stats, _ in results))
+    return best_move, stats
+
+
+def _search_root(root_state: HandState, time_limit: float | None, iterations: int | None, exploration: float,
+                 seed: int) -> tuple[SearchStats, dict[BettingMove, tuple[int, float]]]:
+    """Runs one independent search in a worker."""
+    tree = MCTSTree(root_state, exploration, random.Random(seed))
+    stats = tree.search(time_limit, iterations)
+    return stats, tree.root_statistics()
+
+
+class MCTSAgent(Player):
+    """A computer player that chooses moves by Monte Carlo tree search.
+
+    Args:
+        name: The name of the player
+        game: The game the player plays in, which the player reads the hand from
+        time_limit: Seconds to search for each decision
+        iterations: Number of playouts to run for each decision, instead of or as well as a time limit
+        exploration: The UCB1 exploration constant
+        seed: Seeds the search, for reproducible decisions
+        num_workers: Number of processes searching each decision in parallel, their root statistics are merged
+    """
+
+    def __init__(self, name: str, game, time_limit: float | None = 1.0, iterations: int | None = None,
+                 exploration: float = 1.41, seed: int | None = None, num_workers: int = 1):
         super().__init__(name)
-        self.mcts_iterations = mcts_iterations
+        if time_limit is None and iterations is None:
+            raise ValueError('An MCTS player needs a time limit or a number of iterations.')
+        self.playing_style = ComputerPlayingStyle.MONTE_CARLO_TREE_SEARCH
+        self.game = game
+        self.time_limit = time_limit
+        self.iterations = iterations
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+        self.num_workers = num_workers
+        self.last_search: SearchStats | None = None
+        self._executor: ProcessPoolExecutor | None = None
 
-    def choose_action(self, game_state):
-        """
-        Choose an action based on the MCTS algorithm.
+    def choose_next_move(self, table_raise_amount: int, num_times_table_raised: int,
+                         table_last_bet: int) -> BettingMove:
+        """Chooses the next move by searching the current hand.
+
+        The table arguments are not needed, since the search reads the whole hand from the game.
 
-        :param game_state: The current state of the game.
-        :return: The chosen action.
+        Returns:
+            the most visited move after searching
         """
-        mcts_tree = MCTSTree(game_state)
-        best_move = mcts_tree.best_move(self.mcts_iterations)
-        return best_move
+        state = self.game.to_hand_state(viewer=self)
+        legal_actions = state.legal_actions()
+        if len(legal_actions) == 1:
+            return legal_actions[0]
+        if self.num_workers > 1:
+            # The pool lives as long as the player, so processes are not started for every decision
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.num_workers)
+            move, self.last_search = parallel_search(state, self.num_workers, self.time_limit, self.iterations,
+                                                     self.exploration, self.rng, self._executor)
+            return move
+        tree = MCTSTree(state, self.exploration, self.rng)
+        self.last_search = tree.search(self.time_limit, self.iterations)
+        return tree.best_move()
+
+    def close(self) -> None:
+        """Shuts down the worker processes of a parallel search."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+def benchmark_scaling(worker_counts: list[int], time_limit: float, num_states: int = 20,
+                      seed: int = 0) -> list[tuple[int, float, float]]:
+    """Measures how parallel search scales with the number of workers at a fixed wall clock budget.
+
+    Decisions are made for random heads-up hands. Decision quality is the share of decisions that agree with
+    a reference search using the most workers for four times as long.
+
+    Returns:
+        For each worker count, the playouts per decision and the agreement with the reference
+    """
+    rng = random.Random(seed)
+    states = [_random_state(rng) for _ in range(num_states)]
+    max_workers = max(worker_counts)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        references = [parallel_search(state, max_workers, 4 * time_limit, rng=rng, executor=executor)[0]
+                      for state in states]
+        results = []
+        for num_workers in worker_counts:
+            playouts = 0
+            agreements = 0
+            for state, reference in zip(states, references):
+                move, stats = parallel_search(state, num_workers, time_limit, rng=rng, executor=executor)
+                playouts += stats.iterations
+                agreements += move is reference
+            results.append((num_workers, playouts / num_states, agreements / num_states))
+    return results
+
+
+def _random_state(rng: random.Random) -> HandState:
+    """Returns a heads-up hand where the first player is to act, after a few random moves."""
+    dealt = rng.sample(range(52), 9)
+    state = HandState.new_hand((20000, 20000), big_blind=100, dealer=rng.randrange(2),
+                               holes=(tuple(dealt[:2]), tuple(dealt[2:4])), runout=dealt[4:])
+    for _ in range(rng.randrange(4)):
+        moves = [move for move in state.legal_actions() if move is not BettingMove.FOLDED]
+        next_state = state.apply(rng.choice(moves))
+        if next_state.terminal:
+            break
+        state = next_state
+    holes = tuple(hole if i == state.to_act else None for i, hole in enumerate(state.holes))
+    return HandState(state.stacks, state.bets, state.committed, state.folded, state.all_in, state.locked,
+                     state.to_act, state.phase, state.last_bet, state.num_raises, state.big_blind, state.dealer,
+                     board=state.board, holes=holes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark parallel MCTS at a fixed wall clock budget.')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument('--seconds', type=float, default=0.5)
+    parser.add_argument('--states', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    worker_counts = sorted(set(args.workers))
+    for num_workers, playouts, agreement in benchmark_scaling(worker_counts, args.seconds, args.states, args.seed):
+        print(f'{num_workers:>3} workers  {playouts:>12,.0f} playouts/decision  '
+              f'{agreement:>6.1%} agree with reference')
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,7 @@ from abc import ABC, abstractmethod
 
 from ..card import Card
 from ..enums.betting_move import BettingMove
+from ..utils import card_utils
 
 
 class Player(ABC):
@@ -47,6 +48,11 @@ class Player(ABC):
         self.rank_subtype = ''
         self.kicker_card = None
 
+    @property
+    def hand_mask(self) -> int:
+        """The 52 bit mask of the player's hand, whether it holds Cards or int encoded cards."""
+        return card_utils.cards_to_mask(self.hand)
+
     def match_bet(self, amount: int) -> int:
         if amount < self.bet:
             raise ValueError(f'Player {self.name} made an illegal bet. '
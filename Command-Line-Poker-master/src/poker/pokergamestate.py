@@ -2,35 +2,89 @@ from __future__ import annotations
 
 import random
 
+import numpy as np
+
+from .agents.expectiminimax import Expectiminimax
 from .deck import Deck
 from .enums.betting_move import BettingMove
 from .enums.computer_playing_style import ComputerPlayingStyle
 from .enums.phase import Phase
+from .events import (BetPlaced, CardsDealt, EventBus, GameOver, HandEnded, HandStarted, PotsUpdated, PotUncontested,
+                     Showdown)
+from .hand_history import HandRecord
+from .hand_state import HandState
+from .pacing import Pacer
 from .players.computer import Computer
 from .players.human import Human
+from .players.mcts_agent import MCTSAgent
 from .players.player import Player
 from .prompts import text_prompt
+from .prompts.terminal_sink import TerminalSink
 from .table import Table
 from .utils import hand_ranking_utils
 from .utils import io_utils
 
 
 class PokerGameState:
-    """Control center of the game."""
-
-    def __init__(self):
+    """Control center of the game.
+
+    Attributes:
+        headless_mcts_iterations: Playouts per decision of MCTS players in headless games
+        events: Bus the game emits its events to. Games that are not headless subscribe the terminal UI to it,
+            and other sinks can be added with events.subscribe
+        seed: Seeds every random stream of the game
+        rng: The random stream of the current hand's positions and computer players' moves, see seed_hand
+
+    Args:
+        headless: If True, the game runs without a terminal UI, pauses, or prompts, dealing int encoded
+            cards, so bot games can be simulated at full speed
+        playing_styles: If given, the game is played by one computer player of each style
+        pacer: Scales the game's pauses and picks which hands are shown, real time and every hand by default
+        seed: Seeds the game, for reproducible games. If not given, it is drawn from the random module, so seeding
+            that still reproduces the game.
+        mcts_workers: Number of processes each MCTS player searches with. The processes are shut down when the
+            game ends or is closed.
+    """
+
+    headless_mcts_iterations = 200
+    # Enumerates equities on the heads up river only
+    headless_expectiminimax_enumeration_limit = 2000
+
+    def __init__(self, headless: bool = False, playing_styles: list[ComputerPlayingStyle] | None = None,
+                 pacer: Pacer | None = None, seed: int | None = None, mcts_workers: int = 1):
+        self.headless = headless
+        self.mcts_workers = mcts_workers
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        # Replaced by the hand's own stream once hands are played
+        self.rng = random.Random(f'{self.seed}:setup')
+        self.playing_styles = playing_styles
+        self.pacer = pacer if pacer is not None else Pacer()
+        self.events = EventBus()
+        if not headless:
+            text_prompt.set_pacer(self.pacer)
+            self.events.subscribe(TerminalSink(self))
         self.phase = Phase.PREFLOP
-        self.deck = Deck()
+        self.deck = Deck(as_ints=headless)
         self.players = []
         self.dealer = None
+        # The player choosing a move, while a round of betting is running
+        self.acting_player = None
         self.table = Table()
         self.short_pause = 1.0
         self.pause = 2.0
         self.long_pause = 3.0
         self.setup()
 
-    def play(self) -> None:
-        """Runs the main loop of the game."""
+    def play(self, num_hands: int | None = None, stop_condition=None) -> None:
+        """Runs the main loop of the game.
+
+        The game always ends when only one player has chips left.
+
+        Args:
+            num_hands: If given, stop after playing this many hands
+            stop_condition: If given, called with the game after every hand, and the game stops once it returns True
+        """
+        hands_played = 0
         while True:
             self.reset_for_next_round()
             for phase in Phase:
@@ -40,64 +94,160 @@ class PokerGameState:
                 if self.check_hand_over():
                     break
             self.determine_winners()
+            if self.events:
+                self.events.emit(HandEnded(self.table.hands_played))
             self.table.hands_played += 1
+            hands_played += 1
             if self.check_game_over():
+                self.close()
                 break
+            if num_hands is not None and hands_played >= num_hands:
+                break
+            if stop_condition is not None and stop_condition(self):
+                break
+
+    def close(self) -> None:
+        """Shuts down the worker processes of parallel MCTS players."""
+        for player in self.players:
+            if isinstance(player, MCTSAgent):
+                player.close()
+
+    def __enter__(self) -> PokerGameState:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def setup(self) -> None:
         """Sets up the game before any rounds are run."""
         num_computer_players = 1
         starting_chips = 999999
-        self.create_players(num_computer_players, starting_chips)
+        self.create_players(num_computer_players, starting_chips, self.playing_styles)
         self.table.big_blind = 19999
 
-    def create_players(self, num_computer, starting_chips) -> None:
-        playing_style1 = random.choice(list(ComputerPlayingStyle))
-        human = Computer("Agent", playing_style1)
+    def create_players(self, num_computer, starting_chips, playing_styles=None) -> None:
+        """Creates the players of the game.
+
+        Args:
+            num_computer: The number of computer opponents to the agent
+            starting_chips: The chips each player starts with
+            playing_styles: If given, create one computer player of each style instead
+        """
+        if playing_styles is not None:
+            names = ['Homer', 'Bart', 'Lisa', 'Marge', 'Milhouse', 'Moe', 'Maggie', 'Nelson', 'Ralph', 'Agent']
+            if not 2 <= len(playing_styles) <= len(names):
+                raise ValueError(f'A game needs between 2 and {len(names)} players, got {len(playing_styles)}.')
+            self.players = [self.create_computer(name, playing_style)
+                            for name, playing_style in zip(names, playing_styles)]
+            for player in self.players:
+                player.chips = starting_chips
+            return
+        playing_style1 = self.rng.choice(list(ComputerPlayingStyle))
+        human = self.create_computer("Agent", playing_style1)
         self.players.append(human)
         names = ['Homer', 'Bart', 'Lisa', 'Marge', 'Milhouse', 'Moe', 'Maggie', 'Nelson', 'Ralph']
         computer_names = [n for n in names if n != human.name]
-        random.shuffle(computer_names)
+        self.rng.shuffle(computer_names)
         for _ in range(num_computer):
-            playing_style = random.choice(list(ComputerPlayingStyle))
-            computer = Computer(computer_names.pop(), playing_style)
+            playing_style = self.rng.choice(list(ComputerPlayingStyle))
+            computer = self.create_computer(computer_names.pop(), playing_style)
             self.players.append(computer)
         for player in self.players:
             player.chips = starting_chips
 
+    def create_computer(self, name: str, playing_style: ComputerPlayingStyle) -> Player:
+        """Creates a computer player of the given style."""
+        # Computer players are not seeded here, as seed_hand gives them every hand's random streams
+        if playing_style is ComputerPlayingStyle.MONTE_CARLO_TREE_SEARCH:
+            if self.headless:
+                # A fixed number of iterations rather than a time limit keeps simulated games reproducible
+                return MCTSAgent(name, self, time_limit=None, iterations=self.headless_mcts_iterations,
+                                 num_workers=self.mcts_workers)
+            return MCTSAgent(name, self, num_workers=self.mcts_workers)
+        if playing_style is ComputerPlayingStyle.EXPECTIMINIMAX:
+            if self.headless:
+                # Estimating rather than enumerating equities on the turn keeps simulated games fast
+                return Expectiminimax(name, self, enumeration_limit=self.headless_expectiminimax_enumeration_limit)
+            return Expectiminimax(name, self)
+        return Computer(name, playing_style)
+
     def reset_for_next_round(self) -> None:
         """Gets players, table, and deck ready to play another hand."""
+        self.seed_hand(self.table.hands_played)
         active_players = self.get_active_players()
         # if any(player.is_human for player in active_players):
         if any(isinstance(player, Human) for player in active_players):
             self.set_game_speed(is_fast=False)
+            self.pacer.attended = True
         else:
             self.set_game_speed(is_fast=True)
+            self.pacer.attended = False
         self.reset_players()
-        self.reset_table()
+        blinds_increased = self.reset_table()
         self.reset_deck()
+        if self.events:
+            self.events.emit(HandStarted(self.table.hands_played, self.dealer, self.get_active_players(),
+                                         self.table.big_blind, blinds_increased))
+
+    def seed_hand(self, hand_number: int) -> None:
+        """Gives a hand its own random streams: one shuffling the deck, and one for positions and computer moves.
+
+        The streams depend only on the game's seed and the hand number. A hand is therefore played the same way
+        whenever it starts from the same table, however many hands came before it, which lets fast_forward replay
+        it directly.
+        """
+        self.deck.rng = random.Random(f'{self.seed}:{hand_number}:deck')
+        self.rng = random.Random(f'{self.seed}:{hand_number}:play')
+        for player in self.players:
+            if not isinstance(player, Human):
+                player.rng = self.rng
+            if isinstance(player, Expectiminimax):
+                player.np_rng = np.random.default_rng(self.rng.getrandbits(64))
+
+    def fast_forward(self, hand: HandRecord) -> None:
+        """Sets the table up as it was at the start of a recorded hand, so that hand is played next.
+
+        The hands before it are not played. A game with the seed and playing styles of the one that recorded the
+        hand plays it again move for move, as long as its computer players' moves do not depend on time (e.g.
+        MCTS players searching for a time limit).
+
+        Args:
+            hand: The hand to play next, from the hand history of a game
+        """
+        stacks = dict(zip(hand.names, hand.stacks))
+        for player in self.players:
+            player.chips = stacks.get(player.name, 0)
+            player.is_in_game = player.name in stacks
+        self.table.hands_played = hand.hand_number
+        # Resetting the table for the hand raises the big blind if it is due
+        self.table.big_blind = hand.big_blind // 2 if self.table.check_increase_big_blind() else hand.big_blind
+        # The button moves to the next player on from the last hand's dealer
+        active_players = self.get_active_players()
+        dealer = next(player for player in active_players if player.name == hand.names[hand.dealer])
+        self.dealer = active_players[active_players.index(dealer) - 1]
 
     def reset_players(self) -> None:
         for player in self.players:
             player.reset()
         self.assign_positions()
 
-    def reset_table(self) -> None:
+    def reset_table(self) -> bool:
+        """Resets the table for the active players.
+
+        Returns:
+            True if the big blind increased, False otherwise
+        """
         active_players = self.get_active_players()
         self.table.reset(active_players)
-        if self.table.check_increase_big_blind():
-            text_prompt.clear_screen()
-            text_prompt.show_table(self.players, self.table)
-            text_prompt.show_blind_increase(self.table.big_blind, self.long_pause)
+        return self.table.check_increase_big_blind()
 
     def reset_deck(self) -> None:
         self.deck.refill()
-        self.deck.shuffle()
-        text_prompt.clear_screen()
-        text_prompt.show_shuffling(self.pause)
+        # Only the hole cards, three burns and five community cards are ever dealt
+        self.deck.shuffle(2 * len(self.get_active_players()) + 8)
 
     def set_game_speed(self, is_fast: bool) -> None:
-        pass
+        """Sets the real time length of the pauses, which the pacer scales."""
         if is_fast:
             self.short_pause = 0.5
             self.pause = 1.0
@@ -126,7 +276,7 @@ class PokerGameState:
 
     def determine_positions_randomly(self) -> None:
         active_players = self.get_active_players()
-        dealer_index = random.randrange(0, len(active_players))
+        dealer_index = self.rng.randrange(0, len(active_players))
         active_players[dealer_index].is_dealer = True
         self.dealer = active_players[dealer_index]
         # In 2 player poker, the dealer is SB and acts first pre-flop
@@ -159,44 +309,51 @@ class PokerGameState:
     def deal_cards(self) -> None:
         """Deals cards to the hold and the community."""
         if self.phase is Phase.PREFLOP:
-            text_prompt.show_table(self.players, self.table)
-            text_prompt.show_phase_change_alert(self.phase, self.dealer.name, self.long_pause)
-            self.deal_hole()
+            cards = self.deal_hole()
         elif self.phase is Phase.FLOP:
-            text_prompt.show_phase_change_alert(self.phase, self.dealer.name, self.long_pause)
-            self.deal_community(3)
+            cards = self.deal_community(3)
         else:
-            text_prompt.show_phase_change_alert(self.phase, self.dealer.name, self.long_pause)
-            self.deal_community(1)
-        text_prompt.show_table(self.players, self.table)
+            cards = self.deal_community(1)
+        if self.events:
+            self.events.emit(CardsDealt(self.phase, cards))
 
-    def deal_hole(self) -> None:
+    def deal_hole(self) -> list:
         """Deals two cards to each player.
 
         In poker, you deal one card to each player at a time.
+
+        Returns:
+            The cards dealt, in the order they were dealt
         """
-        text_prompt.show_table(self.players, self.table, self.short_pause)
-        text_prompt.show_dealing_hole(self.dealer.name, self.pause)
+        cards = []
         for i in range(2):
             for player in self.get_active_players():
                 card = self.deck.deal(1)
                 player.hand.extend(card)
+                cards.extend(card)
+        return cards
 
-    def deal_community(self, n: int) -> None:
+    def deal_community(self, n: int) -> list:
         """Deals cards to the community.
 
         In poker, a card is burned before dealing to the community.
 
         Args:
             n: The number of cards to deal to the community
+
+        Returns:
+            The cards dealt
         """
         self.deck.burn()
         cards = self.deck.deal(n)
         self.table.community.extend(cards)
+        return cards
 
     def run_round_of_betting(self):
         """Runs a round of betting."""
         self.table.num_times_raised = 0
+        # Every round of betting starts with no bet to call, other than the blinds preflop
+        self.table.last_bet = 0
         active_players = self.get_active_players()
         if self.phase is Phase.PREFLOP:
             self.run_small_blind_bet()
@@ -207,24 +364,23 @@ class PokerGameState:
         for player in active_players:
             if not player.is_folded and not player.is_all_in:
                 player.is_locked = False
-        self.table.calculate_side_pots(active_players)
-        text_prompt.show_table(self.players, self.table)
+        self.table.collect_bets(active_players)
+        if self.events:
+            self.events.emit(PotsUpdated(self.table.pots))
 
     def run_small_blind_bet(self) -> None:
         player = next(player for player in self.players if player.is_SB)
-        text_prompt.show_bet_blind(player.name, 'small', self.pause)
         wentAllIn = self.table.take_small_blind(player)
-        if wentAllIn:
-            text_prompt.show_player_move(player, BettingMove.ALL_IN, self.pause)
-        text_prompt.show_table(self.players, self.table)
+        if self.events:
+            move = BettingMove.ALL_IN if wentAllIn else BettingMove.BET
+            self.events.emit(BetPlaced(player, move, player.bet, blind='small'))
 
     def run_big_blind_bet(self) -> None:
         player = next(player for player in self.players if player.is_BB)
-        text_prompt.show_bet_blind(player.name, 'big', self.pause)
         wentAllIn = self.table.take_big_blind(player)
-        if wentAllIn:
-            text_prompt.show_player_move(player, BettingMove.ALL_IN, self.pause)
-        text_prompt.show_table(self.players, self.table)
+        if self.events:
+            move = BettingMove.ALL_IN if wentAllIn else BettingMove.BET
+            self.events.emit(BetPlaced(player, move, player.bet, blind='big'))
 
     def get_index_first_act(self) -> int:
         """Determines the index of the first act.
@@ -257,10 +413,12 @@ class PokerGameState:
                 betting_index += 1
                 continue
             self.table.update_raise_amount(self.phase)
+            self.acting_player = betting_player
             move = betting_player.choose_next_move(self.table.raise_amount, self.table.num_times_raised,
                                                    self.table.last_bet)
             self.table.take_bet(betting_player, move)
-            text_prompt.show_player_move(betting_player, move, self.pause, betting_player.bet)
+            if self.events:
+                self.events.emit(BetPlaced(betting_player, move, betting_player.bet))
             if move is BettingMove.RAISED or move is BettingMove.BET:
                 for active_player in active_players:
                     if not active_player.is_folded:
@@ -275,7 +433,7 @@ class PokerGameState:
                 self.set_game_speed(is_fast=True)
             betting_player.is_locked = True
             betting_index += 1
-            text_prompt.show_table(self.players, self.table)
+        self.acting_player = None
 
     def check_hand_over(self) -> bool:
         """Checks if the current hand is over.
@@ -291,56 +449,43 @@ class PokerGameState:
 
     def determine_winners(self):
         """Determine the winners of each pot and award them their chips."""
-        if self.table.pots[-1][0] == 0:
-            self.table.pots = self.table.pots[:-1]
         unfolded_players = [player for player in self.get_active_players() if not player.is_folded]
         if len(unfolded_players) == 1:
-            winnings = 0
-            for pot in self.table.pots:
-                winnings += pot[0]
             winner = unfolded_players[0]
-            winner.chips += winnings
-            text_prompt.show_table(self.players, self.table)
-            text_prompt.show_default_winner_fold(winner.name)
+            winner.chips += self.table.pot_total
+            if self.events:
+                self.events.emit(PotUncontested(winner, None, self.table.pot_total))
         else:
             # If only 1 player is eligible for last side pot (i.e. other players folded/all-in), award player that pot
-            players_eligible_last_pot = []
-            for player in self.table.pots[-1][1]:
-                if not player.is_folded:
-                    players_eligible_last_pot.append(player)
+            players_eligible_last_pot = self.table.eligible_players(len(self.table.pots) - 1)
             if len(players_eligible_last_pot) == 1:
                 hand_winner = players_eligible_last_pot[0]
-                text_prompt.show_table(self.players, self.table)
-                text_prompt.show_default_winner_eligibility(hand_winner.name, len(self.table.pots) - 1)
-                hand_winner.chips += self.table.pots[-1][0]
+                pot_num = len(self.table.pots) - 1
+                self.table.award_pot(pot_num, [hand_winner])
+                if self.events:
+                    self.events.emit(PotUncontested(hand_winner, pot_num, self.table.pots[pot_num].amount))
                 self.table.pots = self.table.pots[:-1]
-            while len(self.table.community) < 5:
-                self.table.community.extend(self.deck.deal(1))
+            run_out = self.deck.deal(5 - len(self.table.community))
+            self.table.community.extend(run_out)
+            if run_out and self.events:
+                self.events.emit(CardsDealt(Phase.RIVER, run_out, run_out=True))
             self.showdown()
 
     def showdown(self):
         """Runs the showdown phase."""
-        text_prompt.show_table(self.players, self.table)
-
-        # Need to fix this
-        # text_prompt.show_phase_change_alert('Showdown', self.dealer, self.pause)
-
         # Divvy chips to the winner(s) of each pot/side pot
         for i in reversed(range(len(self.table.pots))):
-            showdown_players = []
-            for player in self.table.pots[i][1]:
-                if not player.is_folded:
-                    showdown_players.append(player)
+            showdown_players = self.table.eligible_players(i)
             hand_winners = hand_ranking_utils.determine_showdown_winner(showdown_players, self.table.community)
-            for winner in hand_winners:
-                winner.chips += int(self.table.pots[i][0] / len(hand_winners))
-            text_prompt.show_showdown_results(self.players, self.table, hand_winners, showdown_players, pot_num=i)
+            self.table.award_pot(i, hand_winners)
+            if self.events:
+                self.events.emit(Showdown(i, self.table.pots[i].amount, showdown_players, hand_winners))
 
     def check_game_over(self):
         """Checks if the game is over.
 
         If the game is not over (i.e. all but one player has no chips), ask the user if they would
-        like to continue the game.
+        like to continue the game. Headless games never ask.
 
         Returns:
             bool: True if the game is over, False otherwise.
@@ -350,9 +495,14 @@ class PokerGameState:
                 player.is_in_game = False
         active_players = self.get_active_players()
         if len(active_players) == 1:
-            text_prompt.show_table(self.players, self.table)
-            text_prompt.show_game_winners(self.players, [active_players[0].name])
+            if self.events:
+                self.events.emit(GameOver(active_players))
             return True
+        elif self.headless or not self.pacer.waits_for_input:
+            return False
+        elif not self.pacer.shows_hand(self.table.hands_played - 1):
+            # Hands played unseen run on without stopping
+            return False
         else:
             while True:
                 text_prompt.clear_screen()
@@ -360,40 +510,28 @@ class PokerGameState:
                     "Continue on to next hand? Press (enter) to continue or (n) to stop.   ")
                 if 'n' in user_choice.lower():
                     max_chips = max(self.get_active_players(), key=lambda player: player.chips).chips
-                    winners_names = [player.name for player in self.get_active_players() if player.chips == max_chips]
-                    text_prompt.show_table(self.players, self.table)
-                    text_prompt.show_game_winners(self.players, winners_names)
+                    winners = [player for player in self.get_active_players() if player.chips == max_chips]
+                    if self.events:
+                        self.events.emit(GameOver(winners))
                     return True
                 return False
 
-    def getLegalActions(self):
-        return [BettingMove.FOLDED, BettingMove.RAISED, BettingMove.CALLED, BettingMove.ALL_IN]
-
-    def getSuccessorState(self, playerIndex, action):
-        if self.check_game_over():
-            raise Exception("Game over, no successor state")
-
-        state = PokerGameState(self)
-        player = state.players[playerIndex]
-        active_players = state.get_active_players()
-
-        state.table.take_bet(player, action) # take the best
-
-        #Below might not be needed FROM HERE
-        if move is BettingMove.RAISED or move is BettingMove.BET:
-            for active_player in active_players: # the remaining player is defin
-                if not active_player.is_folded:
-                    active_player.is_locked = False
-            for person in active_players:
-                if person.is_all_in:
-                    person.is_locked = True
-        ## UNTIL HERE
-
-        return state
-
+    def to_hand_state(self, viewer: Player | None = None) -> HandState:
+        """Takes an immutable snapshot of the current hand, for search agents.
 
+        Args:
+            viewer: If given, only this player's hole cards are included in the snapshot
+        """
+        return HandState.from_game(self, viewer)
 
+    def getLegalActions(self) -> list[BettingMove]:
+        return self.to_hand_state().legal_actions()
 
+    def getSuccessorState(self, player_index: int, action: BettingMove) -> HandState:
+        state = self.to_hand_state()
+        if player_index != state.to_act:
+            raise ValueError(f'It is not the turn of player {player_index}.')
+        return state.apply(action)
 
     def get_active_players(self) -> list[Player]:
         return [player for player in self.players if player.is_in_game]
\ No newline at end of file
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Pot:
+    """A main or side pot.
+
+    Attributes:
+        amount: Number of chips in the pot
+        eligible: Bitmask of the seats that can win the pot, with bit i set for seat i
+    """
+    amount: int
+    eligible: int
+
+    def is_eligible(self, seat: int) -> bool:
+        return bool(self.eligible >> seat & 1)
+
+    def eligible_seats(self) -> list[int]:
+        """Returns the seats that can win the pot, lowest first."""
+        seats = []
+        mask = self.eligible
+        while mask:
+            low_bit = mask & -mask
+            seats.append(low_bit.bit_length() - 1)
+            mask ^= low_bit
+        return seats
+
+
+def build_pots(contributions: list[int], folded: int = 0) -> list[Pot]:
+    """Splits the chips each seat has put in over a hand into a main pot and side pots.
+
+    Each distinct contribution level caps a layer of chips, which every seat that put in at least that level and
+    has not folded can win. The levels are visited once in sorted order, and layers that the same seats can win are
+    merged into one pot. Chips no unfolded seat matched (a folded player's raise above everyone else) go to the pot
+    below them.
+
+    Args:
+        contributions: Chips put in by each seat
+        folded: Bitmask of the seats that folded
+
+    Returns:
+        The main pot followed by the side pots, each eligible to a subset of the seats of the one before. There is
+        always at least a main pot, which is empty if nothing was put in.
+    """
+    num_seats = len(contributions)
+    eligible = ((1 << num_seats) - 1) & ~folded
+    pots: list[Pot] = []
+    previous_level = 0
+    for k, seat in enumerate(sorted(range(num_seats), key=contributions.__getitem__)):
+        level = contributions[seat]
+        if level > previous_level:
+            # The seats from this one on in sorted order all put in at least this level
+            amount = (level - previous_level) * (num_seats - k)
+            if pots and (pots[-1].eligible == eligible or not eligible):
+                pots[-1] = Pot(pots[-1].amount + amount, pots[-1].eligible)
+            else:
+                pots.append(Pot(amount, eligible))
+            previous_level = level
+        eligible &= ~(1 << seat)
+    return pots or [Pot(0, ((1 << num_seats) - 1) & ~folded)]
+
+
+def seat_pots(pots: list[Pot], num_seats: int) -> list[int]:
+    """Returns a bitmask of the pots each seat can win, with bit k set if the seat is eligible for pots[k]."""
+    masks = [0] * num_seats
+    for k, pot in enumerate(pots):
+        for seat in pot.eligible_seats():
+            masks[seat] |= 1 << k
+    return masks
+
+
+def split_pot(amount: int, num_winners: int) -> list[int]:
+    """Splits a pot between winners, giving the odd chips one each to the first winners.
+
+    Winners should be ordered starting from the left of the dealer, as the rules of poker give them the odd chips.
+    """
+    share, odd_chips = divmod(amount, num_winners)
+    return [share + (k < odd_chips) for k in range(num_winners)]
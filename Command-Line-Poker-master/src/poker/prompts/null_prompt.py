@@ -0,0 +1,53 @@
+"""Stand-ins for the text_prompt functions the terminal sink calls, for hands it plays unseen.
+
+Every function accepts the same arguments as its text_prompt counterpart and does nothing:
+no rendering, no pauses, and no waiting for input.
+"""
+
+
+def clear_screen():
+    pass
+
+
+def show_table(initial_players, table, time=0):
+    pass
+
+
+def show_showdown_results(initial_players, table, hand_winners, showdown_players, pot_num):
+    pass
+
+
+def show_game_winners(initial_players, winners_names):
+    pass
+
+
+def show_shuffling(time):
+    pass
+
+
+def show_dealing_hole(dealer_name, time):
+    pass
+
+
+def show_blind_increase(blind_amount, time):
+    pass
+
+
+def show_player_move(player, move, pause, bet=None):
+    pass
+
+
+def show_bet_blind(player_name, blind_size, time):
+    pass
+
+
+def show_default_winner_fold(player_name):
+    pass
+
+
+def show_default_winner_eligibility(player_name, side_pot_num):
+    pass
+
+
+def show_phase_change_alert(phase, dealer, pause_time):
+    pass
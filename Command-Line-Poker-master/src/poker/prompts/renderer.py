@@ -0,0 +1,71 @@
+"""Draws the table to the terminal, rewriting only what changed since the last frame.
+
+The renderer keeps a model of the lines it last drew. A new frame moves the cursor to each line that differs and
+rewrites that line alone, then clears everything below the frame, where messages such as player moves were printed
+since the last frame. Clearing the screen outside the renderer must be followed by invalidate, so the next frame is
+drawn in full.
+
+Outputs that are not terminals (e.g. IDE consoles and pipes) can not move the cursor, so every frame is printed
+in full below the last one.
+"""
+
+from __future__ import annotations
+
+import sys
+
+from src.poker.utils import io_utils
+
+
+class TableRenderer:
+    """Draws frames, given as lists of lines, to a terminal.
+
+    Args:
+        term: The blessed Terminal to draw with, or None for the one shared through io_utils
+        stream: Where to write, or None for the terminal's stream
+    """
+
+    def __init__(self, term=None, stream=None):
+        self._term = term
+        self._stream = stream
+        self.lines: list[str] | None = None
+        self.lines_drawn = 0
+
+    @property
+    def term(self):
+        return self._term if self._term is not None else io_utils.get_terminal()
+
+    @property
+    def stream(self):
+        if self._stream is not None:
+            return self._stream
+        return self._term.stream if self._term is not None else sys.stdout
+
+    def invalidate(self) -> None:
+        """Forgets the screen model, so the next frame is drawn in full."""
+        self.lines = None
+
+    def draw(self, lines: list[str]) -> None:
+        """Draws a frame over the last one, leaving the cursor on the line below it."""
+        term = self.term
+        if not term.does_styling:
+            self.stream.write('\n'.join(lines) + '\n')
+            self.stream.flush()
+            self.lines_drawn += len(lines)
+            return
+        previous = self.lines
+        output = []
+        # A frame taller than the screen scrolls it, moving every line away from where the model has it
+        if previous is None or len(lines) >= term.height:
+            output.append(term.home + term.clear)
+            previous = []
+        for row, line in enumerate(lines):
+            if row >= len(previous) or previous[row] != line:
+                output.append(term.move_yx(row, 0) + line + term.clear_eol)
+                self.lines_drawn += 1
+        output.append(term.move_yx(len(lines), 0) + term.clear_eos)
+        self.stream.write(''.join(output))
+        self.stream.flush()
+        self.lines = list(lines)
+
+
+table_renderer = TableRenderer()
@@ -0,0 +1,94 @@
+"""Presents a game in the terminal, as a sink of the events the game emits.
+
+The sink draws the table and shows each event through text_prompt, pausing for as long as the game's current pauses,
+which the pacer scales. Hands the pacer does not render are played through null_prompt instead.
+"""
+
+from __future__ import annotations
+
+from src.poker.enums.betting_move import BettingMove
+from src.poker.enums.phase import Phase
+from src.poker.events import BetPlaced, CardsDealt, GameOver, HandStarted, PotsUpdated, PotUncontested, Showdown
+from src.poker.prompts import null_prompt
+from src.poker.prompts import text_prompt
+
+
+class TerminalSink:
+    """Shows the events of a game in the terminal.
+
+    Args:
+        game: The game whose players, table, and pauses are shown
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.prompt = text_prompt
+        self.handlers = {
+            HandStarted: self.show_hand_started,
+            CardsDealt: self.show_cards_dealt,
+            BetPlaced: self.show_bet_placed,
+            PotsUpdated: self.show_pots_updated,
+            PotUncontested: self.show_pot_uncontested,
+            Showdown: self.show_showdown,
+            GameOver: self.show_game_over,
+        }
+
+    def __call__(self, event) -> None:
+        handler = self.handlers.get(type(event))
+        if handler is not None:
+            handler(event)
+
+    def show_table(self, time=0) -> None:
+        self.prompt.show_table(self.game.players, self.game.table, time)
+
+    def show_hand_started(self, event: HandStarted) -> None:
+        # Hands nobody is playing in may be played unseen
+        self.prompt = text_prompt if text_prompt.pacer.shows_hand(event.hand_number) else null_prompt
+        if event.blinds_increased:
+            self.prompt.clear_screen()
+            self.show_table()
+            self.prompt.show_blind_increase(event.big_blind, self.game.long_pause)
+        self.prompt.clear_screen()
+        self.prompt.show_shuffling(self.game.pause)
+
+    def show_cards_dealt(self, event: CardsDealt) -> None:
+        if event.run_out:
+            self.show_table()
+            return
+        if event.phase is Phase.PREFLOP:
+            self.show_table()
+            self.prompt.show_phase_change_alert(event.phase, self.game.dealer.name, self.game.long_pause)
+            self.show_table(self.game.short_pause)
+            self.prompt.show_dealing_hole(self.game.dealer.name, self.game.pause)
+        else:
+            self.prompt.show_phase_change_alert(event.phase, self.game.dealer.name, self.game.long_pause)
+        self.show_table()
+
+    def show_bet_placed(self, event: BetPlaced) -> None:
+        if event.blind is not None:
+            self.prompt.show_bet_blind(event.player.name, event.blind, self.game.pause)
+            if event.move is BettingMove.ALL_IN:
+                self.prompt.show_player_move(event.player, event.move, self.game.pause)
+        else:
+            self.prompt.show_player_move(event.player, event.move, self.game.pause, event.bet)
+        self.show_table()
+
+    def show_pots_updated(self, event: PotsUpdated) -> None:
+        self.show_table()
+
+    def show_pot_uncontested(self, event: PotUncontested) -> None:
+        self.show_table()
+        if event.pot_num is None:
+            self.prompt.show_default_winner_fold(event.winner.name)
+        else:
+            self.prompt.show_default_winner_eligibility(event.winner.name, event.pot_num)
+
+    def show_showdown(self, event: Showdown) -> None:
+        self.prompt.show_showdown_results(self.game.players, self.game.table, event.winners,
+                                          event.showdown_players, pot_num=event.pot_num)
+
+    def show_game_over(self, event: GameOver) -> None:
+        # The end of the game is shown even if its last hand was not
+        self.prompt = text_prompt
+        self.show_table()
+        self.prompt.show_game_winners(self.game.players, [player.name for player in event.winners])
@@ -2,11 +2,41 @@ from time import sleep
 
 from src.poker.enums.betting_move import BettingMove
 from src.poker.enums.phase import Phase
+from src.poker.pacing import Pacer
 from src.poker.players.human import Human
 from src.poker.players.player import Player
 from src.poker.prompts import big_text
+from src.poker.prompts.renderer import table_renderer
 from src.poker.table import Table
-from src.poker.utils.io_utils import clear_screen
+from src.poker.utils import io_utils
+
+
+# Scales every pause and decides whether to wait for key presses, see set_pacer
+pacer = Pacer()
+
+
+def set_pacer(new_pacer: Pacer) -> None:
+    global pacer
+    pacer = new_pacer
+
+
+def pace(time):
+    """Pause the game for as long as the pacer makes a pause of time seconds."""
+    delay = pacer.delay(time)
+    if delay > 0:
+        sleep(delay)
+
+
+def wait_for_key(message):
+    """Wait for a key press, unless the pacer lets computer players' games run on."""
+    if pacer.waits_for_input:
+        input(message)
+
+
+def clear_screen():
+    """Clear the screen, so the next table is drawn in full."""
+    table_renderer.invalidate()
+    io_utils.clear_screen()
 
 
 def prompt_for_name() -> str:
@@ -73,15 +103,31 @@ def prompt_for_big_blind(min_blind: int, max_blind: int) -> int:
 
 
 def show_player_stats(initial_players, isShowDown=False):
+    """Display each player's stats as a single line.
+
+    If the game is in the ShowDown phase, line displays a little differently.
+
+    Args:
+        initial_players (list): all players who began the game
+        isShowDown (bool): if True reveal computer player's cards and best hand rank
+    """
+    for line in player_stat_lines(initial_players, isShowDown):
+        print(line)
+
+
+def player_stat_lines(initial_players, isShowDown=False):
     """Format each player's stats as a single line.
 
     A helper function for show_table().
-    If the game is in the ShowDown phase, line displays a little differently.
 
     Args:
         initial_players (list): all players who began the game
         isShowDown (bool): if True reveal computer player's cards and best hand rank
+
+    Returns:
+        lines (list): one line per player
     """
+    lines = []
     # Sort players such that those who are out of game display last
     players = sorted(initial_players, key=lambda player: player.is_in_game, reverse=True)
     # Display each player's stat line
@@ -119,7 +165,8 @@ def show_player_stats(initial_players, isShowDown=False):
                     print_msg += f'       <BB>'
         else:
             print_msg = f"{this_player.name:>18}:    [OUT OF CHIPS, OUT OF GAME]"
-        print(print_msg)
+        lines.append(print_msg)
+    return lines
 
 
 def show_community(community):
@@ -128,12 +175,16 @@ def show_community(community):
     Args:
         community (list): the 5 cards of the community
     """
+    print(community_line(community))
+
+
+def community_line(community):
     community_str = []
     for card in community:
         community_str.append(str(card))
     community_str = '  '.join(community_str)
     padding = ' '
-    print(f'{padding:>9}COMMUNITY:  {community_str}')
+    return f'{padding:>9}COMMUNITY:  {community_str}'
 
 
 def show_blinds(table):
@@ -142,35 +193,43 @@ def show_blinds(table):
     Args:
         table (__main__.Table): the poker table
     """
+    for line in blind_lines(table):
+        print(line)
+
+
+def blind_lines(table):
     padding = ' '
-    print(f'{padding:>7}Small Blind:{int(table.big_blind / 2):>6}')
-    print(f'{padding:>9}Big Blind:{table.big_blind:>6}')
+    return [f'{padding:>7}Small Blind:{int(table.big_blind / 2):>6}', f'{padding:>9}Big Blind:{table.big_blind:>6}']
 
 
 def show_pots(pots):
     """Display the amount of each pot.
 
     Args:
-        pot (list): sublists are of len 2——index 0 being amount of pot, index 1 being players eligible for pot
+        pots (list): the main pot followed by the side pots
     """
+    print(pots_text(pots))
+
+
+def pots_text(pots):
     # Display main pot
-    if pots[0][0] == 1:
+    if pots[0].amount == 1:
         chips = 'CHIP'
     else:
         chips = 'CHIPS'
     padding = ' '
-    pot_str = f'{padding:>15}POT:{pots[0][0]:>6} {chips}'
+    pot_str = f'{padding:>15}POT:{pots[0].amount:>6} {chips}'
     # Display side pots
     for i in range(1, len(pots)):
-        if pots[0][0] == 1:
+        if pots[i].amount == 1:
             chips = 'CHIP'
         else:
             chips = 'CHIPS'
         if i % 3 == 0:
-            pot_str += f'\n{padding:>7}SIDE POT #{i}:{pots[i][0]:>6} {chips}'
+            pot_str += f'\n{padding:>7}SIDE POT #{i}:{pots[i].amount:>6} {chips}'
         else:
-            pot_str += f'{padding:>12}SIDE POT #{i}:{pots[i][0]:>6}'
-    print(pot_str)
+            pot_str += f'{padding:>12}SIDE POT #{i}:{pots[i].amount:>6}'
+    return pot_str
 
 
 def show_pot_winners(hand_winners, showdown_players, pot_num):
@@ -216,20 +275,20 @@ def show_pot_winners(hand_winners, showdown_players, pot_num):
 def show_table(initial_players: list[Player], table: Table, time: float = 0):
     """Update display with player's stats, community, blinds, and pot.
 
+    Only the lines that changed since the table was last shown are redrawn (see renderer).
+
     Parameters:
         initial_players (list): all players who began the game
         table (__main__.Table): the poker table
         time (float): amount of time to pause the game
     """
-    clear_screen()
-    show_player_stats(initial_players)
-    print('\n')
-    show_community(table.community)
-    print()
-    show_blinds(table)
-    show_pots(table.pots)
-    print('\n\n')
-    sleep(time)
+    lines = player_stat_lines(initial_players)
+    lines += ['', '', community_line(table.community), '']
+    lines += blind_lines(table)
+    lines += pots_text(table.pots).split('\n')
+    lines += ['', '', '']
+    table_renderer.draw(lines)
+    pace(time)
 
 
 def show_showdown_results(initial_players, table, hand_winners, showdown_players, pot_num):
@@ -250,7 +309,7 @@ def show_showdown_results(initial_players, table, hand_winners, showdown_players
     print('\n\n\n')
     show_pot_winners(hand_winners, showdown_players, pot_num)
     print()
-    input("Press any key to continue....")
+    wait_for_key("Press any key to continue....")
 
 
 def show_game_winners(initial_players, winners_names):
@@ -287,22 +346,22 @@ def show_game_winners(initial_players, winners_names):
 # Various functions for displaying short messages on screen
 def show_shuffling(time):
     print(f' >>> Deck is being shuffled...')
-    sleep(time)
+    pace(time)
 
 
 def show_dealing_hole(dealer_name, time):
     print(f' >>> {dealer_name} is dealing cards to players...')
-    sleep(time)
+    pace(time)
 
 
 def show_blind_increase(blind_amount, time):
     print(f' >>> The big blind has increased to {blind_amount}!')
-    sleep(time)
+    pace(time)
 
 
 def show_thinking(player_name, time):
     print(f' >>> {player_name} is thinking...')
-    sleep(time)
+    pace(time)
 
 
 def show_player_move(player: Player, move: BettingMove, pause: float, bet=None):
@@ -327,7 +386,7 @@ def show_player_move(player: Player, move: BettingMove, pause: float, bet=None):
         print(f' >>> {player.name} bet {player.bet} {chips}. ↑')
     else:
         print(f' >>> {player.name} raised to {player.bet} {chips}. ↑')
-    sleep(pause)
+    pace(pause)
 
 
 def show_bet_blind(player_name, blind_size, time):
@@ -339,24 +398,24 @@ def show_bet_blind(player_name, blind_size, time):
         time (float): amount of time to pause the game
     """
     print(f' >>> {player_name} bet the {blind_size} blind')
-    sleep(time)
+    pace(time)
 
 
 def show_all_in(player_name, time):
     print(f' >>> {player_name} went all in!')
-    sleep(time)
+    pace(time)
 
 
 def show_default_winner_fold(player_name):
     print(' >>> All other players folded...')
     print(f' >>> {player_name} won the pot!')
-    input("\n\nPress any key to continue....")
+    wait_for_key("\n\nPress any key to continue....")
 
 
 def show_default_winner_eligibility(player_name, side_pot_num):
     print(f'\n\n >>> {player_name} is the only player eligible for SIDE POT #{side_pot_num}. ')
     print(f' >>> Gave those chips to {player_name}.')
-    input("\n\nPress any key to continue....")
+    wait_for_key("\n\nPress any key to continue....")
 
 
 def show_phase_change_alert(phase: Phase, dealer: str, pause_time: float):
@@ -364,4 +423,4 @@ def show_phase_change_alert(phase: Phase, dealer: str, pause_time: float):
         print(f" >>> {phase.name.capitalize()} Round: {dealer} is the dealer!")
     else:
         print(f' >>> Round Change: the {phase.name.capitalize()}!')
-    sleep(pause_time)
+    pace(pause_time)
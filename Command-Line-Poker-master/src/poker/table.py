@@ -3,6 +3,8 @@ from __future__ import annotations
 from src.poker.enums.betting_move import BettingMove
 from src.poker.enums.phase import Phase
 from src.poker.players.player import Player
+from src.poker.pot import Pot, build_pots, seat_pots, split_pot
+from src.poker.utils import card_utils
 
 
 class Table:
@@ -11,8 +13,14 @@ class Table:
     def __init__(self):
         self.hands_played = 0
         self.community = []
-        self.pots = []
-        self.pot_transfers: list[int] = []
+        # Players dealt into the current hand, whose positions are the seats pots are eligible to
+        self.seats: list[Player] = []
+        self.seat_index: dict[Player, int] = {}
+        self.pots: list[Pot] = [Pot(0, 0)]
+        # Bitmask of the pots each seat can win
+        self.seat_pots: list[int] = []
+        # Chips each player moved into the pots in earlier rounds of betting of the current hand
+        self.contributions: dict[Player, int] = {}
         self.last_bet = 0
         self.big_blind = 0
         self.raise_amount = 0
@@ -21,22 +29,31 @@ class Table:
     def reset(self, active_players: list[Player]) -> None:
         """Resets the table for the next hand to be played."""
         self.community = []
-        self.pots = [[0, active_players]]
-        self.pot_transfers = []
+        self.seats = list(active_players)
+        self.seat_index = {player: seat for seat, player in enumerate(self.seats)}
+        self.pots = build_pots([0] * len(self.seats))
+        self.seat_pots = seat_pots(self.pots, len(self.seats))
+        self.contributions = {}
         self.last_bet = 0
         self.num_times_raised = 0
         if self.check_increase_big_blind():
             self.big_blind *= 2
         self.raise_amount = self.big_blind
 
+    @property
+    def community_mask(self) -> int:
+        """The 52 bit mask of the community, whether it holds Cards or int encoded cards."""
+        return card_utils.cards_to_mask(self.community)
+
     def check_increase_big_blind(self) -> bool:
         """Checks if the big blind should be increased.
 
         Some versions of Texas Hold'Em periodically increase the
-        big blind to speed up the game.
+        big blind to speed up the game. Setting increase_blind_hand_increments
+        to 0 keeps the big blind fixed.
         """
-        return (self.hands_played > 0 and
-                self.hands_played % Table.increase_blind_hand_increments == 0)
+        return (self.hands_played > 0 and self.increase_blind_hand_increments > 0 and
+                self.hands_played % self.increase_blind_hand_increments == 0)
 
     def take_small_blind(self, player: Player) -> bool:
         """Takes the small blind bet from a player.
@@ -53,9 +70,6 @@ class Table:
             return False
         else:
             player.go_all_in()
-            self.pot_transfers.append(player.bet)
-            # Prevent multiple side pots being created if players go all-in at same amount in same phase
-            self.pot_transfers = list(set(self.pot_transfers))
             if player.bet > self.last_bet:
                 self.last_bet = player.bet
             return True
@@ -74,9 +88,6 @@ class Table:
             return False
         else:
             player.go_all_in()
-            self.pot_transfers.append(player.bet)
-            # Prevent multiple side pots being created if players go all-in at same amount in same phase
-            self.pot_transfers = list(set(self.pot_transfers))
             if player.bet > self.last_bet:
                 self.last_bet = player.bet
             return True
@@ -89,9 +100,6 @@ class Table:
             self.last_bet = player.match_bet(self.raise_amount)
         elif move is BettingMove.ALL_IN:
             player.go_all_in()
-            self.pot_transfers.append(player.bet)
-            # Prevent multiple side pots being created if players go all-in at same amount in same phase
-            self.pot_transfers = list(set(self.pot_transfers))
             if player.bet > self.last_bet:
                 self.last_bet = player.bet
         else:
@@ -109,34 +117,32 @@ class Table:
         elif phase in [Phase.TURN, Phase.RIVER]:
             self.raise_amount = self.last_bet + (self.big_blind * 2)
 
-    def calculate_side_pots(self, active_players: list[Player]) -> None:
-        """Determines amount of each side pot and players eligible for each."""
-        if self.pot_transfers:
-            self.pot_transfers.sort()
-            net_transfers = []
-            for i in range(len(self.pot_transfers) - 1):
-                net_transfers.append(self.pot_transfers[i + 1] - self.pot_transfers[i])
-            net_transfers.insert(0, self.pot_transfers[0])
-            for i in range(len(net_transfers)):
-                for player in active_players:
-                    if player.bet == 0:
-                        continue
-                    if player.bet < net_transfers[i]:
-                        self.pots[-1][0] += player.bet
-                        player.bet = 0
-                    else:
-                        player.bet -= net_transfers[i]
-                        self.pots[-1][0] += net_transfers[i]
-                if i == len(net_transfers) - 1:
-                    eligible_players = []
-                    for player in active_players:
-                        if not player.is_folded and not player.is_all_in:
-                            eligible_players.append(player)
-                else:
-                    eligible_players = [player for player in active_players if player.bet > 0]
-                self.pots.append([0, eligible_players])
+    def collect_bets(self, active_players: list[Player]) -> None:
+        """Moves the players' bets into the pots, then rebuilds the main and side pots from everything put in."""
         for player in active_players:
-            if player.bet:
-                self.pots[-1][0] += player.bet
-                player.bet = 0
-        self.pot_transfers = []
+            self.contributions[player] = self.contributions.get(player, 0) + player.bet
+            player.bet = 0
+        folded = sum(1 << seat for seat, player in enumerate(self.seats) if player.is_folded)
+        self.pots = build_pots([self.contributions.get(player, 0) for player in self.seats], folded)
+        self.seat_pots = seat_pots(self.pots, len(self.seats))
+
+    @property
+    def pot_total(self) -> int:
+        return sum(pot.amount for pot in self.pots)
+
+    def eligible_pots(self, player: Player) -> int:
+        """Returns a bitmask of the pots a player can win, with bit k set for self.pots[k]."""
+        seat = self.seat_index.get(player)
+        return 0 if seat is None else self.seat_pots[seat]
+
+    def eligible_players(self, pot_index: int) -> list[Player]:
+        """Returns the players who can win a pot, in seat order."""
+        return [self.seats[seat] for seat in self.pots[pot_index].eligible_seats()]
+
+    def award_pot(self, pot_index: int, winners: list[Player]) -> None:
+        """Splits a pot between its winners, giving odd chips to the winners closest to the left of the dealer."""
+        num_seats = len(self.seats)
+        dealer = next((seat for seat, player in enumerate(self.seats) if player.is_dealer), num_seats - 1)
+        winners = sorted(winners, key=lambda player: (self.seat_index[player] - dealer - 1) % num_seats)
+        for winner, share in zip(winners, split_pot(self.pots[pot_index].amount, len(winners))):
+            winner.chips += share
@@ -0,0 +1,165 @@
+"""
+#######################################################################################################################
+Benchmarks computer playing styles against each other over many hands of headless poker.
+
+Hands are played in independent matches of a fixed length, each starting from fresh stacks with a fixed big blind.
+Matches are sharded across worker processes. Every match seeds the random module from the tournament seed and its own
+index, so results do not depend on the number of workers or on how matches are sharded.
+
+Example:
+    > python3 -m src.poker.tournament --styles SAFE RISKY RANDOM --hands 100000 --workers 8
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from statistics import NormalDist
+
+from .enums.computer_playing_style import ComputerPlayingStyle
+from .pokergamestate import PokerGameState
+
+
+@dataclass(frozen=True)
+class SeatResult:
+    """How one seat of the tournament performed.
+
+    Attributes:
+        playing_style: The playing style of the seat's player
+        chips_per_100: Chips won per 100 hands played
+        confidence_interval: Lower and upper bound of the chips_per_100 confidence interval
+        chips_won: Total chips won over all matches
+    """
+    playing_style: ComputerPlayingStyle
+    chips_per_100: float
+    confidence_interval: tuple[float, float]
+    chips_won: int
+
+
+@dataclass(frozen=True)
+class TournamentResult:
+    """The outcome of a tournament.
+
+    Attributes:
+        seats: Results of each seat, in the order the playing styles were given
+        hands_played: Total hands played over all matches
+        matches: Number of matches played
+        seconds: Wall clock duration of the tournament
+    """
+    seats: list[SeatResult]
+    hands_played: int
+    matches: int
+    seconds: float
+
+    @property
+    def hands_per_second(self) -> float:
+        return self.hands_played / self.seconds if self.seconds else 0.0
+
+
+def run_tournament(playing_styles: list[ComputerPlayingStyle], num_hands: int, num_workers: int | None = None,
+                   seed: int = 0, hands_per_match: int = 100, starting_chips: int = 20000, big_blind: int = 100,
+                   confidence: float = 0.95) -> TournamentResult:
+    """Plays computer players of the given styles against each other and measures their winnings.
+
+    Args:
+        playing_styles: The style of each player at the table
+        num_hands: The number of hands to play, rounded up to a whole number of matches
+        num_workers: The number of worker processes, defaults to the number of CPUs
+        seed: The tournament seed, which makes results reproducible
+        hands_per_match: Hands per match, unless all but one player goes broke first
+        starting_chips: The chips each player starts each match with
+        big_blind: The fixed big blind
+        confidence: Confidence level of the chips_per_100 intervals
+
+    Returns:
+        TournamentResult: chips won per 100 hands for each seat, with confidence intervals
+    """
+    num_workers = num_workers or os.cpu_count() or 1
+    num_matches = -(-num_hands // hands_per_match)
+    # A few shards per worker keeps workers busy when some matches end early
+    num_shards = min(num_matches, num_workers * 4)
+    shards = [(playing_styles, range(i, num_matches, num_shards), seed, hands_per_match, starting_chips, big_blind)
+              for i in range(num_shards)]
+    start = time.perf_counter()
+    if num_workers == 1:
+        shard_results = [_play_matches(*shard) for shard in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            shard_results = list(executor.map(_play_matches, *zip(*shards)))
+    seconds = time.perf_counter() - start
+    matches = [match for shard_result in shard_results for match in shard_result]
+    return _summarize(playing_styles, matches, confidence, seconds)
+
+
+def _play_matches(playing_styles: list[ComputerPlayingStyle], match_indices: range, seed: int, hands_per_match: int,
+                  starting_chips: int, big_blind: int) -> list[tuple[int, list[int]]]:
+    """Plays a shard of matches in a worker.
+
+    Returns:
+        The number of hands played and each seat's chips won, for every match
+    """
+    results = []
+    for match_index in match_indices:
+        random.seed(f'{seed}:{match_index}')
+        with PokerGameState(headless=True, playing_styles=playing_styles) as game:
+            for player in game.players:
+                player.chips = starting_chips
+            game.table.big_blind = big_blind
+            game.table.increase_blind_hand_increments = 0
+            game.play(num_hands=hands_per_match)
+        results.append((game.table.hands_played, [player.chips - starting_chips for player in game.players]))
+    return results
+
+
+def _summarize(playing_styles: list[ComputerPlayingStyle], matches: list[tuple[int, list[int]]], confidence: float,
+               seconds: float) -> TournamentResult:
+    """Combines match results into per seat winnings per 100 hands.
+
+    Matches can end early, so the rate is a ratio estimate of total chips over total hands,
+    and its standard error is estimated from how far each match strays from that ratio.
+    """
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    hands = [num_hands for num_hands, _ in matches]
+    total_hands = sum(hands)
+    n = len(matches)
+    seats = []
+    for seat, playing_style in enumerate(playing_styles):
+        chips = [chips_won[seat] for _, chips_won in matches]
+        rate = sum(chips) / total_hands
+        if n > 1:
+            residuals = sum((c - rate * h) ** 2 for c, h in zip(chips, hands))
+            margin = z * (residuals / (n * (n - 1))) ** 0.5 / (total_hands / n)
+        else:
+            margin = float('inf')
+        seats.append(SeatResult(playing_style=playing_style, chips_per_100=100 * rate,
+                                confidence_interval=(100 * (rate - margin), 100 * (rate + margin)),
+                                chips_won=sum(chips)))
+    return TournamentResult(seats=seats, hands_played=total_hands, matches=n, seconds=seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark computer playing styles against each other.')
+    parser.add_argument('--styles', nargs='+', default=['SAFE', 'RISKY', 'RANDOM'],
+                        choices=[style.name for style in ComputerPlayingStyle])
+    parser.add_argument('--hands', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--hands-per-match', type=int, default=100)
+    args = parser.parse_args()
+    playing_styles = [ComputerPlayingStyle[style] for style in args.styles]
+    result = run_tournament(playing_styles, args.hands, args.workers, args.seed, args.hands_per_match)
+    print(f'{result.hands_played:,} hands in {result.matches:,} matches, '
+          f'{result.seconds:.1f}s ({result.hands_per_second:,.0f} hands/s)')
+    for seat, seat_result in enumerate(result.seats):
+        low, high = seat_result.confidence_interval
+        print(f'  Seat {seat} {seat_result.playing_style.name:<24}'
+              f'{seat_result.chips_per_100:>10.1f} chips/100 hands  [{low:.1f}, {high:.1f}]')
+
+
+if __name__ == '__main__':
+    main()
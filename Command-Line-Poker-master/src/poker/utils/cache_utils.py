@@ -0,0 +1,122 @@
+"""
+#######################################################################################################################
+Bounded caches for search agents, with hit and miss counters for tuning their sizes.
+
+LRUCache is a general purpose mapping that evicts the least recently used entry once full.
+TranspositionTable stores search results by Zobrist hash (see zobrist) in a fixed number of slots, keeping the result
+searched to the greater depth when two states compete for a slot.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+
+
+class LRUCache:
+    """A mapping of bounded size that evicts the least recently used entry.
+
+    Args:
+        maxsize: Largest number of entries kept
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        if maxsize <= 0:
+            raise ValueError(f'Cache size must be positive, got {maxsize}.')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key, default=None):
+        """Returns the value stored for a key, or default, counting a hit or a miss."""
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes every entry and resets the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+
+class TranspositionTable:
+    """A fixed size table of search results, indexed by Zobrist hash with a depth preferred replacement policy.
+
+    Each hash maps to one slot. A result replaces the one in its slot unless that result belongs to another state
+    and was searched to a greater depth, since deeper results cost more to recompute.
+
+    Args:
+        size: Number of slots
+    """
+
+    def __init__(self, size: int = 1 << 16):
+        if size <= 0:
+            raise ValueError(f'Table size must be positive, got {size}.')
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.replacements = 0
+        self._keys: list[int | None] = [None] * size
+        self._depths = [0] * size
+        self._values: list = [None] * size
+
+    def get(self, key: int, depth: int = 0):
+        """Returns the value stored for a state searched to at least the given depth, or None."""
+        i = key % self.size
+        if self._keys[i] == key and self._depths[i] >= depth:
+            self.hits += 1
+            return self._values[i]
+        self.misses += 1
+        return None
+
+    def put(self, key: int, depth: int, value) -> None:
+        i = key % self.size
+        stored_key = self._keys[i]
+        if stored_key is not None and stored_key != key:
+            if self._depths[i] > depth:
+                return
+            self.replacements += 1
+        self._keys[i] = key
+        self._depths[i] = depth
+        self._values[i] = value
+
+    def clear(self) -> None:
+        """Removes every entry and resets the counters."""
+        self._keys = [None] * self.size
+        self._depths = [0] * self.size
+        self._values = [None] * self.size
+        self.hits = 0
+        self.misses = 0
+        self.replacements = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return sum(key is not None for key in self._keys)
@@ -0,0 +1,82 @@
+"""
+#######################################################################################################################
+A compact integer encoding of playing cards, used alongside the Card class when speed matters more than display
+(e.g. headless simulations, equity calculations, and search agents).
+
+Each card is an int from 0 to 51, grouped by suit in the same order a fresh Deck is filled:
+
+    card = suit_index * 13 + (rank_value - 2)        where suit_index is 0-3 for C, D, H, S
+
+A hand or board is a 52 bit mask with bit n set if card n is held. Each suit occupies its own 13 bits of the mask,
+so (mask >> 13 * suit_index) & 0x1FFF is the rank mask of that suit.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+from src.poker.card import Card
+
+SUITS = ['C', 'D', 'H', 'S']
+NUM_CARDS = 52
+SUIT_SHIFT = 13
+SUIT_MASK = (1 << SUIT_SHIFT) - 1
+FULL_DECK_MASK = (1 << NUM_CARDS) - 1
+
+_SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+_CARDS = [Card(rank, suit) for suit in SUITS for rank in range(Card.RANK_LOWEST, Card.RANK_HIGHEST + 1)]
+
+
+def card_to_int(card: Card) -> int:
+    """Returns the int encoding of a Card."""
+    return _SUIT_INDEX[card.suit_value] * SUIT_SHIFT + card.rank_value - Card.RANK_LOWEST
+
+
+def int_to_card(n: int) -> Card:
+    """Returns the Card encoded by an int."""
+    return _CARDS[n]
+
+
+def cards_to_ints(cards) -> list[int]:
+    """Converts a list of Cards to their int encodings, passing through cards that are already ints.
+
+    Int encoded cards may be NumPy integers (e.g. rows of Deck.shuffled_decks), which are converted to ints.
+    """
+    return [card_to_int(card) if isinstance(card, Card) else int(card) for card in cards]
+
+
+def ints_to_cards(ints) -> list[Card]:
+    """Converts a list of int encoded cards to Cards."""
+    return [_CARDS[n] for n in ints]
+
+
+def cards_to_mask(cards) -> int:
+    """Returns the 52 bit mask of a list of Cards or int encoded cards."""
+    mask = 0
+    for card in cards:
+        mask |= 1 << (card_to_int(card) if isinstance(card, Card) else int(card))
+    return mask
+
+
+def mask_to_ints(mask: int) -> list[int]:
+    """Returns the int encoded cards in a mask, lowest first."""
+    ints = []
+    while mask:
+        low_bit = mask & -mask
+        ints.append(low_bit.bit_length() - 1)
+        mask ^= low_bit
+    return ints
+
+
+def mask_to_cards(mask: int) -> list[Card]:
+    """Returns the Cards in a mask."""
+    return ints_to_cards(mask_to_ints(mask))
+
+
+def rank_of(card) -> int:
+    """Returns the rank value (2-14) of a Card or int encoded card."""
+    return card.rank_value if isinstance(card, Card) else int(card) % SUIT_SHIFT + Card.RANK_LOWEST
+
+
+def suit_of(card) -> str:
+    """Returns the suit letter of a Card or int encoded card."""
+    return card.suit_value if isinstance(card, Card) else SUITS[int(card) // SUIT_SHIFT]
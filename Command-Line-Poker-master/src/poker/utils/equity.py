@@ -0,0 +1,292 @@
+"""
+#######################################################################################################################
+Estimates how often a hand wins against a number of opponents holding unknown cards, given the community cards
+that are already known.
+
+Outcomes are scored in batches as NumPy arrays: each row of a batch is one completion of the board plus two hole
+cards for every opponent, and every hand in the batch is scored at once by the lookup table evaluator.
+
+When few outcomes remain (e.g. heads up on the turn and river) every one of them is enumerated, which is exact and
+about as fast as a rollout. Otherwise rows are random rollouts, which are far faster than enumerating the million or
+so outcomes of a heads up flop. calculate_equity picks between the two automatically.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import combinations
+from math import comb, factorial
+from statistics import NormalDist
+
+import numpy as np
+
+from src.poker.utils import card_utils
+from src.poker.utils import hand_evaluator
+from src.poker.utils import isomorphism
+
+BATCH_SIZE = 8192
+# Largest number of outcomes enumerated instead of sampled (a heads up turn has 45,540, a heads up flop 1,070,190)
+ENUMERATION_LIMIT = 50000
+# Rough number of rows scored at once when enumerating
+ENUMERATION_BATCH_ROWS = 1 << 18
+
+
+@dataclass(frozen=True)
+class EquityResult:
+    """The outcome of an equity calculation.
+
+    Attributes:
+        win: Probability of winning the pot outright
+        tie: Probability of splitting the pot
+        lose: Probability of losing the pot
+        equity: Expected share of the pot, counting a split between k players as 1/k of a win
+        confidence_interval: Lower and upper bound of the equity's confidence interval
+        samples: Number of rollouts or enumerated outcomes the result is based on
+        exact: True if every outcome was enumerated, in which case the confidence interval has no width
+    """
+    win: float
+    tie: float
+    lose: float
+    equity: float
+    confidence_interval: tuple[float, float]
+    samples: int
+    exact: bool = False
+
+
+def calculate_equity(hole_cards, community=(), num_opponents: int = 1, samples: int = 10000,
+                     confidence: float = 0.95, rng: np.random.Generator | None = None,
+                     enumeration_limit: int = ENUMERATION_LIMIT) -> EquityResult:
+    """Calculates a hand's chances against opponents with random hole cards.
+
+    Every outcome is enumerated if there are at most enumeration_limit of them, otherwise the equity
+    is estimated from Monte Carlo rollouts.
+
+    Args:
+        hole_cards (list): the player's 2 hole cards, as Cards or int encoded cards
+        community (list): the 0 to 5 community cards already dealt
+        num_opponents (int): number of opponents still in the hand
+        samples (int): number of rollouts to run if sampling
+        confidence (float): confidence level of the returned interval if sampling
+        rng (np.random.Generator): source of randomness if sampling, for reproducible estimates
+        enumeration_limit (int): largest number of outcomes to enumerate
+
+    Returns:
+        EquityResult: the win, tie, and lose probabilities and the equity's confidence interval
+    """
+    hole_cards, community = _to_ints(hole_cards), _to_ints(community)
+    _validate(hole_cards, community, num_opponents)
+    num_unseen = card_utils.NUM_CARDS - len(hole_cards) - len(community)
+    if count_outcomes(num_unseen, 5 - len(community), num_opponents) <= enumeration_limit:
+        return enumerate_equity(hole_cards, community, num_opponents)
+    return sample_equity(hole_cards, community, num_opponents, samples, confidence, rng)
+
+
+def count_outcomes(num_unseen: int, num_board: int, num_opponents: int) -> int:
+    """Counts the distinct ways to finish the board and deal the opponents' hole cards.
+
+    Opponents are interchangeable, so dealing the same hands to different opponents counts once.
+
+    Args:
+        num_unseen (int): number of cards that could still be dealt
+        num_board (int): number of community cards still to come
+        num_opponents (int): number of opponents still in the hand
+    """
+    outcomes = comb(num_unseen, num_board)
+    num_unseen -= num_board
+    for _ in range(num_opponents):
+        outcomes *= comb(num_unseen, 2)
+        num_unseen -= 2
+    return outcomes // factorial(num_opponents)
+
+
+def enumerate_equity(hole_cards, community=(), num_opponents: int = 1) -> EquityResult:
+    """Calculates a hand's exact chances against opponents with random hole cards by enumerating every outcome.
+
+    Results are cached by suit isomorphism class, so repeated calls for the same spot, or for a spot that only differs
+    by a relabelling of suits, cost a dictionary lookup.
+
+    Args:
+        hole_cards (list): the player's 2 hole cards, as Cards or int encoded cards
+        community (list): the 0 to 5 community cards already dealt
+        num_opponents (int): number of opponents still in the hand
+
+    Returns:
+        EquityResult: the exact win, tie, and lose probabilities
+    """
+    hole_cards, community = _to_ints(hole_cards), _to_ints(community)
+    _validate(hole_cards, community, num_opponents)
+    hole_cards, community = isomorphism.canonicalize(hole_cards, community)
+    return _enumerate_equity(card_utils.cards_to_mask(hole_cards), card_utils.cards_to_mask(community),
+                             num_opponents)
+
+
+@lru_cache(maxsize=4096)
+def _enumerate_equity(hole_mask: int, board_mask: int, num_opponents: int) -> EquityResult:
+    unseen = _unseen_cards(card_utils.mask_to_ints(hole_mask | board_mask))
+    num_board = 5 - board_mask.bit_count()
+    pair_masks = np.array([(1 << a) | (1 << b) for a, b in combinations(unseen.tolist(), 2)], dtype=np.int64)
+    board_masks = np.int64(board_mask) | np.array(
+        [sum(1 << card for card in cards) for cards in combinations(unseen.tolist(), num_board)], dtype=np.int64)
+    boards_per_batch = max(1, ENUMERATION_BATCH_ROWS // len(pair_masks) ** num_opponents)
+    wins = ties = 0
+    share_sum = share_square_sum = 0.0
+    num_outcomes = 0
+    for start in range(0, len(board_masks), boards_per_batch):
+        boards, opponent_holes = _deal_every_opponent(board_masks[start:start + boards_per_batch], pair_masks,
+                                                      num_opponents)
+        outcome = _score_showdowns(np.int64(hole_mask), opponent_holes, boards)
+        wins += outcome[0]
+        ties += outcome[1]
+        share_sum += outcome[2]
+        share_square_sum += outcome[3]
+        num_outcomes += len(boards)
+    equity = share_sum / num_outcomes
+    return EquityResult(win=wins / num_outcomes, tie=ties / num_outcomes,
+                        lose=(num_outcomes - wins - ties) / num_outcomes, equity=equity,
+                        confidence_interval=(equity, equity), samples=num_outcomes, exact=True)
+
+
+def _deal_every_opponent(boards: np.ndarray, pair_masks: np.ndarray, num_opponents: int) \
+        -> tuple[np.ndarray, np.ndarray]:
+    """Expands each board into every way of dealing hole cards to the opponents.
+
+    Opponents are dealt pairs in increasing pair order so each set of opponent hands appears once.
+
+    Args:
+        boards (np.ndarray): card masks of complete boards
+        pair_masks (np.ndarray): card masks of every pair of unseen cards
+        num_opponents (int): number of opponents to deal to
+
+    Returns:
+        The card masks of the board and of each opponent's hole cards for every outcome,
+        with shapes (outcomes,) and (outcomes, num_opponents)
+    """
+    used = boards
+    last_pair = np.full(len(boards), -1)
+    holes = np.empty((len(boards), 0), dtype=np.int64)
+    pair_indices = np.arange(len(pair_masks))
+    for _ in range(num_opponents):
+        row, pair = np.divmod(np.arange(len(used) * len(pair_masks)), len(pair_masks))
+        keep = ((used[row] & pair_masks[pair]) == 0) & (pair_indices[pair] > last_pair[row])
+        row, pair = row[keep], pair[keep]
+        used = used[row] | pair_masks[pair]
+        last_pair = pair
+        holes = np.concatenate((holes[row], pair_masks[pair][:, np.newaxis]), axis=1)
+        boards = boards[row]
+    return boards, holes
+
+
+def sample_equity(hole_cards, community=(), num_opponents: int = 1, samples: int = 10000,
+                  confidence: float = 0.95, rng: np.random.Generator | None = None) -> EquityResult:
+    """Estimates a hand's chances against opponents with random hole cards by Monte Carlo rollouts.
+
+    Args:
+        hole_cards (list): the player's 2 hole cards, as Cards or int encoded cards
+        community (list): the 0 to 5 community cards already dealt
+        num_opponents (int): number of opponents still in the hand
+        samples (int): number of rollouts to run
+        confidence (float): confidence level of the returned interval
+        rng (np.random.Generator): source of randomness, for reproducible estimates
+
+    Returns:
+        EquityResult: the win, tie, and lose probabilities and the equity's confidence interval
+    """
+    hole_cards, community = _to_ints(hole_cards), _to_ints(community)
+    _validate(hole_cards, community, num_opponents)
+    if samples < 1:
+        raise ValueError(f'Equity needs at least one sample, got {samples}.')
+    rng = rng if rng is not None else np.random.default_rng()
+    unseen = _unseen_cards(hole_cards + community)
+    board_mask = np.int64(card_utils.cards_to_mask(community))
+    hole_mask = np.int64(card_utils.cards_to_mask(hole_cards))
+    num_board = 5 - len(community)
+    num_drawn = num_board + 2 * num_opponents
+    wins = ties = 0
+    share_sum = share_square_sum = 0.0
+    remaining = samples
+    while remaining:
+        batch = min(remaining, BATCH_SIZE)
+        remaining -= batch
+        drawn_bits = np.left_shift(np.int64(1), _draw(unseen, batch, num_drawn, rng))
+        boards = board_mask | drawn_bits[:, :num_board].sum(axis=1)
+        opponent_holes = drawn_bits[:, num_board:].reshape(batch, num_opponents, 2).sum(axis=2)
+        outcome = _score_showdowns(hole_mask, opponent_holes, boards)
+        wins += outcome[0]
+        ties += outcome[1]
+        share_sum += outcome[2]
+        share_square_sum += outcome[3]
+    return _make_result(wins, ties, share_sum, share_square_sum, samples, confidence)
+
+
+def _draw(unseen: np.ndarray, rows: int, n: int, rng: np.random.Generator) -> np.ndarray:
+    """Draws n distinct cards in random order from the unseen cards, independently for each row.
+
+    Returns:
+        An array of int encoded cards with shape (rows, n)
+    """
+    keys = rng.random((rows, len(unseen)))
+    if n < len(unseen):
+        # The n smallest keys pick a uniformly random subset, sorting them gives a uniformly random order
+        chosen = np.argpartition(keys, n - 1, axis=1)[:, :n]
+        order = np.argsort(np.take_along_axis(keys, chosen, axis=1), axis=1)
+        return unseen[np.take_along_axis(chosen, order, axis=1)]
+    return unseen[np.argsort(keys, axis=1)]
+
+
+def _score_showdowns(hole_mask: np.int64, opponent_holes: np.ndarray, boards: np.ndarray) \
+        -> tuple[int, int, float, float]:
+    """Scores a batch of showdowns between the player and every opponent.
+
+    Args:
+        hole_mask (np.int64): card mask of the player's hole cards
+        opponent_holes (np.ndarray): card masks of the opponents' hole cards with shape (rows, num_opponents)
+        boards (np.ndarray): card masks of the complete boards with shape (rows,)
+
+    Returns:
+        The number of wins and ties, and the sum and sum of squares of the player's share of each pot
+    """
+    hands = np.concatenate(((hole_mask | boards)[:, np.newaxis], opponent_holes | boards[:, np.newaxis]), axis=1)
+    scores = hand_evaluator.evaluate_mask_array(hands)
+    hero_scores = scores[:, 0]
+    opponent_scores = scores[:, 1:]
+    best_opponent = opponent_scores.max(axis=1)
+    won = hero_scores > best_opponent
+    tied = hero_scores == best_opponent
+    shares = np.where(won, 1.0, 0.0)
+    shares[tied] = 1.0 / (1 + (opponent_scores[tied] == hero_scores[tied, np.newaxis]).sum(axis=1))
+    return int(won.sum()), int(tied.sum()), float(shares.sum()), float(np.square(shares).sum())
+
+
+def _make_result(wins: int, ties: int, share_sum: float, share_square_sum: float, samples: int,
+                 confidence: float) -> EquityResult:
+    """Builds an EquityResult, with a normal approximation confidence interval around the mean share."""
+    equity = share_sum / samples
+    variance = max(share_square_sum / samples - equity ** 2, 0.0)
+    margin = NormalDist().inv_cdf((1 + confidence) / 2) * (variance / samples) ** 0.5
+    return EquityResult(win=wins / samples, tie=ties / samples, lose=(samples - wins - ties) / samples,
+                        equity=equity, confidence_interval=(max(equity - margin, 0.0), min(equity + margin, 1.0)),
+                        samples=samples)
+
+
+def _to_ints(cards) -> list[int]:
+    """Returns a list of int encoded cards from Cards or int encoded cards."""
+    return [int(card) if isinstance(card, (int, np.integer)) else card_utils.card_to_int(card) for card in cards]
+
+
+def _unseen_cards(known_cards: list[int]) -> np.ndarray:
+    """Returns the int encoded cards that are not known, as an array."""
+    known_mask = card_utils.cards_to_mask(known_cards)
+    return np.array([card for card in range(card_utils.NUM_CARDS) if not known_mask >> card & 1], dtype=np.int64)
+
+
+def _validate(hole_cards: list[int], community: list[int], num_opponents: int) -> None:
+    if len(hole_cards) != 2:
+        raise ValueError(f'Equity needs 2 hole cards, got {len(hole_cards)}.')
+    if len(community) > 5:
+        raise ValueError(f'The community has at most 5 cards, got {len(community)}.')
+    if len(set(hole_cards + community)) != len(hole_cards) + len(community):
+        raise ValueError('The hole cards and community contain the same card more than once.')
+    if num_opponents < 1 or 2 * num_opponents > 45:
+        raise ValueError(f'Equity needs between 1 and 22 opponents, got {num_opponents}.')
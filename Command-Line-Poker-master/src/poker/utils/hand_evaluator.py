@@ -0,0 +1,328 @@
+"""
+#######################################################################################################################
+A table driven poker hand evaluator. Instead of scoring each of the 21 five card combinations a player can make from
+seven cards, the best hand is looked up directly:
+
+    - Hands holding five or more cards of one suit are looked up in a flush table indexed by the 13 bit rank mask of
+      that suit. Seven cards containing a flush can never make Four of a Kind or a Full House, so the flush table
+      alone decides the score.
+    - Every other hand is looked up in a rank table keyed by the count of each rank, packed as a base 5 number
+      (no rank can appear more than 4 times).
+
+The scores match those of hand_ranking_utils.score_hand exactly, which remains the reference implementation.
+The tables are built on first use, so importing this module costs nothing.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+
+import numpy as np
+
+from src.poker.utils import card_utils
+
+RANK_LOWEST = 2
+RANK_HIGHEST = 14
+NUM_RANKS = RANK_HIGHEST - RANK_LOWEST + 1
+
+ROYAL_FLUSH = 10
+STRAIGHT_FLUSH = 9
+FOUR_OF_A_KIND = 8
+FULL_HOUSE = 7
+FLUSH = 6
+STRAIGHT = 5
+THREE_OF_A_KIND = 4
+TWO_PAIR = 3
+ONE_PAIR = 2
+HIGH_CARD = 1
+
+# A score packs the hand rank above 5 tie breaking rank values of 4 bits each, highest first, so comparing scores
+# compares hands and every value can be read back with a shift and a mask
+RANK_BITS = 4
+RANK_MASK = (1 << RANK_BITS) - 1
+CATEGORY_SHIFT = 5 * RANK_BITS
+# Number of leading rank values of each hand rank that make up its subtype (e.g. the pairs of a Two Pair), with the
+# rest being kickers
+NUM_PRIMARY_RANKS = {ROYAL_FLUSH: 0, STRAIGHT_FLUSH: 1, FOUR_OF_A_KIND: 1, FULL_HOUSE: 2, FLUSH: 0, STRAIGHT: 1,
+                     THREE_OF_A_KIND: 1, TWO_PAIR: 2, ONE_PAIR: 1, HIGH_CARD: 1}
+
+# Adding a card to a hand adds its rank's key, giving a unique base 5 number for every multiset of ranks
+RANK_KEYS = {rank: 5 ** (rank - RANK_LOWEST) for rank in range(RANK_LOWEST, RANK_HIGHEST + 1)}
+
+_rank_table: dict[int, int] | None = None
+_flush_table: list[int] | None = None
+_suit_rank_keys: list[int] | None = None
+_array_tables: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray] | None = None
+
+
+def evaluate(cards) -> int:
+    """Scores the best 5 card hand that can be made from 5 to 7 cards.
+
+    Args:
+        cards (list): the Cards or int encoded cards to score, typically a player's hand plus the community
+
+    Returns:
+        score (int): the same score hand_ranking_utils.score_hand gives the best 5 card combination
+    """
+    if cards and isinstance(cards[0], int):
+        return evaluate_mask(card_utils.cards_to_mask(cards))
+    rank_table, flush_table = _get_tables()
+    key = 0
+    suit_masks = {}
+    for card in cards:
+        rank = card.rank_value
+        key += RANK_KEYS[rank]
+        suit_masks[card.suit_value] = suit_masks.get(card.suit_value, 0) | 1 << (rank - RANK_LOWEST)
+    for mask in suit_masks.values():
+        if mask.bit_count() >= 5:
+            return flush_table[mask]
+    return rank_table[key]
+
+
+def evaluate_mask(mask: int) -> int:
+    """Scores the best 5 card hand in a 52 bit mask of 5 to 7 int encoded cards.
+
+    Args:
+        mask (int): the cards to score, see card_utils
+
+    Returns:
+        score (int): the same score hand_ranking_utils.score_hand gives the best 5 card combination
+    """
+    rank_table, flush_table = _get_tables()
+    clubs = mask & 0x1FFF
+    diamonds = mask >> 13 & 0x1FFF
+    hearts = mask >> 26 & 0x1FFF
+    spades = mask >> 39
+    for suit_mask in (clubs, diamonds, hearts, spades):
+        if suit_mask.bit_count() >= 5:
+            return flush_table[suit_mask]
+    keys = _suit_rank_keys
+    return rank_table[keys[clubs] + keys[diamonds] + keys[hearts] + keys[spades]]
+
+
+def evaluate_array(cards: np.ndarray) -> np.ndarray:
+    """Scores many hands at once.
+
+    Args:
+        cards (np.ndarray): int encoded cards with shape (..., n) for hands of 5 <= n <= 7 cards
+
+    Returns:
+        scores (np.ndarray): int64 array with shape (...) of the scores evaluate would give each hand
+    """
+    masks = np.left_shift(np.int64(1), np.asarray(cards, dtype=np.int64)).sum(axis=-1)
+    return evaluate_mask_array(masks)
+
+
+def evaluate_mask_array(masks: np.ndarray) -> np.ndarray:
+    """Scores many hands at once, given as 52 bit masks of 5 to 7 int encoded cards.
+
+    Args:
+        masks (np.ndarray): int64 array of card masks
+
+    Returns:
+        scores (np.ndarray): int64 array with the same shape of the scores evaluate_mask would give each hand
+    """
+    rank_keys, rank_scores, flush_scores, suit_rank_keys = _get_array_tables()
+    key = np.zeros(masks.shape, dtype=np.int64)
+    flush = np.zeros(masks.shape, dtype=np.int64)
+    for suit in range(4):
+        suit_mask = (masks >> (13 * suit)) & 0x1FFF
+        key += suit_rank_keys[suit_mask]
+        np.maximum(flush, flush_scores[suit_mask], out=flush)
+    return np.where(flush > 0, flush, rank_scores[np.searchsorted(rank_keys, key)])
+
+
+def best_hand(cards) -> tuple[int, list]:
+    """Scores the best 5 card hand that can be made from 5 to 7 cards and finds the cards that make it.
+
+    When several combinations tie for the best score, the cards chosen are the same ones that scoring every
+    combination in order would choose.
+
+    Args:
+        cards (list): the Cards or int encoded cards to score, typically a player's hand plus the community
+
+    Returns:
+        score (int): score of the best hand
+        best_cards (list): the 5 cards of the best hand, sorted by rank from highest to lowest
+    """
+    cards = list(cards)
+    score = evaluate(cards)
+    return score, select_cards(cards, score)
+
+
+def score_category(score: int) -> int:
+    """Returns the hand rank of a score (e.g. 7 for a Full House)."""
+    return score >> CATEGORY_SHIFT
+
+
+def score_rank(score: int, i: int) -> int:
+    """Returns the i-th (0-4) rank value stored in a score, or 0 if the hand rank stores fewer."""
+    return score >> RANK_BITS * (4 - i) & RANK_MASK
+
+
+def score_ranks(score: int) -> list[int]:
+    """Returns the 5 rank values stored in a score, zeros included."""
+    return [score >> RANK_BITS * (4 - i) & RANK_MASK for i in range(5)]
+
+
+def score_prefix(score: int, n: int) -> int:
+    """Returns the hand rank and first n rank values of a score, packed so equal prefixes compare equal."""
+    return score >> RANK_BITS * (5 - n)
+
+
+def score_kickers(score: int) -> list[int]:
+    """Returns the rank values of a score that break ties between hands of the same rank and subtype."""
+    return score_ranks(score)[NUM_PRIMARY_RANKS[score_category(score)]:]
+
+
+def make_score(category: int, ranks) -> int:
+    """Packs a hand rank and up to 5 tie breaking rank values into a score.
+
+    Example:
+        make_score(TWO_PAIR, [11, 8, 2]) returns 0x3B8200
+    """
+    score = category
+    ranks = list(ranks) + [0] * (5 - len(ranks))
+    for rank in ranks:
+        score = score << RANK_BITS | rank
+    return score
+
+
+def select_cards(cards, score: int) -> list:
+    """Picks the 5 cards that make the hand described by a score, sorted by rank from highest to lowest.
+
+    Where several cards of a rank could be picked, the first ones in cards are.
+    """
+    category = score_category(score)
+    ranks = score_ranks(score)
+    if category == ROYAL_FLUSH:
+        needed = [14, 13, 12, 11, 10]
+    elif category in (STRAIGHT_FLUSH, STRAIGHT):
+        needed = list(range(ranks[0], ranks[0] - 5, -1))
+    elif category == FOUR_OF_A_KIND:
+        needed = [ranks[0]] * 4 + [ranks[1]]
+    elif category == FULL_HOUSE:
+        needed = [ranks[0]] * 3 + [ranks[1]] * 2
+    elif category == THREE_OF_A_KIND:
+        needed = [ranks[0]] * 3 + ranks[1:3]
+    elif category == TWO_PAIR:
+        needed = [ranks[0]] * 2 + [ranks[1]] * 2 + [ranks[2]]
+    elif category == ONE_PAIR:
+        needed = [ranks[0]] * 2 + ranks[1:4]
+    else:
+        needed = ranks
+    rank_of = card_utils.rank_of
+    suit_of = card_utils.suit_of
+    suit = None
+    if category in (ROYAL_FLUSH, STRAIGHT_FLUSH, FLUSH):
+        suit = Counter(suit_of(card) for card in cards).most_common(1)[0][0]
+    needed = Counter(needed)
+    selected = []
+    for card in cards:
+        rank = rank_of(card)
+        if needed[rank] and (suit is None or suit_of(card) == suit):
+            needed[rank] -= 1
+            selected.append(card)
+    return sorted(selected, key=rank_of, reverse=True)
+
+
+def _get_tables() -> tuple[dict[int, int], list[int]]:
+    """Returns the rank and flush tables, building them the first time they are needed."""
+    global _rank_table, _flush_table, _suit_rank_keys
+    if _rank_table is None:
+        _suit_rank_keys = [sum(RANK_KEYS[rank] for rank in range(RANK_LOWEST, RANK_HIGHEST + 1)
+                               if mask >> (rank - RANK_LOWEST) & 1) for mask in range(1 << NUM_RANKS)]
+        _flush_table = _build_flush_table()
+        _rank_table = _build_rank_table()
+    return _rank_table, _flush_table
+
+
+def _get_array_tables() -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the tables as NumPy arrays: sorted rank keys, their scores, flush scores, and suit rank keys."""
+    global _array_tables
+    if _array_tables is None:
+        rank_table, flush_table = _get_tables()
+        rank_keys = np.array(sorted(rank_table), dtype=np.int64)
+        rank_scores = np.array([rank_table[key] for key in rank_keys.tolist()], dtype=np.int64)
+        _array_tables = (rank_keys, rank_scores, np.array(flush_table, dtype=np.int64),
+                         np.array(_suit_rank_keys, dtype=np.int64))
+    return _array_tables
+
+
+def _build_flush_table() -> list[int]:
+    """Scores every set of 5 or more suited ranks, indexed by rank mask."""
+    table = [0] * (1 << NUM_RANKS)
+    for mask in range(1 << NUM_RANKS):
+        if mask.bit_count() < 5:
+            continue
+        ranks = [rank for rank in range(RANK_HIGHEST, RANK_LOWEST - 1, -1) if mask >> (rank - RANK_LOWEST) & 1]
+        straight_high = _straight_high_card(ranks)
+        if straight_high == RANK_HIGHEST:
+            table[mask] = make_score(ROYAL_FLUSH, [])
+        elif straight_high:
+            table[mask] = make_score(STRAIGHT_FLUSH, [straight_high])
+        else:
+            table[mask] = make_score(FLUSH, ranks[:5])
+    return table
+
+
+def _build_rank_table() -> dict[int, int]:
+    """Scores every multiset of 5 to 7 ranks that can be drawn from a deck, keyed by rank key."""
+    table = {}
+
+    def add_rank(rank: int, counts: list[int], num_cards: int, key: int) -> None:
+        if rank < RANK_LOWEST:
+            if num_cards >= 5:
+                table[key] = _score_rank_counts(counts)
+            return
+        for count in range(min(4, 7 - num_cards) + 1):
+            counts[rank - RANK_LOWEST] = count
+            add_rank(rank - 1, counts, num_cards + count, key + count * RANK_KEYS[rank])
+        counts[rank - RANK_LOWEST] = 0
+
+    add_rank(RANK_HIGHEST, [0] * NUM_RANKS, 0, 0)
+    return table
+
+
+def _score_rank_counts(counts: list[int]) -> int:
+    """Scores the best non-flush hand that can be made from the given count of each rank."""
+    ranks = [rank for rank in range(RANK_HIGHEST, RANK_LOWEST - 1, -1) if counts[rank - RANK_LOWEST]]
+    by_count = {n: [rank for rank in ranks if counts[rank - RANK_LOWEST] >= n] for n in (2, 3, 4)}
+    if by_count[4]:
+        quad = by_count[4][0]
+        return make_score(FOUR_OF_A_KIND, [quad, _highest_except(ranks, [quad], 1)[0]])
+    if by_count[3]:
+        triple = by_count[3][0]
+        pairs = [rank for rank in by_count[2] if rank != triple]
+        if pairs:
+            return make_score(FULL_HOUSE, [triple, pairs[0]])
+    straight_high = _straight_high_card(ranks)
+    if straight_high:
+        return make_score(STRAIGHT, [straight_high])
+    if by_count[3]:
+        triple = by_count[3][0]
+        return make_score(THREE_OF_A_KIND, [triple] + _highest_except(ranks, [triple], 2))
+    if len(by_count[2]) >= 2:
+        high_pair, low_pair = by_count[2][:2]
+        return make_score(TWO_PAIR, [high_pair, low_pair] + _highest_except(ranks, [high_pair, low_pair], 1))
+    if by_count[2]:
+        pair = by_count[2][0]
+        return make_score(ONE_PAIR, [pair] + _highest_except(ranks, [pair], 3))
+    return make_score(HIGH_CARD, ranks[:5])
+
+
+def _highest_except(ranks: list[int], excluded: list[int], n: int) -> list[int]:
+    """Returns the n highest of the reverse sorted ranks that are not excluded."""
+    return [rank for rank in ranks if rank not in excluded][:n]
+
+
+def _straight_high_card(ranks: list[int]) -> int:
+    """Returns the high card of the highest straight in the reverse sorted distinct ranks, or 0 if there is none.
+
+    Like score_straight, an Ace only counts high, so A-2-3-4-5 is not a straight.
+    """
+    for i in range(len(ranks) - 4):
+        if ranks[i] - ranks[i + 4] == 4:
+            return ranks[i]
+    return 0
@@ -1,16 +1,31 @@
 """
 #######################################################################################################################
 This implementation of a poker hand ranker assigns each hand a score, as a way to quickly compare between hands of
-different ranks, and different hands of the same rank. The first digit scores the rank (e.g. Full House, Straight, etc) 
-of the overall hand score. All successive digit PAIRS in the score represent certain values that may be needed to 
-break ties between hands of that particular rank.  
+different ranks, and different hands of the same rank. The highest bits of the score hold the rank (e.g. Full House,
+Straight, etc) of the overall hand. Below them, five 4 bit fields hold rank values that may be needed to break ties
+between hands of that particular rank, so written in hexadecimal every digit after the hand rank is one rank value
+(see hand_evaluator.make_score). The fields are read back with shifts and masks by the hand_evaluator accessors.
 
 A kicker card (tie-breaker card) is evaluated in cases where the rules of game call for one.
+
+Best hands are memoized in showdown_cache, keyed by the 52 bit mask of the cards they were found in (see card_utils),
+since simulated showdowns score the same hand and board many times. set_showdown_cache_size resizes or disables it.
 #######################################################################################################################
 """
 
 from itertools import combinations
 
+import numpy as np
+
+from src.poker.utils import card_utils
+from src.poker.utils import hand_evaluator
+from src.poker.utils.cache_utils import LRUCache
+
+SHOWDOWN_CACHE_SIZE = 1 << 16
+# Masks of the four cards of each rank, lowest rank first
+_RANK_MASKS = [sum(1 << suit * card_utils.SUIT_SHIFT + rank for suit in range(4)) for rank in range(13)]
+_FLUSH_CATEGORIES = (hand_evaluator.ROYAL_FLUSH, hand_evaluator.STRAIGHT_FLUSH, hand_evaluator.FLUSH)
+
 card_int_str_dict = {
     2: 'Two',
     3: 'Three',
@@ -41,12 +56,17 @@ handrank_int_str_dict = {
 }
 
 
-def determine_showdown_winner(showdown_players, community):
+showdown_cache = LRUCache(SHOWDOWN_CACHE_SIZE)
+
+
+def determine_showdown_winner(showdown_players, community, use_lookup_tables=True):
     """Determines which player(s) wins the showdown.
 
     Args:
         showdown_players (list): players competing for a particular pot
         community (list): the 5 cards of the community
+        use_lookup_tables (bool): if False, score every 5 card combination with score_hand instead of
+            using the lookup table evaluator (slow, kept as a reference)
 
     Returns:
         winners (list): players who won a particular pot
@@ -54,15 +74,12 @@ def determine_showdown_winner(showdown_players, community):
     # Create a list of the winners with the best scoring hand
     winners = []
     for player in showdown_players:
-        combos = combinations(player.hand + community, 5)
-        for combo in combos:
-            raw_score = score_hand(combo)
-            if raw_score > player.best_hand_score:
-                player.best_hand_score = raw_score
-                combo = sorted(combo, key=lambda x: x.rank_value, reverse=True)
-                player.best_hand_cards = combo
+        if use_lookup_tables:
+            assign_best_hand(player, community)
+        else:
+            assign_best_hand_by_combinations(player, community)
         #  Assign the string version of the player's best hand
-        player.best_hand_rank = handrank_int_str_dict[int(player.best_hand_score / 10000000000)]
+        player.best_hand_rank = handrank_int_str_dict[hand_evaluator.score_category(player.best_hand_score)]
         if winners == []:
             winners = [player]
         elif player.best_hand_score > winners[0].best_hand_score:
@@ -74,6 +91,117 @@ def determine_showdown_winner(showdown_players, community):
     return winners
 
 
+def determine_showdown_winner_batch(hole_cards, boards):
+    """Determines the winners of many independent showdowns at once, scoring every hand with the NumPy evaluator.
+
+    Example:
+        A hero range against a villain range over many boards is hole_cards of shape (n, 2, 2), with row i holding
+        the hero's and villain's hands on boards[i].
+
+    Args:
+        hole_cards (np.ndarray): int encoded hole cards of shape (num_showdowns, num_players, 2), or of shape
+            (num_players, 2) if the same hands show down on every board
+        boards (np.ndarray): int encoded community cards of shape (num_showdowns, 5)
+
+    Returns:
+        winners (np.ndarray): bool array of shape (num_showdowns, num_players), True for each player who wins or
+            splits the pot
+        scores (np.ndarray): int64 array of the same shape, holding each player's best hand score
+    """
+    hole_cards = np.asarray(hole_cards, dtype=np.int64)
+    boards = np.asarray(boards, dtype=np.int64)
+    if boards.ndim != 2 or hole_cards.ndim not in (2, 3) or hole_cards.shape[-1] != 2:
+        raise ValueError(f'Expected boards of shape (n, 5) and hole cards of shape (n, players, 2) or (players, 2), '
+                         f'got {boards.shape} and {hole_cards.shape}.')
+    one = np.int64(1)
+    hole_masks = np.left_shift(one, hole_cards).sum(axis=-1)
+    board_masks = np.left_shift(one, boards).sum(axis=-1)
+    scores = hand_evaluator.evaluate_mask_array(hole_masks | board_masks[:, np.newaxis])
+    winners = scores == scores.max(axis=1, keepdims=True)
+    return winners, scores
+
+
+def assign_best_hand(player, community):
+    """Assigns a player's best hand score and cards using the lookup table evaluator.
+
+    Args:
+        player (Player): player whose best hand is being found
+        community (list): the cards of the community
+    """
+    raw_score, best_cards = best_hand(player.hand + community)
+    if raw_score > player.best_hand_score:
+        player.best_hand_score = raw_score
+        player.best_hand_cards = best_cards
+
+
+def best_hand(cards):
+    """Finds the best 5 card hand in 5 to 7 cards like hand_evaluator.best_hand, memoized in showdown_cache.
+
+    The cards chosen are always the ones hand_evaluator.best_hand would choose. It breaks ties between cards of the
+    same rank by their order in cards, so where another card of a chosen rank could have been picked only the score
+    is remembered and the cards are picked again.
+
+    Args:
+        cards (list): the Cards or int encoded cards to score, typically a player's hand plus the community
+
+    Returns:
+        score (int): score of the best hand
+        best_cards (list): the 5 cards of the best hand, sorted by rank from highest to lowest
+    """
+    cache = showdown_cache
+    if cache is None:
+        return hand_evaluator.best_hand(cards)
+    cards = list(cards)
+    mask = card_utils.cards_to_mask(cards)
+    entry = cache.get(mask)
+    if entry is None:
+        score, best_cards = hand_evaluator.best_hand(cards)
+        best_mask = card_utils.cards_to_mask(best_cards)
+        if not _only_choice(mask, best_mask, score):
+            best_mask = None
+        cache.put(mask, (score, best_mask))
+        return score, best_cards
+    score, best_mask = entry
+    if best_mask is None:
+        return score, hand_evaluator.select_cards(cards, score)
+    best_cards = [card for card, n in zip(cards, card_utils.cards_to_ints(cards)) if best_mask >> n & 1]
+    best_cards.sort(key=card_utils.rank_of, reverse=True)
+    return score, best_cards
+
+
+def set_showdown_cache_size(maxsize):
+    """Replaces showdown_cache with an empty cache of the given size, or disables memoizing if maxsize is 0."""
+    global showdown_cache
+    showdown_cache = LRUCache(maxsize) if maxsize else None
+
+
+def _only_choice(mask, best_mask, score):
+    """Returns True if no other cards in mask could have made the hand in best_mask."""
+    if hand_evaluator.score_category(score) in _FLUSH_CATEGORIES:
+        # Only one card of each rank has the flush's suit
+        return True
+    for rank_mask in _RANK_MASKS:
+        if best_mask & rank_mask and mask & rank_mask & ~best_mask:
+            return False
+    return True
+
+
+def assign_best_hand_by_combinations(player, community):
+    """Assigns a player's best hand score and cards by scoring every 5 card combination.
+
+    Args:
+        player (Player): player whose best hand is being found
+        community (list): the cards of the community
+    """
+    combos = combinations(player.hand + community, 5)
+    for combo in combos:
+        raw_score = score_hand(combo)
+        if raw_score > player.best_hand_score:
+            player.best_hand_score = raw_score
+            combo = sorted(combo, key=lambda x: x.rank_value, reverse=True)
+            player.best_hand_cards = combo
+
+
 def score_hand(hand):
     """Scores a particular hand combination that a player could possibly make.
 
@@ -103,34 +231,35 @@ def assign_handrank_subtypes(showdown_players):
     Args:
         showdown_players (list): players competing for a particular pot
     """
+    score_rank = hand_evaluator.score_rank
     for player in showdown_players:
         score = player.best_hand_score
         hand_rank = player.best_hand_rank
         if hand_rank == 'Straight Flush' or hand_rank == 'Straight':
-            high_card = card_int_str_dict[int(str(score)[1:3])]
+            high_card = card_int_str_dict[score_rank(score, 0)]
             player.rank_subtype = f': {high_card} high'
         elif hand_rank == 'Full House':
-            pair_card = card_int_str_dict[int(str(score)[1:3])]
-            triple_card = card_int_str_dict[int(str(score)[3:5])]
+            pair_card = card_int_str_dict[score_rank(score, 0)]
+            triple_card = card_int_str_dict[score_rank(score, 1)]
             if pair_card == 'Six': pair_card = 'Sixe'
             if triple_card == 'Six': triple_card = 'Sixe'
             player.rank_subtype = f': {pair_card}s over {triple_card}s'
         elif hand_rank == 'Two Pair':
-            higher_pair = card_int_str_dict[int(str(score)[1:3])]
-            lower_pair = card_int_str_dict[int(str(score)[3:5])]
+            higher_pair = card_int_str_dict[score_rank(score, 0)]
+            lower_pair = card_int_str_dict[score_rank(score, 1)]
             if higher_pair == 'Six': higher_pair = 'Sixe'
             if lower_pair == 'Six': lower_pair = 'Sixe'
             player.rank_subtype = f': {higher_pair}s and {lower_pair}s'
         elif hand_rank == 'One Pair':
-            pair_card = card_int_str_dict[int(str(score)[1:3])]
+            pair_card = card_int_str_dict[score_rank(score, 0)]
             if pair_card == 'Six': pair_card = 'Sixe'
             player.rank_subtype = f': {pair_card}s'
         elif hand_rank in ['Four of a Kind', 'Three of a Kind', 'two of a kind']:
-            tuple_card = card_int_str_dict[int(str(score)[1:3])]
+            tuple_card = card_int_str_dict[score_rank(score, 0)]
             if tuple_card == 'Six': tuple_card = 'Sixe'
             player.rank_subtype = f': {tuple_card}s'
         elif hand_rank == 'High Card':
-            high_card = card_int_str_dict[int(str(score)[1:3])]
+            high_card = card_int_str_dict[score_rank(score, 0)]
             player.rank_subtype = f': {high_card}'
 
 
@@ -155,31 +284,18 @@ def assign_kicker_card(winners, showdown_players):
         showdown_players (list): players competing for a particular pot
     """
     kicker_card_rank = None
-    if winners[0].best_hand_rank in ['High Card', 'One Pair', 'Three of a Kind', 'Four of a Kind']:
-        tied_players = [player for player in showdown_players if
-                        str(player.best_hand_score)[0:3] == str(winners[0].best_hand_score)[0:3]]
-        if len(tied_players) == 1:
-            return
-        for i in range(3, 11, 2):
-            card_at_index_list = [int(str(player.best_hand_score)[i:i + 2]) for player in tied_players]
-            if card_at_index_list.count(max(card_at_index_list)) != len(tied_players):
-                kicker_card_rank = max(card_at_index_list)
-                break
-    elif winners[0].best_hand_rank == 'Two Pair':
-        tied_players = [player for player in showdown_players if
-                        str(player.best_hand_score)[0:5] == str(winners[0].best_hand_score)[0:5]]
-        if len(tied_players) == 1:
-            return
-        players_last_card_list = [int(str(player.best_hand_score)[5:7]) for player in tied_players]
-        if players_last_card_list.count(max(players_last_card_list)) != len(tied_players):
-            kicker_card_rank = max(players_last_card_list)
-    elif winners[0].best_hand_rank == 'Flush':
+    if winners[0].best_hand_rank in ['High Card', 'One Pair', 'Two Pair', 'Three of a Kind', 'Four of a Kind',
+                                     'Flush']:
+        # Players tie on rank and subtype if their scores agree up to the kickers
+        winning_score = winners[0].best_hand_score
+        num_primary_ranks = hand_evaluator.NUM_PRIMARY_RANKS[hand_evaluator.score_category(winning_score)]
+        subtype = hand_evaluator.score_prefix(winning_score, num_primary_ranks)
         tied_players = [player for player in showdown_players if
-                        str(player.best_hand_score)[0] == str(winners[0].best_hand_score)[0]]
+                        hand_evaluator.score_prefix(player.best_hand_score, num_primary_ranks) == subtype]
         if len(tied_players) == 1:
             return
-        for i in range(1, 11, 2):
-            card_at_index_list = [int(str(player.best_hand_score)[i:i + 2]) for player in tied_players]
+        for i in range(num_primary_ranks, 5):
+            card_at_index_list = [hand_evaluator.score_rank(player.best_hand_score, i) for player in tied_players]
             if card_at_index_list.count(max(card_at_index_list)) != len(tied_players):
                 kicker_card_rank = max(card_at_index_list)
                 break
@@ -187,7 +303,7 @@ def assign_kicker_card(winners, showdown_players):
     if kicker_card_rank:
         for winner in winners:
             for card in winner.best_hand_cards:
-                if card.rank_value == kicker_card_rank:
+                if card_utils.rank_of(card) == kicker_card_rank:
                     winner.kicker_card = card
                     break
 
@@ -195,28 +311,27 @@ def assign_kicker_card(winners, showdown_players):
 def score_high_card(hand):
     """
     All score for hands ranking High Card start with a 1, the lowest hand rank.
-    Each successive digit pair represents the value of each card when reverse sorted.
+    Each successive hexadecimal digit represents the value of each card when reverse sorted.
 
     Example:
-         [ A 9 8 4 2 ] scores 1 14  09  08  04  02
-         [ A 9 8 5 2 ] scores 1 14  09  08  05  02      <--Winner (higher numerical score)
+         [ A 9 8 4 2 ] scores 0x1 E 9 8 4 2
+         [ A 9 8 5 2 ] scores 0x1 E 9 8 5 2      <--Winner (higher numerical score)
 
     Parameters:
         hand: a list of Card objects
     """
     rank_values = [card.rank_value for card in hand]
-    score = '1' + ''.join(f'{x:02d}' for x in rank_values)
-    return int(score)
+    return hand_evaluator.make_score(hand_evaluator.HIGH_CARD, rank_values)
 
 
 def score_two_pair(hand):
     """
-    All score for hands ranking Two pair start with 3. The next two pairs of digit pairs represent the value of the cards
-    that formed the pairs in order of largest to smallest. The third pair of digits represent the kicker card.
+    All score for hands ranking Two pair start with 3. The next two hexadecimal digits represent the value of the cards
+    that formed the pairs in order of largest to smallest. The third digit represents the kicker card.
 
     Example:
-         [ J J 8 8 2 ] scores 3 11 08 02 00 00      <-- Winner (higher numerical score)
-         [ J J 5 5 3 ] scores 3 11 05 03 00 00
+         [ J J 8 8 2 ] scores 0x3 B 8 2 0 0      <-- Winner (higher numerical score)
+         [ J J 5 5 3 ] scores 0x3 B 5 3 0 0
 
     Parameters:
         hand: a list of Card objects
@@ -226,8 +341,7 @@ def score_two_pair(hand):
     if rank_values.count(rank_values[1]) == 2 and rank_values.count(rank_values[3]) == 2:
         paired_values = sorted([rank_values[1], rank_values[3]], reverse=True)
         unpaired_value = [k for k in rank_values if k != rank_values[1] and k != rank_values[3]][0]
-        score = '3' + f"{paired_values[0]:02d}{paired_values[1]:02d}{unpaired_value:02d}0000"
-        score = int(score)
+        score = hand_evaluator.make_score(hand_evaluator.TWO_PAIR, paired_values + [unpaired_value])
     return score
 
 
@@ -237,13 +351,13 @@ def score_num_of_kind(hand, n):
     All score for hands ranking Three of a Kind start with 4.
     All score for hands ranking Two Pair start with 2.
 
-    After the first digit in the score, the next digit pair represents the value of the tuple card,
-    and each remaining digit pair represent the value of the kicker cards, the cards did not contribute to the tuple.
+    After the hand rank in the score, the next hexadecimal digit represents the value of the tuple card,
+    and each remaining digit represents the value of the kicker cards, the cards did not contribute to the tuple.
 
     Example:
-         [ 2 2 2 J 6 ] scores 4 02 11 06 00 00
-         [ 9 9 Q 7 5 ] scores 2 09 12 07 05 00
-         [ 2 2 2 J 7 ] scores 4 02 11 07 00 00      <-- Winner (higher numerical score)
+         [ 2 2 2 J 6 ] scores 0x4 2 B 6 0 0
+         [ 9 9 Q 7 5 ] scores 0x2 9 C 7 5 0
+         [ 2 2 2 J 7 ] scores 0x4 2 B 7 0 0      <-- Winner (higher numerical score)
 
     Parameter:
         n: the number of same ranking cards to look for
@@ -255,16 +369,13 @@ def score_num_of_kind(hand, n):
             tuple_value = value
             if n == 4:
                 nontuple_value = [x for x in rank_values if x != tuple_value]
-                score = '8' + f"{tuple_value:02d}{nontuple_value[0]:02d}000000"
-                return int(score)
+                return hand_evaluator.make_score(hand_evaluator.FOUR_OF_A_KIND, [tuple_value, nontuple_value[0]])
             if n == 3:
                 nontuple_values = sorted([x for x in rank_values if x != tuple_value], reverse=True)
-                score = '4' + f"{tuple_value:02d}{nontuple_values[0]:02d}{nontuple_values[1]:02d}0000"
-                return int(score)
+                return hand_evaluator.make_score(hand_evaluator.THREE_OF_A_KIND, [tuple_value] + nontuple_values[:2])
             if n == 2:
                 nontuple_values = sorted([x for x in rank_values if x != tuple_value], reverse=True)
-                score = '2' + f"{tuple_value:02d}{nontuple_values[0]:02d}{nontuple_values[1]:02d}{nontuple_values[2]:02d}00"
-                return int(score)
+                return hand_evaluator.make_score(hand_evaluator.ONE_PAIR, [tuple_value] + nontuple_values[:3])
     return score
 
 
@@ -272,12 +383,12 @@ def score_full_house(hand):
     """
     All score for hands ranking Full House start with 7.
 
-    After the first digit in the score, the next digit pair represents the value of the triple card,
-    and the digit pair after that represents the value of the pair card.
+    After the hand rank in the score, the next hexadecimal digit represents the value of the triple card,
+    and the digit after that represents the value of the pair card.
 
     Example:
-         [ 5 5 5 J J ] scores 7 05 11 00 00 00
-         [ 5 5 5 Q Q ] scores 7 05 11 00 00 00      <-- Winner (higher numerical score)
+         [ 5 5 5 J J ] scores 0x7 5 B 0 0 0
+         [ 5 5 5 Q Q ] scores 0x7 5 C 0 0 0      <-- Winner (higher numerical score)
     """
     score = 0
     rank_values = [card.rank_value for card in hand]
@@ -288,8 +399,7 @@ def score_full_house(hand):
         else:
             pair_value = rank_values[0]
             triplet_value = rank_values[-1]
-        score = '7' + f"{triplet_value:02d}{pair_value:02d}000000"
-        score = int(score)
+        score = hand_evaluator.make_score(hand_evaluator.FULL_HOUSE, [triplet_value, pair_value])
     return score
 
 
@@ -297,18 +407,16 @@ def score_straight(hand):
     """
     All score for hands ranking Straight start with 5.
 
-    After the first digit in the score, the next digit pair represents the value of the high card in the straight.
+    After the hand rank in the score, the next hexadecimal digit represents the value of the high card in the straight.
 
     Example:
-         [ 9 8 7 6 5 ] scores 5 09 00 00 00 00          <-- Winner (higher numerical score)
-         [ 6 5 4 3 2 ] scores 5 06 00 00 00 00
+         [ 9 8 7 6 5 ] scores 0x5 9 0 0 0 0          <-- Winner (higher numerical score)
+         [ 6 5 4 3 2 ] scores 0x5 6 0 0 0 0
     """
     score = 0
     rank_values = [card.rank_value for card in hand]
     if (max(rank_values) - min(rank_values) == 4) and len(set(rank_values)) == 5:
-        high_card = max(rank_values)
-        score = '5' + f'{high_card:02d}00000000'
-        score = int(score)
+        score = hand_evaluator.make_score(hand_evaluator.STRAIGHT, [max(rank_values)])
     return score
 
 
@@ -316,20 +424,19 @@ def score_flush(hand):
     """
     All score for hands ranking Flush start with 6.
 
-    After the first digit in the score, each successive digit pair represents the value of
+    After the hand rank in the score, each successive hexadecimal digit represents the value of
     each card when reverse sorted.
 
 
     Example:
-         [ J♣  10♣  5♣  4♣  3♣ ] scores 6 11 10 05 04 03
-         [ J♥  10♥  6♥  5♥  3♥ ] scores 6 11 10 06 05 03        <-- Winner (higher numerical score)
+         [ J♣  10♣  5♣  4♣  3♣ ] scores 0x6 B A 5 4 3
+         [ J♥  10♥  6♥  5♥  3♥ ] scores 0x6 B A 6 5 3        <-- Winner (higher numerical score)
     """
     score = 0
     suit_values = [card.suit_value for card in hand]
     if len(set(suit_values)) == 1:
         rank_values = [card.rank_value for card in hand]
-        score = '6' + ''.join(f'{x:02d}' for x in rank_values)
-        score = int(score)
+        score = hand_evaluator.make_score(hand_evaluator.FLUSH, rank_values)
     return score
 
 
@@ -337,31 +444,31 @@ def score_straight_flush(hand):
     """
     All score for hands ranking Straight Flush start with 9.
 
-    After the first digit in the score, each successive digit pair represents the value of
-    each card when reverse sorted.t
+    After the hand rank in the score, the next hexadecimal digit represents the value of the high card in the
+    straight.
 
     Example:
-         [ J♣  10♣  9♣  8♣  7♣ ] scores 9 11 10 09 08 07        <-- Winner (higher numerical score)
-         [ 7♥   6♥  5♥  4♥  3♥ ] scores 9 07 06 05 04 03
+         [ J♣  10♣  9♣  8♣  7♣ ] scores 0x9 B 0 0 0 0        <-- Winner (higher numerical score)
+         [ 7♥   6♥  5♥  4♥  3♥ ] scores 0x9 7 0 0 0 0
     """
     score = 0
     if score_flush(hand) and score_straight(hand):
-        score += 90000000000
-        score += score_straight(hand) - 50000000000
+        high_card = hand_evaluator.score_rank(score_straight(hand), 0)
+        score = hand_evaluator.make_score(hand_evaluator.STRAIGHT_FLUSH, [high_card])
     return score
 
 
 def score_royal_flush(hand):
     """
-    A score for hands ranking Royal Flush start with 10.
+    A score for hands ranking Royal Flush start with 10 (0xA).
     This is the highest score possible and can only be scored by one player.
 
     Example:
-         [ A♦  K♦  Q♦  J♦  10♦ ] scores 10 00 00 00 00 00
+         [ A♦  K♦  Q♦  J♦  10♦ ] scores 0xA 0 0 0 0 0
     """
     score = 0
     if score_straight_flush(hand):
         rank_values = [card.rank_value for card in hand]
         if rank_values == [14, 13, 12, 11, 10]:
-            score = 100000000000
+            score = hand_evaluator.make_score(hand_evaluator.ROYAL_FLUSH, [])
     return score
@@ -1,12 +1,18 @@
-import os
+from functools import lru_cache
 
 from blessed import Terminal
 
 
+@lru_cache(maxsize=1)
+def get_terminal() -> Terminal:
+    """Returns the Terminal shared by everything that draws to or reads from the screen."""
+    return Terminal()
+
+
 def input_no_return(prompt):
     flush_input()
     print(prompt)
-    term = Terminal()
+    term = get_terminal()
     with term.cbreak():
         key = term.inkey()
     flush_input()
@@ -28,8 +34,10 @@ def flush_input():
 
 
 def clear_screen():
-    """Clear the screen."""
-    # For IDEs
-    print('\n' * 100)
-    # For OS terminals
-    os.system('cls' if os.name == 'nt' else 'clear')
+    """Clear the screen with the terminal's escape sequence, without starting a process."""
+    term = get_terminal()
+    if term.does_styling:
+        print(term.home + term.clear, end='', flush=True)
+    else:
+        # For IDEs and other outputs that are not terminals
+        print('\n' * 100)
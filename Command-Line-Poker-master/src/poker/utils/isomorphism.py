@@ -0,0 +1,251 @@
+"""
+#######################################################################################################################
+Suit isomorphism: hands that differ only by a relabelling of suits (e.g. As Ks on Qs 7h 2d and Ah Kh on Qh 7s 2c)
+are strategically identical, so caches keyed by hole cards and board only need one entry per isomorphism class.
+
+HandIndexer gives every class of a sequence of rounds of cards (e.g. 2 hole cards, then a 3 card flop) a dense index
+from 0 to size - 1, and unindex turns an index back into the class's canonical hand, following Waugh, "A Fast and
+Optimal Hand Isomorphism Algorithm" (2013):
+
+    1. Each suit's cards form one set of ranks per round. A suit's configuration is the number of cards it has in
+       each round, and suits are sorted by configuration, which decides the order of the canonical suits.
+    2. A suit's rank sets are indexed with the combinatorial number system, round by round among the ranks the
+       suit has left.
+    3. Suits sharing a configuration are interchangeable, so their indices are combined as a multiset.
+    4. Indices of the groups of suits are combined in mixed radix, offset by the configuration of the whole hand.
+
+Canonical hands use the suits in card_utils order: the suit with the greatest configuration becomes clubs.
+
+With the board dealt as one round there are 169 preflop classes, 1,286,792 on the flop, 13,960,050 on the turn, and
+123,156,254 on the river. canonicalize and canonical_index treat the board this way, since equity and showdown
+scores do not depend on the order of the board cards.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from functools import lru_cache
+from math import comb
+
+from src.poker.utils import card_utils
+
+NUM_SUITS = 4
+NUM_RANKS = 13
+
+
+class HandIndexer:
+    """Indexes the suit isomorphism classes of hands dealt in rounds.
+
+    Args:
+        cards_per_round: Number of cards dealt in each round, e.g. (2, 3) for hole cards and a flop
+    """
+
+    def __init__(self, cards_per_round: tuple[int, ...]):
+        self.cards_per_round = tuple(cards_per_round)
+        self.configurations: list[tuple[tuple[int, ...], ...]] = []
+        self.offsets: list[int] = []
+        size = 0
+        for configuration in _suit_configurations(self.cards_per_round):
+            self.configurations.append(configuration)
+            self.offsets.append(size)
+            size += _configuration_size(configuration)
+        self.size = size
+        self._configuration_index = {configuration: i for i, configuration in enumerate(self.configurations)}
+
+    def index(self, rounds) -> int:
+        """Returns the index of a hand's isomorphism class.
+
+        Args:
+            rounds: The int encoded cards dealt in each round, e.g. (hole_cards, flop)
+        """
+        rank_sets = self._rank_sets(rounds)
+        suit_configurations = [tuple(rank_set.bit_count() for rank_set in suit) for suit in rank_sets]
+        suit_indices = [_suit_index(suit, configuration) for suit, configuration in zip(rank_sets, suit_configurations)]
+        order = sorted(range(NUM_SUITS), key=lambda s: (suit_configurations[s], suit_indices[s]), reverse=True)
+        configuration = tuple(suit_configurations[s] for s in order)
+        index = 0
+        multiplier = 1
+        for start, end in _groups(configuration):
+            values = [suit_indices[order[i]] for i in range(start, end)]
+            index += multiplier * _multiset_index(values)
+            multiplier *= comb(_num_rank_sequences(configuration[start]) + end - start - 1, end - start)
+        return self.offsets[self._configuration_index[configuration]] + index
+
+    def unindex(self, index: int) -> list[tuple[int, ...]]:
+        """Returns the canonical hand of an isomorphism class, as the int encoded cards of each round."""
+        if not 0 <= index < self.size:
+            raise ValueError(f'Index must be between 0 and {self.size - 1}, got {index}.')
+        i = bisect_right(self.offsets, index) - 1
+        configuration = self.configurations[i]
+        index -= self.offsets[i]
+        rounds = [[] for _ in self.cards_per_round]
+        for start, end in _groups(configuration):
+            num_sequences = _num_rank_sequences(configuration[start])
+            group_size = comb(num_sequences + end - start - 1, end - start)
+            index, group_index = divmod(index, group_size)
+            for offset, value in enumerate(_multiset_unindex(group_index, end - start)):
+                suit = start + offset
+                for r, rank_set in enumerate(_suit_unindex(value, configuration[start])):
+                    rounds[r].extend(suit * card_utils.SUIT_SHIFT + rank for rank in _bits(rank_set))
+        return [tuple(sorted(cards)) for cards in rounds]
+
+    def canonicalize(self, rounds) -> list[tuple[int, ...]]:
+        """Returns the canonical hand isomorphic to a hand."""
+        return self.unindex(self.index(rounds))
+
+    def _rank_sets(self, rounds) -> list[list[int]]:
+        if len(rounds) != len(self.cards_per_round):
+            raise ValueError(f'Expected {len(self.cards_per_round)} rounds of cards, got {len(rounds)}.')
+        rank_sets = [[0] * len(rounds) for _ in range(NUM_SUITS)]
+        seen = 0
+        for r, cards in enumerate(rounds):
+            cards = card_utils.cards_to_ints(cards)
+            if len(cards) != self.cards_per_round[r]:
+                raise ValueError(f'Expected {self.cards_per_round[r]} cards in round {r}, got {len(cards)}.')
+            for card in cards:
+                if seen >> card & 1:
+                    raise ValueError(f'Card {card} is dealt twice.')
+                seen |= 1 << card
+                rank_sets[card // card_utils.SUIT_SHIFT][r] |= 1 << card % card_utils.SUIT_SHIFT
+        return rank_sets
+
+
+@lru_cache(maxsize=None)
+def get_indexer(cards_per_round: tuple[int, ...]) -> HandIndexer:
+    """Returns a shared HandIndexer for a sequence of rounds."""
+    return HandIndexer(cards_per_round)
+
+
+def canonicalize(hole_cards, board=()) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """Returns the canonical hole cards and board isomorphic to a hand, treating the board as one round."""
+    if not board:
+        return get_indexer((len(hole_cards),)).canonicalize((hole_cards,))[0], ()
+    hole_cards, board = get_indexer((len(hole_cards), len(board))).canonicalize((hole_cards, board))
+    return hole_cards, board
+
+
+def canonical_index(hole_cards, board=()) -> int:
+    """Returns the index of a hand's isomorphism class among hands with as many hole and board cards."""
+    if not board:
+        return get_indexer((len(hole_cards),)).index((hole_cards,))
+    return get_indexer((len(hole_cards), len(board))).index((hole_cards, board))
+
+
+def _suit_configurations(cards_per_round: tuple[int, ...]) -> list[tuple[tuple[int, ...], ...]]:
+    """Returns every way of splitting each round's cards among the suits, with the suits sorted."""
+    per_suit = [()]
+    for num_cards in cards_per_round:
+        # Each suit's count in this round, given how many cards it already has
+        per_suit = [counts + (n,) for counts in per_suit for n in range(min(num_cards, NUM_RANKS - sum(counts)) + 1)]
+    configurations = set()
+
+    def split(suits: tuple[tuple[int, ...], ...]) -> None:
+        if len(suits) == NUM_SUITS:
+            if all(sum(suit[r] for suit in suits) == cards_per_round[r] for r in range(len(cards_per_round))):
+                configurations.add(suits)
+            return
+        for suit in per_suit:
+            # Suits are sorted in decreasing order
+            if suits and suit > suits[-1]:
+                continue
+            if all(sum(s[r] for s in suits) + suit[r] <= cards_per_round[r] for r in range(len(cards_per_round))):
+                split(suits + (suit,))
+
+    split(())
+    return sorted(configurations, reverse=True)
+
+
+def _groups(configuration: tuple[tuple[int, ...], ...]) -> list[tuple[int, int]]:
+    """Returns the start and end of each run of suits with the same configuration."""
+    groups = []
+    start = 0
+    for i in range(1, NUM_SUITS + 1):
+        if i == NUM_SUITS or configuration[i] != configuration[start]:
+            groups.append((start, i))
+            start = i
+    return groups
+
+
+def _configuration_size(configuration: tuple[tuple[int, ...], ...]) -> int:
+    size = 1
+    for start, end in _groups(configuration):
+        size *= comb(_num_rank_sequences(configuration[start]) + end - start - 1, end - start)
+    return size
+
+
+@lru_cache(maxsize=None)
+def _num_rank_sequences(suit_configuration: tuple[int, ...]) -> int:
+    """Returns the number of ways a suit can have the given number of cards in each round."""
+    count = 1
+    used = 0
+    for n in suit_configuration:
+        count *= comb(NUM_RANKS - used, n)
+        used += n
+    return count
+
+
+def _suit_index(rank_sets: list[int], suit_configuration: tuple[int, ...]) -> int:
+    """Indexes a suit's rank sets, each set among the ranks the suit has not used in earlier rounds."""
+    index = 0
+    multiplier = 1
+    used = 0
+    for rank_set, n in zip(rank_sets, suit_configuration):
+        # Position of each rank among the ranks still available
+        colex = 0
+        for i, rank in enumerate(_bits(rank_set)):
+            position = rank - (used & ((1 << rank) - 1)).bit_count()
+            colex += comb(position, i + 1)
+        index += multiplier * colex
+        multiplier *= comb(NUM_RANKS - used.bit_count(), n)
+        used |= rank_set
+    return index
+
+
+def _suit_unindex(index: int, suit_configuration: tuple[int, ...]) -> list[int]:
+    rank_sets = []
+    used = 0
+    for n in suit_configuration:
+        available = NUM_RANKS - used.bit_count()
+        index, colex = divmod(index, comb(available, n))
+        positions = _colex_unindex(colex, n)
+        free_ranks = [rank for rank in range(NUM_RANKS) if not used >> rank & 1]
+        rank_set = 0
+        for position in positions:
+            rank_set |= 1 << free_ranks[position]
+        rank_sets.append(rank_set)
+        used |= rank_set
+    return rank_sets
+
+
+def _colex_unindex(index: int, k: int) -> list[int]:
+    """Returns the k positions whose colexicographic index is index, in increasing order."""
+    positions = []
+    for i in range(k, 0, -1):
+        position = i - 1
+        while comb(position + 1, i) <= index:
+            position += 1
+        index -= comb(position, i)
+        positions.append(position)
+    return positions[::-1]
+
+
+def _multiset_index(values: list[int]) -> int:
+    """Indexes a multiset of values, given in decreasing order, with the combinatorial number system."""
+    k = len(values)
+    return sum(comb(value + k - 1 - j, k - j) for j, value in enumerate(values))
+
+
+def _multiset_unindex(index: int, k: int) -> list[int]:
+    positions = _colex_unindex(index, k)
+    # Undo the shift that made equal values distinct, largest first
+    return [positions[k - 1 - j] - (k - 1 - j) for j in range(k)]
+
+
+def _bits(mask: int) -> list[int]:
+    bits = []
+    while mask:
+        low_bit = mask & -mask
+        bits.append(low_bit.bit_length() - 1)
+        mask ^= low_bit
+    return bits
@@ -0,0 +1,113 @@
+"""
+#######################################################################################################################
+Precomputed preflop equity of the 169 starting hand classes against 1 to 9 opponents holding random cards.
+
+Before the flop a hand's equity only depends on its ranks and whether it is suited, so the 1326 possible hole card
+pairs fall into 169 classes: 13 pairs, 78 suited, and 78 offsuit hands. Classes are laid out on a 13 x 13 grid of
+rank indices (0 for a deuce to 12 for an ace): pairs on the diagonal, suited hands at (high, low), offsuit hands at
+(low, high).
+
+The table ships as data/preflop_equity.npy and is loaded on the first lookup. To regenerate it:
+
+    > python3 -m src.poker.utils.preflop_equity --samples 50000 --seed 0
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+import argparse
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from src.poker.utils import card_utils
+from src.poker.utils.equity import sample_equity
+
+NUM_STARTING_HANDS = 169
+MAX_OPPONENTS = 9
+TABLE_PATH = Path(__file__).resolve().parent.parent / 'data' / 'preflop_equity.npy'
+_RANK_SYMBOLS = '23456789TJQKA'
+
+
+def starting_hand_index(hole_cards) -> int:
+    """Returns the class (0-168) of two hole cards, given as Cards or int encoded cards."""
+    first, second = card_utils.cards_to_ints(hole_cards)
+    high, low = first % card_utils.SUIT_SHIFT, second % card_utils.SUIT_SHIFT
+    if high < low:
+        high, low = low, high
+    if first // card_utils.SUIT_SHIFT == second // card_utils.SUIT_SHIFT:
+        return high * 13 + low
+    return low * 13 + high
+
+
+def starting_hand_name(index: int) -> str:
+    """Returns the usual name of a starting hand class, e.g. 'AA', 'AKs', or '72o'."""
+    row, column = divmod(index, 13)
+    if row == column:
+        return _RANK_SYMBOLS[row] * 2
+    if row > column:
+        return _RANK_SYMBOLS[row] + _RANK_SYMBOLS[column] + 's'
+    return _RANK_SYMBOLS[column] + _RANK_SYMBOLS[row] + 'o'
+
+
+def representative_hole_cards(index: int) -> tuple[int, int]:
+    """Returns int encoded hole cards belonging to a starting hand class."""
+    row, column = divmod(index, 13)
+    high, low = max(row, column), min(row, column)
+    # Clubs for the first card, and clubs again only if suited
+    return high, low + (0 if row > column else card_utils.SUIT_SHIFT)
+
+
+def preflop_equity(hole_cards, num_opponents: int) -> float:
+    """Returns the equity of two hole cards before the flop against opponents holding random cards.
+
+    Args:
+        hole_cards: Two Cards or int encoded cards
+        num_opponents: Number of opponents, from 1 to 9
+    """
+    if not 1 <= num_opponents <= MAX_OPPONENTS:
+        raise ValueError(f'Preflop equity is known for 1 to {MAX_OPPONENTS} opponents, got {num_opponents}.')
+    return float(_load_table()[starting_hand_index(hole_cards), num_opponents - 1])
+
+
+@lru_cache(maxsize=1)
+def _load_table() -> np.ndarray:
+    return np.load(TABLE_PATH)
+
+
+def generate_table(samples: int = 50000, seed: int = 0) -> np.ndarray:
+    """Estimates the equity of every starting hand class against every number of opponents.
+
+    Every entry is estimated from its own random stream, derived from the seed and the entry,
+    so the table is the same however it is generated.
+
+    Returns:
+        np.ndarray: float32 equities of shape (169, 9), indexed by class and number of opponents - 1
+    """
+    table = np.empty((NUM_STARTING_HANDS, MAX_OPPONENTS), dtype=np.float32)
+    for index in range(NUM_STARTING_HANDS):
+        for num_opponents in range(1, MAX_OPPONENTS + 1):
+            table[index, num_opponents - 1] = _estimate_entry(index, num_opponents, samples, seed)
+    return table
+
+
+def _estimate_entry(index: int, num_opponents: int, samples: int, seed: int) -> float:
+    rng = np.random.default_rng([seed, index, num_opponents])
+    return sample_equity(representative_hole_cards(index), (), num_opponents, samples, rng=rng).equity
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate the preflop equity table.')
+    parser.add_argument('--samples', type=int, default=50000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=Path, default=TABLE_PATH)
+    args = parser.parse_args()
+    table = generate_table(args.samples, args.seed)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    np.save(args.output, table)
+    print(f'Wrote {table.shape[0]} x {table.shape[1]} equities to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+#######################################################################################################################
+Zobrist hashing of the public state of a hand (see HandState).
+
+Every component of the state has random 64 bit keys, and a state's hash is the XOR of the keys of its components.
+A change to one component updates the hash by XORing out the old key and XORing in the new one, so HandState keeps
+its hash up to date in a few operations per move instead of rehashing the whole state.
+
+Chip counts get one key per byte of the count, so changing a count only touches the keys of the bytes that changed.
+Board cards are XORed in regardless of the order they were dealt in.
+
+Only public information is hashed: hole cards and the runout are not, so every deal of the hidden cards shares a hash.
+The betting history is summarized by what it determines for the rest of the hand (the bets, stacks, raises, and which
+players folded, went all-in, or locked in their bets), so different move orders that reach the same position share a
+hash.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+import random
+from functools import lru_cache
+
+MAX_PLAYERS = 10
+NUM_CHIP_BYTES = 4
+
+# Slots of the chip counts hashed for each player, followed by the slots of the table's counts
+STACK, BET, COMMITTED = 0, 1, 2
+LAST_BET = 3 * MAX_PLAYERS
+NUM_RAISES = LAST_BET + 1
+BIG_BLIND = LAST_BET + 2
+# Bitmasks hashed for each player
+FOLDED, ALL_IN, LOCKED = 0, 1, 2
+
+_rng = random.Random(0x5A0B_2157)
+
+
+def _keys(n: int) -> list[int]:
+    return [_rng.getrandbits(64) for _ in range(n)]
+
+
+CARD_KEYS = _keys(52)
+CHIP_KEYS = [[_keys(256) for _ in range(NUM_CHIP_BYTES)] for _ in range(BIG_BLIND + 1)]
+FLAG_KEYS = [_keys(MAX_PLAYERS) for _ in range(3)]
+TO_ACT_KEYS = _keys(MAX_PLAYERS)
+DEALER_KEYS = _keys(MAX_PLAYERS)
+PHASE_KEYS = _keys(4)
+PENDING_KEYS = _keys(6)
+TERMINAL_KEY = _keys(1)[0]
+# Not part of a state's hash: for searchers to mix in what they know privately, i.e. which seat they are in and
+# their hole cards, when results from different points of view share a table
+SEAT_KEYS = _keys(MAX_PLAYERS)
+HOLE_KEYS = _keys(52)
+
+
+# Search trees revisit the same few chip counts, so remembering their keys is cheaper than recombining bytes
+@lru_cache(maxsize=1 << 16)
+def chip_key(slot: int, chips: int) -> int:
+    """Returns the key of a chip count in a slot."""
+    keys = CHIP_KEYS[slot]
+    key = 0
+    for i in range(NUM_CHIP_BYTES):
+        key ^= keys[i][chips >> 8 * i & 0xFF]
+    return key
+
+
+def flag_key(flag: int, mask: int) -> int:
+    """Returns the XOR of the keys of the players set in a bitmask."""
+    keys = FLAG_KEYS[flag]
+    key = 0
+    while mask:
+        low_bit = mask & -mask
+        key ^= keys[low_bit.bit_length() - 1]
+        mask ^= low_bit
+    return key
+
+
+def hash_state(state) -> int:
+    """Hashes a HandState from scratch."""
+    key = 0
+    for card in state.board:
+        key ^= CARD_KEYS[card]
+    for i in range(len(state.stacks)):
+        key ^= chip_key(3 * i + STACK, state.stacks[i])
+        key ^= chip_key(3 * i + BET, state.bets[i])
+        key ^= chip_key(3 * i + COMMITTED, state.committed[i])
+    key ^= chip_key(LAST_BET, state.last_bet) ^ chip_key(NUM_RAISES, state.num_raises)
+    key ^= chip_key(BIG_BLIND, state.big_blind)
+    key ^= flag_key(FOLDED, state.folded) ^ flag_key(ALL_IN, state.all_in) ^ flag_key(LOCKED, state.locked)
+    key ^= TO_ACT_KEYS[state.to_act] ^ DEALER_KEYS[state.dealer]
+    key ^= PHASE_KEYS[state.phase.value - 1] ^ PENDING_KEYS[state.pending]
+    if state.terminal:
+        key ^= TERMINAL_KEY
+    return key
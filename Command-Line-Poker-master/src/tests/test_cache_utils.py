@@ -0,0 +1,65 @@
+from src.poker.utils.cache_utils import LRUCache, TranspositionTable
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+class TestLRUCache(PokerTestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+
+        cache.put('c', 3)
+
+        self.assertEqual(2, len(cache))
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+
+    def test_counts_hits_and_misses(self):
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+
+        self.assertEqual(1, cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(0, cache.get('b', 0))
+
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(2, cache.misses)
+        self.assertAlmostEqual(1 / 3, cache.hit_rate)
+        cache.clear()
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.hits + cache.misses)
+
+    def test_size_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            LRUCache(maxsize=0)
+
+
+class TestTranspositionTable(PokerTestCase):
+
+    def test_hit_needs_enough_depth(self):
+        table = TranspositionTable(size=8)
+        table.put(12345, depth=2, value=1.5)
+
+        self.assertEqual(1.5, table.get(12345, depth=1))
+        self.assertEqual(1.5, table.get(12345, depth=2))
+        self.assertIsNone(table.get(12345, depth=3))
+        self.assertIsNone(table.get(54321))
+        self.assertEqual(2, table.hits)
+        self.assertEqual(2, table.misses)
+
+    def test_depth_preferred_replacement(self):
+        table = TranspositionTable(size=8)
+        table.put(3, depth=3, value='deep')
+
+        # 11 competes with 3 for the same slot
+        table.put(11, depth=1, value='shallow')
+        self.assertEqual('deep', table.get(3))
+        self.assertIsNone(table.get(11))
+
+        table.put(11, depth=3, value='as deep')
+        self.assertEqual('as deep', table.get(11))
+        self.assertIsNone(table.get(3))
+        self.assertEqual(1, table.replacements)
+        self.assertEqual(1, len(table))
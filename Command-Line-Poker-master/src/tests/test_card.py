@@ -1,3 +1,6 @@
+import copy
+import pickle
+
 from src.poker.card import Card
 from src.tests.test_utils.test_utils import PokerTestCase
 
@@ -60,3 +63,25 @@ class TestCard(PokerTestCase):
         card_a = Card(2, 'D')
         card_b = Card(9, 'C')
         self.assertNotEqual(card_a, card_b)
+
+    def test_interned(self):
+        card = Card(5, 'H')
+
+        self.assertIs(card, Card(5, 'H'))
+        self.assertIs(card, copy.deepcopy(card))
+        self.assertIs(card, pickle.loads(pickle.dumps(card)))
+        self.assertEqual(52, len({Card(rank, suit) for suit in 'CDHS' for rank in range(2, 15)}))
+
+    def test_immutable(self):
+        card = Card(5, 'H')
+
+        with self.assertRaises(AttributeError):
+            card.rank_value = 6
+        with self.assertRaises(AttributeError):
+            card.kicker = True
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            Card(1, 'H')
+        with self.assertRaises(ValueError):
+            Card(5, 'X')
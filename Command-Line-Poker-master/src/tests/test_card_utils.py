@@ -0,0 +1,84 @@
+import random
+
+import numpy as np
+
+from src.poker.card import Card
+from src.poker.deck import Deck
+from src.poker.utils import card_utils
+from src.poker.utils import hand_evaluator
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+class TestCardUtils(PokerTestCase):
+
+    def test_card_int_round_trip(self):
+        deck = Deck()
+        ints = card_utils.cards_to_ints(deck.cards)
+        self.assertListEqual(list(range(52)), ints)
+        self.assertListEqual(deck.cards, card_utils.ints_to_cards(ints))
+
+    def test_card_to_int(self):
+        self.assertEqual(0, card_utils.card_to_int(Card(2, 'C')))
+        self.assertEqual(12, card_utils.card_to_int(Card(14, 'C')))
+        self.assertEqual(22, card_utils.card_to_int(Card(11, 'D')))
+        self.assertEqual(51, card_utils.card_to_int(Card(14, 'S')))
+        self.assertEqual(Card(10, 'H'), card_utils.int_to_card(34))
+
+    def test_mask_round_trip(self):
+        cards = [Card(14, 'S'), Card(2, 'C'), Card(9, 'H')]
+        mask = card_utils.cards_to_mask(cards)
+        self.assertEqual((1 << 51) | (1 << 0) | (1 << 33), mask)
+        self.assertEqual(mask, card_utils.cards_to_mask(card_utils.cards_to_ints(cards)))
+        self.assertListEqual([0, 33, 51], card_utils.mask_to_ints(mask))
+        self.assertCountEqual(cards, card_utils.mask_to_cards(mask))
+
+    def test_rank_and_suit_of(self):
+        for card in Deck().cards:
+            n = card_utils.card_to_int(card)
+            self.assertEqual(card.rank_value, card_utils.rank_of(n))
+            self.assertEqual(card.suit_value, card_utils.suit_of(n))
+            self.assertEqual(card.rank_value, card_utils.rank_of(card))
+
+    def test_evaluate_ints_matches_cards(self):
+        rng = random.Random(5104)
+        deck = Deck()
+        for _ in range(1000):
+            cards = rng.sample(deck.cards, 7)
+            ints = card_utils.cards_to_ints(cards)
+            score = hand_evaluator.evaluate(cards)
+            self.assertEqual(score, hand_evaluator.evaluate(ints))
+            self.assertEqual(score, hand_evaluator.evaluate_mask(card_utils.cards_to_mask(ints)))
+            best_score, best_cards = hand_evaluator.best_hand(cards)
+            self.assertEqual((best_score, card_utils.cards_to_ints(best_cards)), hand_evaluator.best_hand(ints))
+
+    def test_numpy_ints(self):
+        cards = np.array([0, 25, 51], dtype=np.uint8)
+
+        self.assertEqual([0, 25, 51], card_utils.cards_to_ints(cards))
+        self.assertTrue(all(type(card) is int for card in card_utils.cards_to_ints(cards)))
+        self.assertEqual(1 | 1 << 25 | 1 << 51, card_utils.cards_to_mask(cards))
+        self.assertEqual([2, 14, 14], [card_utils.rank_of(card) for card in cards])
+        self.assertEqual(['C', 'D', 'S'], [card_utils.suit_of(card) for card in cards])
+
+
+class TestIntDeck(PokerTestCase):
+
+    def test_refill(self):
+        deck = Deck(as_ints=True)
+        self.assertListEqual(list(range(52)), deck.cards)
+
+    def test_deal(self):
+        deck = Deck(as_ints=True)
+        deck.shuffle()
+
+        hand = deck.deal(2)
+
+        self.assertEqual(50, len(deck.cards))
+        self.assertTrue(all(isinstance(card, int) for card in hand))
+        self.assertEqual(0, card_utils.cards_to_mask(hand) & card_utils.cards_to_mask(deck.cards))
+
+    def test_str(self):
+        deck = Deck(as_ints=True)
+        deck.cards = [29, 24, 45]
+
+        self.assertEqualStripColor('[5 ♥] [K ♦] [8 ♠]', str(deck))
@@ -1,5 +1,8 @@
+import random
 from collections import Counter
 
+import numpy as np
+
 from src.poker.card import Card
 from src.poker.deck import Deck
 from src.tests.test_utils.test_utils import PokerTestCase
@@ -39,6 +42,49 @@ class TestDeck(PokerTestCase):
                 differences += 1
         self.assertGreater(differences, 0)
 
+    def test_seeded_shuffle(self):
+        first, second = Deck(rng=random.Random(24)), Deck(rng=random.Random(24))
+
+        first.shuffle()
+        second.shuffle()
+
+        self.assertListEqual(first.cards, second.cards)
+
+    def test_partial_shuffle(self):
+        full, partial = Deck(rng=random.Random(24)), Deck(rng=random.Random(24))
+
+        full.shuffle()
+        partial.shuffle(12)
+
+        self.assertListEqual(full.deal(12), partial.deal(12))
+        self.assertEqual(40, len(partial.cards))
+
+    def test_deal(self):
+        deck = Deck(as_ints=True)
+
+        self.assertListEqual([51, 50, 49], deck.deal(3))
+        self.assertListEqual([], deck.deal(0))
+        self.assertEqual(49, len(deck.cards))
+        self.assertEqual(49, len(deck.deal(49)))
+        self.assertListEqual([], deck.cards)
+
+    def test_deal_more_than_left(self):
+        deck = Deck(as_ints=True)
+        deck.deal(50)
+
+        with self.assertRaises(ValueError):
+            deck.deal(5)
+        self.assertEqual(2, len(deck.cards))
+
+    def test_shuffled_decks(self):
+        decks = Deck.shuffled_decks(1000, 9, rng=np.random.default_rng(24))
+
+        self.assertEqual((1000, 9), decks.shape)
+        self.assertEqual(np.uint8, decks.dtype)
+        self.assertTrue(all(len(set(deck)) == 9 for deck in decks.tolist()))
+        self.assertLess(decks.max(), 52)
+        self.assertEqual(52, len(np.unique(decks[:, 0])))
+
     def test_burn(self):
         deck = Deck()
 
@@ -0,0 +1,119 @@
+from itertools import combinations
+
+import numpy as np
+
+from src.poker.card import Card
+from src.poker.utils import card_utils
+from src.poker.utils import hand_evaluator
+from src.poker.utils.equity import calculate_equity, count_outcomes, enumerate_equity, sample_equity
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+class TestHandEvaluatorArrays(PokerTestCase):
+
+    def test_evaluate_array_matches_evaluate(self):
+        rng = np.random.default_rng(5105)
+        hands = np.argsort(rng.random((2000, 52)), axis=1)[:, :7]
+
+        scores = hand_evaluator.evaluate_array(hands)
+
+        self.assertListEqual([hand_evaluator.evaluate(hand) for hand in hands.tolist()], scores.tolist())
+
+
+class TestCalculateEquity(PokerTestCase):
+
+    def test_pocket_aces_heads_up(self):
+        result = sample_equity([Card(14, 'S'), Card(14, 'H')], [], 1, samples=20000,
+                                  rng=np.random.default_rng(5106))
+
+        self.assertAlmostEqual(0.85, result.equity, delta=0.015)
+        low, high = result.confidence_interval
+        self.assertLess(low, result.equity)
+        self.assertGreater(high, result.equity)
+        self.assertAlmostEqual(1.0, result.win + result.tie + result.lose)
+        self.assertEqual(20000, result.samples)
+
+    def test_more_opponents_lower_equity(self):
+        hole_cards = [Card(13, 'D'), Card(12, 'D')]
+        rng = np.random.default_rng(5107)
+
+        heads_up = sample_equity(hole_cards, [], 1, samples=5000, rng=rng)
+        multiway = sample_equity(hole_cards, [], 6, samples=5000, rng=rng)
+
+        self.assertGreater(heads_up.equity, multiway.equity)
+
+    def test_known_winner_on_river(self):
+        # Royal flush on the board with the player holding nothing: every opponent ties
+        community = card_utils.cards_to_ints([Card(14, 'S'), Card(13, 'S'), Card(12, 'S'), Card(11, 'S'),
+                                              Card(10, 'S')])
+        result = calculate_equity([Card(2, 'C'), Card(3, 'D')], community, 2, samples=500)
+
+        self.assertEqual(1.0, result.tie)
+        self.assertAlmostEqual(1 / 3, result.equity)
+
+    def test_reproducible_with_seed(self):
+        hole_cards = [Card(9, 'C'), Card(9, 'H')]
+        community = [Card(2, 'S'), Card(7, 'D'), Card(13, 'C')]
+
+        first = sample_equity(hole_cards, community, 3, samples=1000, rng=np.random.default_rng(42))
+        second = sample_equity(hole_cards, community, 3, samples=1000, rng=np.random.default_rng(42))
+
+        self.assertEqual(first, second)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            calculate_equity([Card(9, 'C')], [], 1)
+        with self.assertRaises(ValueError):
+            calculate_equity([Card(9, 'C'), Card(9, 'C')], [], 1)
+        with self.assertRaises(ValueError):
+            calculate_equity([Card(9, 'C'), Card(9, 'H')], [], 0)
+        with self.assertRaises(ValueError):
+            calculate_equity([Card(9, 'C'), Card(9, 'H')], [], 1, samples=0)
+
+
+class TestEnumerateEquity(PokerTestCase):
+
+    def test_river_matches_brute_force(self):
+        hole_cards = [Card(14, 'C'), Card(10, 'D')]
+        community = [Card(10, 'S'), Card(4, 'H'), Card(7, 'C'), Card(12, 'C'), Card(2, 'D')]
+        known = hole_cards + community
+        unseen = [card for card in card_utils.ints_to_cards(range(52)) if card not in known]
+        hero_score = hand_evaluator.evaluate(hole_cards + community)
+        wins = ties = 0
+        for opponent_hole in combinations(unseen, 2):
+            opponent_score = hand_evaluator.evaluate(list(opponent_hole) + community)
+            wins += hero_score > opponent_score
+            ties += hero_score == opponent_score
+
+        result = enumerate_equity(hole_cards, community, 1)
+
+        self.assertTrue(result.exact)
+        self.assertEqual(990, result.samples)
+        self.assertAlmostEqual(wins / 990, result.win)
+        self.assertAlmostEqual(ties / 990, result.tie)
+        self.assertAlmostEqual((wins + ties / 2) / 990, result.equity)
+
+    def test_turn_agrees_with_sampling(self):
+        hole_cards = [Card(8, 'H'), Card(9, 'H')]
+        community = [Card(10, 'H'), Card(2, 'H'), Card(13, 'S'), Card(5, 'D')]
+
+        exact = enumerate_equity(hole_cards, community, 1)
+        estimate = sample_equity(hole_cards, community, 1, samples=20000, rng=np.random.default_rng(5108))
+
+        self.assertEqual(count_outcomes(46, 1, 1), exact.samples)
+        self.assertAlmostEqual(exact.equity, estimate.equity, delta=0.015)
+
+    def test_calculate_equity_picks_enumeration(self):
+        hole_cards = [Card(6, 'S'), Card(6, 'C')]
+        flop = [Card(14, 'D'), Card(13, 'D'), Card(3, 'C')]
+        turn = flop + [Card(9, 'H')]
+
+        self.assertTrue(calculate_equity(hole_cards, turn, 1).exact)
+        self.assertFalse(calculate_equity(hole_cards, flop, 1, samples=100).exact)
+        self.assertFalse(calculate_equity(hole_cards, turn, 3, samples=100).exact)
+        self.assertFalse(calculate_equity(hole_cards, [], 1, samples=100).exact)
+
+    def test_count_outcomes(self):
+        self.assertEqual(990, count_outcomes(45, 0, 1))
+        self.assertEqual(1081 * 990, count_outcomes(47, 2, 1))
+        self.assertEqual(990 * 903 // 2, count_outcomes(45, 0, 2))
@@ -0,0 +1,90 @@
+import random
+from unittest.mock import MagicMock, patch
+
+from src.poker.enums.betting_move import BettingMove
+from src.poker.enums.phase import Phase
+from src.poker.events import (BetPlaced, CardsDealt, EventBus, HandEnded, HandStarted, PotsUpdated, PotUncontested,
+                              Showdown)
+from src.poker.pokergamestate import PokerGameState
+from src.poker.prompts.terminal_sink import TerminalSink
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+class TestEventBus(PokerTestCase):
+
+    def test_sinks_receive_events_in_subscription_order(self):
+        bus = EventBus()
+        received = []
+        def first(event):
+            received.append(('first', event))
+
+        def second(event):
+            received.append(('second', event))
+
+        bus.subscribe(first)
+        bus.subscribe(second)
+
+        bus.emit('event')
+        bus.unsubscribe(first)
+        bus.emit('another event')
+
+        self.assertListEqual([('first', 'event'), ('second', 'event'), ('second', 'another event')], received)
+
+    def test_bus_is_falsy_without_sinks(self):
+        bus = EventBus()
+        self.assertFalse(bus)
+        bus.subscribe(print)
+        self.assertTrue(bus)
+
+
+class TestGameEvents(PokerTestCase):
+
+    def setUp(self):
+        random.seed(2020)
+
+    def test_hand_events(self):
+        game = PokerGameState(headless=True)
+        events = []
+        game.events.subscribe(events.append)
+
+        game.play(num_hands=1)
+
+        self.assertIsInstance(events[0], HandStarted)
+        self.assertEqual(0, events[0].hand_number)
+        self.assertIsInstance(events[1], CardsDealt)
+        self.assertEqual(Phase.PREFLOP, events[1].phase)
+        self.assertEqual(4, len(events[1].cards))
+        self.assertEqual(['small', 'big'], [event.blind for event in events[2:4]])
+        self.assertEqual(HandEnded(0), events[-1])
+        self.assertIsInstance(events[-2], (PotUncontested, Showdown))
+        last_pots = [event for event in events if isinstance(event, PotsUpdated)][-1].pots
+        awarded = sum(event.amount for event in events if isinstance(event, (PotUncontested, Showdown)))
+        self.assertEqual(sum(pot.amount for pot in last_pots), awarded)
+
+    def test_headless_game_builds_no_events(self):
+        game = PokerGameState(headless=True)
+        for player in game.players:
+            player.chips = 10 ** 9
+        game.events.emit = MagicMock(side_effect=AssertionError('emitted an event'))
+
+        with patch('src.poker.pokergamestate.BetPlaced', side_effect=AssertionError('built an event')):
+            game.play(num_hands=10)
+
+        self.assertEqual(10, game.table.hands_played)
+
+
+class TestTerminalSink(PokerTestCase):
+
+    def test_events_are_shown_through_the_prompt(self):
+        game = MagicMock()
+        sink = TerminalSink(game)
+        sink.prompt = MagicMock()
+        player = game.players[0]
+
+        sink(BetPlaced(player, BettingMove.CALLED, 40))
+        sink(PotsUpdated([]))
+        sink(PotUncontested(player, None, 80))
+
+        sink.prompt.show_player_move.assert_called_once_with(player, BettingMove.CALLED, game.pause, 40)
+        self.assertEqual(3, sink.prompt.show_table.call_count)
+        sink.prompt.show_default_winner_fold.assert_called_once_with(player.name)
@@ -0,0 +1,118 @@
+from src.poker.agents.expectiminimax import Expectiminimax, style_opponent_model, uniform_opponent_model
+from src.poker.card import Card
+from src.poker.enums.betting_move import BettingMove
+from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.enums.phase import Phase
+from src.poker.hand_state import HandState
+from src.poker.pokergamestate import PokerGameState
+from src.poker.utils import card_utils
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+def ints(*cards):
+    return tuple(card_utils.card_to_int(Card(rank, suit)) for rank, suit in cards)
+
+
+def river_state(hole_cards):
+    """Player 0 to act on the river, facing a bet."""
+    board = ints((10, 'S'), (11, 'S'), (12, 'S'), (2, 'D'), (5, 'C'))
+    return HandState(stacks=(1000, 800), bets=(0, 200), committed=(500, 500), folded=0, all_in=0, locked=2,
+                     to_act=0, phase=Phase.RIVER, last_bet=200, num_raises=1, big_blind=100, dealer=1, board=board,
+                     holes=(hole_cards, None))
+
+
+class TestOpponentModels(PokerTestCase):
+
+    def test_style_models_match_legal_actions(self):
+        states = [HandState.new_hand((1000, 1000, 1000), big_blind=100),
+                  HandState.new_hand((150, 1000, 1000), big_blind=100),
+                  HandState.new_hand((50, 1000, 1000), big_blind=100)]
+        capped = states[0]
+        for _ in range(4):
+            capped = capped.apply(BettingMove.RAISED)
+        states.append(capped)
+        for playing_style in ComputerPlayingStyle:
+            opponent_model = style_opponent_model(playing_style)
+            for state in states:
+                legal_actions = state.legal_actions()
+                probabilities = opponent_model(state, legal_actions)
+                self.assertEqual(len(legal_actions), len(probabilities))
+                self.assertAlmostEqual(1.0, sum(probabilities))
+
+    def test_safe_model_mostly_calls(self):
+        state = HandState.new_hand((1000, 1000, 1000), big_blind=100)
+
+        probabilities = style_opponent_model(ComputerPlayingStyle.SAFE)(state, state.legal_actions())
+
+        self.assertListEqual([.7, .2, .1], probabilities)
+
+
+class TestExpectiminimax(PokerTestCase):
+
+    def test_does_not_fold_the_nuts(self):
+        agent = Expectiminimax('Agent', game=None, depth=2, seed=5108)
+
+        move = agent.getAction(river_state(ints((14, 'S'), (13, 'S'))))
+
+        self.assertIs(BettingMove.RAISED, move)
+        self.assertGreater(agent.last_decision.nodes, 3)
+        self.assertGreater(agent.last_decision.seconds, 0)
+
+    def test_folds_hopeless_hand_to_a_bet(self):
+        agent = Expectiminimax('Agent', game=None, depth=1, opponent_model=uniform_opponent_model, seed=5109)
+        # Seven high, and any pair, straight, or flush beats it
+        state = river_state(ints((7, 'H'), (3, 'C')))
+
+        self.assertIs(BettingMove.FOLDED, agent.getAction(state))
+
+    def test_evaluation_when_everyone_else_folds(self):
+        agent = Expectiminimax('Agent', game=None, depth=1)
+        state = HandState.new_hand((1000, 1000, 1000), big_blind=100, dealer=2,
+                                   holes=(None, None, ints((14, 'S'), (13, 'S'))))
+        agent.getAction(state)
+
+        state = state.apply(BettingMove.RAISED).apply(BettingMove.FOLDED).apply(BettingMove.FOLDED)
+
+        self.assertEqual(50 + 100, agent.evaluationFunction(state))
+
+    def test_chance_nodes_enumerate_when_asked(self):
+        state = river_state(ints((14, 'S'), (13, 'S')))
+        turn_state = HandState(state.stacks, (0, 0), (600, 600), 0, 0, 0, 0, Phase.TURN, 0, 0, 100, 1,
+                               board=state.board[:4], holes=state.holes)
+        sampling = Expectiminimax('Agent', game=None, depth=1, chance_samples=3)
+        enumerating = Expectiminimax('Agent', game=None, depth=1, chance_samples=None)
+        checked = turn_state.apply(BettingMove.CHECKED).apply(BettingMove.CHECKED)
+
+        sampling.getAction(turn_state)
+        sampling.nodes = 0
+        sampling.getValue(checked, 0)
+        enumerating.getAction(turn_state)
+        enumerating.nodes = 0
+        enumerating.getValue(checked, 0)
+
+        self.assertEqual(1 + 3, sampling.nodes)
+        self.assertEqual(1 + 46, enumerating.nodes)
+
+    def test_plays_headless_game(self):
+        game = PokerGameState(headless=True, seed=5110,
+                              playing_styles=[ComputerPlayingStyle.EXPECTIMINIMAX, ComputerPlayingStyle.SAFE])
+        agent = game.players[0]
+
+        game.play(num_hands=3)
+
+        self.assertIsInstance(agent, Expectiminimax)
+        self.assertEqual(3, game.table.hands_played)
+        self.assertIsNotNone(agent.last_decision)
+
+    def test_plays_with_style_opponent_model(self):
+        game = PokerGameState(headless=True, seed=5110,
+                              playing_styles=[ComputerPlayingStyle.SAFE, ComputerPlayingStyle.SAFE])
+        agent = Expectiminimax('Agent', game, depth=2, opponent_model=style_opponent_model(ComputerPlayingStyle.SAFE),
+                               seed=5110)
+        agent.chips = game.players[0].chips
+        game.players[0] = agent
+
+        game.play(num_hands=3)
+
+        self.assertEqual(3, game.table.hands_played)
+        self.assertIsNotNone(agent.last_decision)
@@ -0,0 +1,193 @@
+import random
+from itertools import combinations
+
+import numpy as np
+
+from src.poker.card import Card
+from src.poker.deck import Deck
+from src.poker.players.player import Player
+from src.poker.utils import card_utils
+from src.poker.utils import hand_evaluator
+from src.poker.utils import hand_ranking_utils
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+class MockConcretePlayerClass(Player):
+    def choose_next_move(self, table_raise_amount, num_times_table_raised, table_last_bet):
+        pass
+
+
+def _cards(*codes):
+    """Builds cards from codes such as 'AS' or '10H'."""
+    return [Card({'J': 11, 'Q': 12, 'K': 13, 'A': 14}.get(code[:-1]) or int(code[:-1]), code[-1]) for code in codes]
+
+
+class TestHandEvaluator(PokerTestCase):
+
+    def test_evaluate_matches_score_hand(self):
+        rng = random.Random(5100)
+        deck = Deck()
+        for _ in range(2000):
+            cards = rng.sample(deck.cards, 7)
+            expected = max(hand_ranking_utils.score_hand(combo) for combo in combinations(cards, 5))
+            self.assertEqual(expected, hand_evaluator.evaluate(cards))
+
+    def test_evaluate_five_and_six_cards(self):
+        rng = random.Random(5101)
+        deck = Deck()
+        for n in (5, 6):
+            for _ in range(500):
+                cards = rng.sample(deck.cards, n)
+                expected = max(hand_ranking_utils.score_hand(combo) for combo in combinations(cards, 5))
+                self.assertEqual(expected, hand_evaluator.evaluate(cards))
+
+    def test_evaluate_categories(self):
+        self.assertEqual(0xA00000, hand_evaluator.evaluate(_cards('AD', 'KD', 'QD', 'JD', '10D', '2C', '2S')))
+        self.assertEqual(0x990000, hand_evaluator.evaluate(_cards('9C', '8C', '7C', '6C', '5C', '4C', 'AH')))
+        self.assertEqual(0x82E000, hand_evaluator.evaluate(_cards('2C', '2D', '2H', '2S', 'AH', 'KH', '3D')))
+        self.assertEqual(0x7DC000, hand_evaluator.evaluate(_cards('KC', 'KD', 'KH', 'QS', 'QH', 'QD', '3D')))
+        self.assertEqual(0x5E0000, hand_evaluator.evaluate(_cards('AC', 'KD', 'QH', 'JS', '10H', '9D', '9C')))
+        self.assertEqual(0x3E9A00, hand_evaluator.evaluate(_cards('AC', 'AD', '9H', '9S', '5H', '5D', '10C')))
+
+    def test_score_accessors(self):
+        score = hand_evaluator.make_score(hand_evaluator.TWO_PAIR, [11, 8, 2])
+
+        self.assertEqual(0x3B8200, score)
+        self.assertEqual(hand_evaluator.TWO_PAIR, hand_evaluator.score_category(score))
+        self.assertEqual([11, 8, 2, 0, 0], hand_evaluator.score_ranks(score))
+        self.assertEqual(8, hand_evaluator.score_rank(score, 1))
+        self.assertEqual(0x3B8, hand_evaluator.score_prefix(score, 2))
+        self.assertEqual([2, 0, 0], hand_evaluator.score_kickers(score))
+        self.assertLess(score, hand_evaluator.make_score(hand_evaluator.TWO_PAIR, [11, 8, 3]))
+        self.assertLess(hand_evaluator.make_score(hand_evaluator.HIGH_CARD, [14, 13, 12, 11, 9]),
+                        hand_evaluator.make_score(hand_evaluator.ONE_PAIR, [2, 5, 4, 3]))
+
+    def test_wheel_is_not_a_straight(self):
+        # Matches score_straight, which only counts an Ace high
+        score = hand_evaluator.evaluate(_cards('AC', '2D', '3H', '4S', '5H', '9D', 'JC'))
+        self.assertEqual(hand_evaluator.HIGH_CARD, hand_evaluator.score_category(score))
+
+    def test_best_hand_cards_match_combinations(self):
+        rng = random.Random(5102)
+        deck = Deck()
+        for _ in range(500):
+            cards = rng.sample(deck.cards, 9)
+            player_a = MockConcretePlayerClass('A')
+            player_b = MockConcretePlayerClass('B')
+            player_a.hand = player_b.hand = cards[:2]
+            hand_ranking_utils.assign_best_hand(player_a, cards[2:7])
+            hand_ranking_utils.assign_best_hand_by_combinations(player_b, cards[2:7])
+            self.assertEqual(player_b.best_hand_score, player_a.best_hand_score)
+            self.assertListEqual(player_b.best_hand_cards, player_a.best_hand_cards)
+
+
+class TestDetermineShowdownWinner(PokerTestCase):
+
+    def test_lookup_tables_match_combinations(self):
+        rng = random.Random(5103)
+        deck = Deck()
+        for _ in range(300):
+            cards = rng.sample(deck.cards, 11)
+            community = cards[:5]
+            results = []
+            for use_lookup_tables in (True, False):
+                players = [MockConcretePlayerClass(name) for name in 'ABC']
+                for i, player in enumerate(players):
+                    player.hand = cards[5 + 2 * i:7 + 2 * i]
+                winners = hand_ranking_utils.determine_showdown_winner(players, community, use_lookup_tables)
+                results.append(([winner.name for winner in winners],
+                                 [(p.best_hand_score, p.best_hand_cards, p.best_hand_rank, p.rank_subtype,
+                                   p.kicker_card) for p in players]))
+            self.assertEqual(results[1], results[0])
+
+
+class TestShowdownCache(PokerTestCase):
+
+    def setUp(self):
+        super().setUp()
+        hand_ranking_utils.set_showdown_cache_size(64)
+
+    def tearDown(self):
+        hand_ranking_utils.set_showdown_cache_size(hand_ranking_utils.SHOWDOWN_CACHE_SIZE)
+        super().tearDown()
+
+    def test_cached_hands_match_evaluator(self):
+        rng = random.Random(5104)
+        deck = Deck()
+        hands = [rng.sample(deck.cards, 7) for _ in range(40)]
+        for _ in range(5):
+            for cards in hands:
+                # The cards chosen between cards of the same rank depend on their order
+                rng.shuffle(cards)
+                self.assertEqual(hand_evaluator.best_hand(cards), hand_ranking_utils.best_hand(cards))
+
+        cache = hand_ranking_utils.showdown_cache
+        self.assertEqual(40, cache.misses)
+        self.assertEqual(160, cache.hits)
+        self.assertAlmostEqual(0.8, cache.hit_rate)
+
+    def test_order_of_cards_of_same_rank(self):
+        cards = _cards('KC', 'KD', 'KH', 'QS', 'QH', 'QD', '3D')
+        self.assertEqual(hand_evaluator.best_hand(cards), hand_ranking_utils.best_hand(cards))
+        cards.reverse()
+        self.assertEqual(hand_evaluator.best_hand(cards), hand_ranking_utils.best_hand(cards))
+        self.assertEqual(1, hand_ranking_utils.showdown_cache.hits)
+
+    def test_least_recently_used_hands_are_evicted(self):
+        rng = random.Random(5105)
+        deck = Deck()
+        hands = [rng.sample(deck.cards, 7) for _ in range(65)]
+        for cards in hands:
+            hand_ranking_utils.best_hand(cards)
+        hand_ranking_utils.best_hand(hands[0])
+
+        self.assertEqual(64, len(hand_ranking_utils.showdown_cache))
+        self.assertEqual(0, hand_ranking_utils.showdown_cache.hits)
+
+    def test_showdown_matches_uncached_showdown(self):
+        results = []
+        # Without a cache, then scoring the hands for the first time, then looking them up
+        for maxsize in (0, 64, None):
+            if maxsize is not None:
+                hand_ranking_utils.set_showdown_cache_size(maxsize)
+            players = [MockConcretePlayerClass(name) for name in 'AB']
+            players[0].hand, players[1].hand = _cards('KS', 'QC'), _cards('KH', 'JD')
+            community = _cards('KC', '2D', '10C', '5S', '9H')
+            winners = hand_ranking_utils.determine_showdown_winner(players, community)
+            results.append(([winner.name for winner in winners],
+                            [(p.best_hand_score, p.best_hand_cards, p.best_hand_rank, p.rank_subtype, p.kicker_card)
+                             for p in players]))
+
+        self.assertEqual(2, hand_ranking_utils.showdown_cache.hits)
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0], results[2])
+        self.assertEqual(['A'], results[0][0])
+        self.assertEqual(12, results[0][1][0][4].rank_value)
+
+
+class TestDetermineShowdownWinnerBatch(PokerTestCase):
+
+    def test_matches_determine_showdown_winner(self):
+        rng = np.random.default_rng(5107)
+        deals = np.argsort(rng.random((300, 52)), axis=1)[:, :11]
+        boards, hole_cards = deals[:, :5], deals[:, 5:].reshape(300, 3, 2)
+        winners, scores = hand_ranking_utils.determine_showdown_winner_batch(hole_cards, boards)
+
+        self.assertEqual((300, 3), winners.shape)
+        for i in range(300):
+            players = [MockConcretePlayerClass(name) for name in range(3)]
+            for player, hand in zip(players, hole_cards[i].tolist()):
+                player.hand = card_utils.ints_to_cards(hand)
+            community = card_utils.ints_to_cards(boards[i].tolist())
+            expected = hand_ranking_utils.determine_showdown_winner(players, community)
+            self.assertEqual([player.name for player in expected], np.flatnonzero(winners[i]).tolist())
+            self.assertEqual([player.best_hand_score for player in players], scores[i].tolist())
+
+    def test_same_hands_on_every_board(self):
+        hole_cards = card_utils.cards_to_ints(_cards('AS', 'AH', 'KS', 'KH'))
+        boards = [card_utils.cards_to_ints(_cards('2C', '7D', '9H', 'JC', '3S')),
+                  card_utils.cards_to_ints(_cards('KC', '7D', '9H', 'JC', '3S')),
+                  card_utils.cards_to_ints(_cards('10C', 'QD', 'JH', 'KC', 'AD'))]
+        winners, _ = hand_ranking_utils.determine_showdown_winner_batch(np.reshape(hole_cards, (2, 2)), boards)
+
+        self.assertEqual([[True, False], [False, True], [True, True]], winners.tolist())
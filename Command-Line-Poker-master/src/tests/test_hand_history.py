@@ -0,0 +1,73 @@
+import os
+import random
+import tempfile
+
+from src.poker.enums.betting_move import BettingMove
+from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.enums.phase import Phase
+from src.poker.hand_history import (Action, Award, HandHistoryWriter, HandRecord, HandRecorder, decode_hand,
+                                    encode_hand, read_hand_history)
+from src.poker.pokergamestate import PokerGameState
+from src.poker.pot import Pot
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+def make_hand(hand_number=0):
+    return HandRecord(hand_number=hand_number, dealer=1, big_blind=200, names=('Homer', 'Agent'),
+                      styles=(ComputerPlayingStyle.RISKY, None), stacks=(5000, 10 ** 12),
+                      hole_cards=((0, 13), (51, 38)), board=(1, 2, 3, 40, 50),
+                      actions=(Action(1, Phase.PREFLOP, BettingMove.BET, 100, 'small'),
+                               Action(0, Phase.PREFLOP, BettingMove.ALL_IN, 200, 'big'),
+                               Action(1, Phase.PREFLOP, BettingMove.CALLED, 200)),
+                      pots=(Pot(400, 0b11),), awards=(Award(0, 400, 0b10),))
+
+
+class TestHandHistory(PokerTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'hands.pkhh')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_encoding_round_trips(self):
+        hand = make_hand()
+        self.assertEqual(hand, decode_hand(encode_hand(hand)))
+
+    def test_writer_appends_to_existing_log(self):
+        with HandHistoryWriter(self.path) as writer:
+            writer.write(make_hand(0))
+        with HandHistoryWriter(self.path) as writer:
+            writer.write(make_hand(1))
+
+        self.assertEqual([make_hand(0), make_hand(1)], list(read_hand_history(self.path)))
+
+    def test_truncated_log(self):
+        with HandHistoryWriter(self.path) as writer:
+            writer.write(make_hand())
+        with open(self.path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.path) - 1)
+
+        with self.assertRaises(ValueError):
+            list(read_hand_history(self.path))
+
+    def test_recorded_game(self):
+        random.seed(2121)
+        game = PokerGameState(headless=True)
+        for player in game.players:
+            player.chips = 10 ** 9
+        with HandHistoryWriter(self.path) as writer:
+            game.events.subscribe(HandRecorder(writer))
+            game.play(num_hands=20)
+
+        hands = list(read_hand_history(self.path))
+        self.assertEqual(list(range(20)), [hand.hand_number for hand in hands])
+        for hand in hands:
+            self.assertEqual(['small', 'big'], [action.blind for action in hand.actions[:2]])
+            self.assertEqual(sum(pot.amount for pot in hand.pots), sum(award.amount for award in hand.awards))
+            cards = [card for hole_cards in hand.hole_cards for card in hole_cards] + list(hand.board)
+            self.assertEqual(len(cards), len(set(cards)))
+        # Stacks carry over from one hand to the next
+        for hand, next_hand in zip(hands, hands[1:]):
+            self.assertEqual(sum(hand.stacks), sum(next_hand.stacks))
@@ -0,0 +1,185 @@
+import random
+
+from src.poker.card import Card
+from src.poker.enums.betting_move import BettingMove
+from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.enums.phase import Phase
+from src.poker.hand_state import HandState
+from src.poker.pokergamestate import PokerGameState
+from src.poker.utils import card_utils
+from src.poker.utils import zobrist
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+def ints(*cards):
+    return tuple(card_utils.card_to_int(Card(rank, suit)) for rank, suit in cards)
+
+
+ACES = ints((14, 'S'), (14, 'H'))
+KINGS = ints((13, 'S'), (13, 'H'))
+QUEENS = ints((12, 'S'), (12, 'H'))
+RUNOUT = ints((2, 'C'), (7, 'D'), (9, 'C'), (4, 'D'), (3, 'H'))
+
+
+class TestHandState(PokerTestCase):
+
+    def test_new_hand_posts_blinds(self):
+        state = HandState.new_hand((1000, 1000, 1000), big_blind=100, dealer=0)
+
+        self.assertEqual((1000, 950, 900), state.stacks)
+        self.assertEqual((0, 50, 100), state.bets)
+        self.assertEqual(100, state.last_bet)
+        self.assertEqual(0, state.to_act)
+        self.assertIs(Phase.PREFLOP, state.phase)
+
+    def test_heads_up_dealer_posts_small_blind_and_acts_first(self):
+        state = HandState.new_hand((1000, 1000), big_blind=100, dealer=1)
+
+        self.assertEqual((100, 50), state.bets)
+        self.assertEqual(1, state.to_act)
+
+    def test_legal_actions(self):
+        state = HandState.new_hand((1000, 1000, 1000), big_blind=100)
+        self.assertListEqual([BettingMove.CALLED, BettingMove.RAISED, BettingMove.FOLDED], state.legal_actions())
+
+        short_stacked = HandState.new_hand((150, 1000, 1000), big_blind=100)
+        self.assertListEqual([BettingMove.CALLED, BettingMove.ALL_IN, BettingMove.FOLDED],
+                             short_stacked.legal_actions())
+
+        for _ in range(4):
+            state = state.apply(BettingMove.RAISED)
+        self.assertListEqual([BettingMove.CALLED, BettingMove.FOLDED], state.legal_actions())
+
+    def test_apply_does_not_change_state(self):
+        state = HandState.new_hand((1000, 1000, 1000), big_blind=100)
+
+        raised = state.apply(BettingMove.RAISED)
+
+        self.assertEqual((1000, 950, 900), state.stacks)
+        self.assertEqual(0, state.num_raises)
+        self.assertEqual((800, 950, 900), raised.stacks)
+        self.assertEqual(1, raised.num_raises)
+        self.assertEqual(1, raised.to_act)
+
+    def test_round_of_betting_ends_when_bets_are_locked_in(self):
+        state = HandState.new_hand((1000, 1000, 1000), big_blind=100, runout=RUNOUT)
+
+        for move in [BettingMove.CALLED, BettingMove.CALLED, BettingMove.CHECKED]:
+            state = state.apply(move)
+
+        self.assertIs(Phase.FLOP, state.phase)
+        self.assertEqual(RUNOUT[:3], state.board)
+        self.assertEqual((0, 0, 0), state.bets)
+        self.assertEqual((100, 100, 100), state.committed)
+        self.assertEqual(0, state.last_bet)
+        self.assertEqual(1, state.to_act)
+        self.assertListEqual([BettingMove.CHECKED, BettingMove.BET, BettingMove.FOLDED], state.legal_actions())
+
+    def test_chance_node_until_cards_are_dealt(self):
+        state = HandState.new_hand((1000, 1000), big_blind=100, dealer=0)
+
+        state = state.apply(BettingMove.CALLED).apply(BettingMove.CHECKED)
+
+        self.assertTrue(state.is_chance())
+        self.assertEqual(3, state.pending)
+        self.assertListEqual([], state.legal_actions())
+        dealt = state.deal(RUNOUT[:3])
+        self.assertFalse(dealt.is_chance())
+        self.assertIs(Phase.FLOP, dealt.phase)
+        self.assertEqual(0, dealt.to_act)
+
+    def test_fold_ends_hand(self):
+        state = HandState.new_hand((1000, 1000, 1000), big_blind=100)
+
+        state = state.apply(BettingMove.FOLDED).apply(BettingMove.FOLDED)
+
+        self.assertTrue(state.is_terminal())
+        self.assertEqual((0, -50, 50), state.result())
+
+    def test_showdown_result(self):
+        state = HandState.new_hand((1000, 1000), big_blind=100, holes=(KINGS, ACES), runout=RUNOUT)
+
+        while not state.is_terminal():
+            state = state.apply(state.legal_actions()[0])
+
+        self.assertIs(Phase.RIVER, state.phase)
+        self.assertEqual(RUNOUT, state.board)
+        self.assertEqual((-100, 100), state.result())
+        self.assertEqual(100, state.get_result(1))
+
+    def test_all_in_runs_out_board_and_splits_side_pots(self):
+        state = HandState.new_hand((1000, 1000, 300), big_blind=100, dealer=2, holes=(KINGS, QUEENS, ACES),
+                                   runout=RUNOUT)
+
+        state = state.apply(BettingMove.ALL_IN).apply(BettingMove.RAISED).apply(BettingMove.CALLED)
+        while not state.is_terminal():
+            state = state.apply(BettingMove.CHECKED)
+
+        self.assertEqual(RUNOUT, state.board)
+        # Aces win the main pot, kings the side pot
+        self.assertEqual((-200, -400, 600), state.result())
+
+    def test_determinize_fills_unknown_cards(self):
+        state = HandState.new_hand((1000, 1000), big_blind=100, holes=(ACES, None))
+
+        determinized = state.determinize(random.Random(5100))
+
+        self.assertIsNone(state.holes[1])
+        self.assertEqual(ACES, determinized.holes[0])
+        self.assertEqual(5, len(determinized.runout))
+        cards = set(determinized.holes[0] + determinized.holes[1] + determinized.runout)
+        self.assertEqual(9, len(cards))
+
+    def test_snapshot_of_game_matches_engine(self):
+        random.seed(5101)
+        game = PokerGameState(headless=True, playing_styles=[ComputerPlayingStyle.SAFE] * 3)
+        snapshots = []
+
+        def make_choose_next_move(player):
+            def choose_next_move(table_raise_amount, num_times_table_raised, table_last_bet):
+                state = game.to_hand_state(viewer=player)
+                snapshots.append((state, table_last_bet))
+                return state.legal_actions()[0]
+            return choose_next_move
+
+        for player in game.players:
+            player.choose_next_move = make_choose_next_move(player)
+        game.play(num_hands=1)
+
+        self.assertTrue(snapshots)
+        for state, table_last_bet in snapshots:
+            self.assertEqual(1, sum(hole is not None for hole in state.holes))
+            self.assertEqual(table_last_bet, state.last_bet)
+        self.assertEqual(game.table.big_blind * 3 // 2, snapshots[0][0].pot)
+
+
+class TestHandStateZobristHash(PokerTestCase):
+
+    def test_incremental_hash_matches_full_hash(self):
+        rng = random.Random(5111)
+        for _ in range(200):
+            num_players = rng.randrange(2, 7)
+            dealt = rng.sample(range(52), 2 * num_players + 5)
+            state = HandState.new_hand([rng.randrange(50, 3000) for _ in range(num_players)], big_blind=100,
+                                       dealer=rng.randrange(num_players),
+                                       holes=[tuple(dealt[2 * i:2 * i + 2]) for i in range(num_players)])
+            runout = dealt[2 * num_players:]
+            while not state.is_terminal():
+                if state.is_chance():
+                    state = state.deal(runout[len(state.board):len(state.board) + state.pending])
+                else:
+                    state = state.apply(rng.choice(state.legal_actions()))
+                self.assertEqual(zobrist.hash_state(state), state.key)
+
+    def test_order_of_dealt_cards_does_not_change_hash(self):
+        state = HandState.new_hand((1000, 1000), big_blind=100).apply(BettingMove.CALLED).apply(BettingMove.CHECKED)
+
+        self.assertEqual(state.deal(RUNOUT[:3]).key, state.deal(reversed(RUNOUT[:3])).key)
+        self.assertNotEqual(state.deal(RUNOUT[:3]).key, state.deal(RUNOUT[2:5]).key)
+
+    def test_hidden_cards_do_not_change_hash(self):
+        hidden = HandState.new_hand((1000, 1000), big_blind=100, holes=(ACES, None))
+        known = HandState.new_hand((1000, 1000), big_blind=100, holes=(ACES, KINGS), runout=RUNOUT)
+
+        self.assertEqual(hidden.key, known.key)
+        self.assertNotEqual(hidden.key, hidden.apply(BettingMove.CALLED).key)
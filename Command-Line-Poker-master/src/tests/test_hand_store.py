@@ -0,0 +1,104 @@
+import math
+import os
+import random
+import tempfile
+
+import numpy as np
+
+from src.poker.enums.betting_move import BettingMove
+from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.enums.phase import Phase
+from src.poker.hand_history import (MOVES, Action, Award, HandHistoryWriter, HandRecord, HandRecorder,
+                                    read_hand_history)
+from src.poker.hand_store import NO_MOVE, HandStore, HandStoreWriter, convert_hand_history
+from src.poker.pokergamestate import PokerGameState
+from src.poker.pot import Pot
+from src.tests.test_utils.test_utils import PokerTestCase
+
+AGGRESSIVE_MOVES = (BettingMove.BET, BettingMove.RAISED, BettingMove.ALL_IN)
+
+
+def facing(actions, k):
+    """Returns the last aggressive move before actions[k] in its round, as a reference."""
+    for action in reversed(actions[:k]):
+        if action.phase is not actions[k].phase:
+            break
+        if action.move in AGGRESSIVE_MOVES:
+            return action.move
+    return None
+
+
+class TestHandStore(PokerTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.directory.name, 'hands.pkhh')
+        self.store_path = os.path.join(self.directory.name, 'hands')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record_game(self, num_hands, chunk_size):
+        random.seed(2222)
+        styles = [ComputerPlayingStyle.SAFE, ComputerPlayingStyle.RISKY, ComputerPlayingStyle.RANDOM] * 2
+        game = PokerGameState(headless=True, playing_styles=styles)
+        for player in game.players:
+            player.chips = 10 ** 9
+        with HandHistoryWriter(self.log_path) as log_writer, HandStoreWriter(self.store_path, chunk_size) as writer:
+            game.events.subscribe(HandRecorder(log_writer))
+            game.events.subscribe(HandRecorder(writer))
+            game.play(num_hands=num_hands)
+
+    def test_store_matches_hand_history(self):
+        self.record_game(num_hands=60, chunk_size=100)
+        hands = list(read_hand_history(self.log_path))
+        store = HandStore(self.store_path)
+
+        self.assertGreater(len(list(store.chunks('actions'))), 1)
+        self.assertEqual(60, store.num_hands)
+        self.assertEqual(sum(len(hand.actions) for hand in hands), store.num_actions)
+        for phase in Phase:
+            for style in (ComputerPlayingStyle.SAFE, ComputerPlayingStyle.RISKY):
+                for move in BettingMove:
+                    expected = sum(1 for hand in hands for k, action in enumerate(hand.actions)
+                                   if action.phase is phase and action.move is move
+                                   and hand.styles[action.seat] is style and facing(hand.actions, k) is move.RAISED)
+                    self.assertEqual(expected, store.count_actions(phase, move, style, facing=BettingMove.RAISED))
+
+    def test_columns_are_memory_mapped(self):
+        self.record_game(num_hands=5, chunk_size=1000)
+        chunk = next(HandStore(self.store_path).chunks('actions'))
+
+        self.assertIsInstance(chunk['move'], np.memmap)
+        self.assertEqual(np.uint64, chunk['bet'].dtype)
+
+    def test_convert_hand_history(self):
+        self.record_game(num_hands=30, chunk_size=1000)
+        converted_path = os.path.join(self.directory.name, 'converted')
+        convert_hand_history(self.log_path, converted_path)
+
+        for table in ('hands', 'actions'):
+            live = next(HandStore(self.store_path).chunks(table))
+            converted = next(HandStore(converted_path).chunks(table))
+            for column in live:
+                np.testing.assert_array_equal(live[column], converted[column])
+
+    def test_writer_appends_to_existing_store(self):
+        hand = HandRecord(hand_number=0, dealer=0, big_blind=20, names=('Homer', 'Bart'),
+                          styles=(ComputerPlayingStyle.RISKY, ComputerPlayingStyle.SAFE), stacks=(1000, 1000),
+                          hole_cards=((0, 1), (2, 3)), board=(), pots=(Pot(40, 0b01),), awards=(Award(None, 40, 0b01),),
+                          actions=(Action(0, Phase.PREFLOP, BettingMove.BET, 10, 'small'),
+                                   Action(1, Phase.PREFLOP, BettingMove.BET, 20, 'big'),
+                                   Action(0, Phase.PREFLOP, BettingMove.RAISED, 40),
+                                   Action(1, Phase.PREFLOP, BettingMove.FOLDED, 20)))
+        for _ in range(2):
+            with HandStoreWriter(self.store_path) as writer:
+                writer.write(hand)
+        store = HandStore(self.store_path)
+
+        self.assertEqual([0, 1], [int(chunk['hand'][0]) for chunk in store.chunks('hands')])
+        self.assertEqual([NO_MOVE, MOVES.index(BettingMove.BET), MOVES.index(BettingMove.BET),
+                          MOVES.index(BettingMove.RAISED)], list(store.chunks('actions'))[1]['facing'].tolist())
+        self.assertEqual(0.5, store.move_frequency(BettingMove.FOLDED, style=ComputerPlayingStyle.SAFE))
+        self.assertEqual(1.0, store.move_frequency(BettingMove.FOLDED, facing=BettingMove.RAISED))
+        self.assertTrue(math.isnan(store.move_frequency(BettingMove.FOLDED, phase=Phase.RIVER)))
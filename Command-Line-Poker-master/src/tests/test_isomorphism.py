@@ -0,0 +1,90 @@
+import random
+from itertools import combinations
+
+from src.poker.card import Card
+from src.poker.utils import card_utils, hand_evaluator
+from src.poker.utils.equity import enumerate_equity
+from src.poker.utils.isomorphism import HandIndexer, canonical_index, canonicalize, get_indexer
+from src.poker.utils.preflop_equity import starting_hand_index
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+def relabel_suits(cards, permutation):
+    return [permutation[card // card_utils.SUIT_SHIFT] * card_utils.SUIT_SHIFT + card % card_utils.SUIT_SHIFT
+            for card in cards]
+
+
+class TestHandIndexer(PokerTestCase):
+
+    def test_number_of_classes(self):
+        self.assertEqual(169, get_indexer((2,)).size)
+        self.assertEqual(1286792, get_indexer((2, 3)).size)
+        self.assertEqual(13960050, get_indexer((2, 4)).size)
+        self.assertEqual(123156254, get_indexer((2, 5)).size)
+        # Turn and river cards dealt as their own rounds
+        self.assertEqual(55190538, get_indexer((2, 3, 1)).size)
+
+    def test_preflop_classes_match_starting_hands(self):
+        indexer = HandIndexer((2,))
+        classes = {}
+        for hole_cards in combinations(range(52), 2):
+            classes.setdefault(indexer.index((hole_cards,)), set()).add(starting_hand_index(hole_cards))
+
+        self.assertEqual(set(range(169)), set(classes))
+        self.assertTrue(all(len(starting_hands) == 1 for starting_hands in classes.values()))
+
+    def test_unindex_round_trips(self):
+        indexer = get_indexer((2, 3))
+        for index in list(range(0, indexer.size, 997)) + [indexer.size - 1]:
+            self.assertEqual(index, indexer.index(indexer.unindex(index)))
+
+    def test_index_ignores_suit_labels_and_card_order(self):
+        indexer = get_indexer((2, 3, 1))
+        rng = random.Random(0)
+        for _ in range(500):
+            cards = rng.sample(range(52), 6)
+            permuted = relabel_suits(cards, rng.sample(range(4), 4))
+            expected = indexer.index((cards[:2], cards[2:5], cards[5:]))
+
+            self.assertEqual(expected, indexer.index((permuted[1::-1], permuted[4:1:-1], permuted[5:])))
+
+    def test_rounds_are_distinguished(self):
+        indexer = get_indexer((2, 3, 1))
+        hole_cards, flop = [12, 11], [10, 9, 0]
+
+        self.assertNotEqual(indexer.index((hole_cards, flop, [13])), indexer.index((hole_cards, [13, 9, 0], [10])))
+
+    def test_invalid_hands(self):
+        indexer = get_indexer((2, 3))
+        with self.assertRaises(ValueError):
+            indexer.index(([0, 1], [2, 3]))
+        with self.assertRaises(ValueError):
+            indexer.index(([0, 1], [1, 2, 3]))
+        with self.assertRaises(ValueError):
+            indexer.unindex(indexer.size)
+
+
+class TestCanonicalize(PokerTestCase):
+
+    def test_canonical_hand_is_isomorphic(self):
+        hole_cards = card_utils.cards_to_ints([Card(14, 'S'), Card(13, 'S')])
+        board = card_utils.cards_to_ints([Card(12, 'S'), Card(7, 'H'), Card(2, 'D')])
+        canonical_hole_cards, canonical_board = canonicalize(hole_cards, board)
+
+        self.assertEqual(canonical_index(hole_cards, board), canonical_index(canonical_hole_cards, canonical_board))
+        self.assertEqual(hand_evaluator.evaluate(hole_cards + board),
+                         hand_evaluator.evaluate(list(canonical_hole_cards + canonical_board)))
+        self.assertEqual((canonical_hole_cards, canonical_board),
+                         canonicalize(relabel_suits(hole_cards, [1, 0, 3, 2]), relabel_suits(board, [1, 0, 3, 2])))
+
+    def test_preflop(self):
+        self.assertEqual(canonicalize([0, 13]), canonicalize([26, 39]))
+        self.assertEqual((), canonicalize([0, 13])[1])
+
+    def test_equity_is_shared_between_isomorphic_spots(self):
+        hole_cards = card_utils.cards_to_ints([Card(9, 'H'), Card(8, 'H')])
+        board = card_utils.cards_to_ints([Card(10, 'H'), Card(2, 'C'), Card(2, 'S'), Card(13, 'H')])
+        permutation = [3, 2, 0, 1]
+
+        self.assertEqual(enumerate_equity(hole_cards, board),
+                         enumerate_equity(relabel_suits(hole_cards, permutation), relabel_suits(board, permutation)))
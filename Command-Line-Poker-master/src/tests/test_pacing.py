@@ -0,0 +1,82 @@
+from unittest.mock import patch
+
+from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.enums.pacing_mode import PacingMode
+from src.poker.pacing import Pacer
+from src.poker.pokergamestate import PokerGameState
+from src.poker.prompts import text_prompt
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+class TestPacer(PokerTestCase):
+
+    def test_delay(self):
+        self.assertEqual(2.0, Pacer(PacingMode.REALTIME).delay(2.0))
+        self.assertEqual(0.5, Pacer(PacingMode.ACCELERATED, speed=4.0).delay(2.0))
+        self.assertEqual(0.0, Pacer(PacingMode.ZERO).delay(2.0))
+
+    def test_waits_for_input(self):
+        pacer = Pacer(PacingMode.ZERO)
+        self.assertFalse(pacer.waits_for_input)
+        pacer.attended = True
+        self.assertTrue(pacer.waits_for_input)
+        self.assertTrue(Pacer(PacingMode.REALTIME).waits_for_input)
+
+    def test_renders_every_nth_hand(self):
+        pacer = Pacer(PacingMode.ZERO, render_every=3)
+        self.assertEqual([0, 3, 6], [hand for hand in range(8) if pacer.renders_hand(hand)])
+
+    def test_shows_attended_hands(self):
+        pacer = Pacer(PacingMode.REALTIME, render_every=3)
+        self.assertFalse(pacer.shows_hand(1))
+        pacer.attended = True
+        self.assertTrue(pacer.shows_hand(1))
+
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            Pacer(PacingMode.ACCELERATED, speed=0)
+        with self.assertRaises(ValueError):
+            Pacer(render_every=0)
+
+
+class TestTextPromptPacing(PokerTestCase):
+
+    def tearDown(self):
+        text_prompt.set_pacer(Pacer())
+
+    def test_pauses_are_scaled(self):
+        text_prompt.set_pacer(Pacer(PacingMode.ACCELERATED, speed=10.0))
+        with patch.object(text_prompt, 'sleep') as sleep:
+            text_prompt.pace(3)
+        sleep.assert_called_once_with(0.3)
+
+    def test_zero_pacing_skips_pauses_and_key_presses(self):
+        text_prompt.set_pacer(Pacer(PacingMode.ZERO))
+        with patch.object(text_prompt, 'sleep') as sleep, patch('builtins.input') as key_press:
+            text_prompt.pace(3)
+            text_prompt.wait_for_key('Press any key to continue....')
+        sleep.assert_not_called()
+        key_press.assert_not_called()
+
+
+class TestGamePacing(PokerTestCase):
+
+    def tearDown(self):
+        text_prompt.set_pacer(Pacer())
+
+    @patch('src.poker.prompts.text_prompt.sleep')
+    @patch('src.poker.prompts.text_prompt.wait_for_key')
+    @patch('src.poker.prompts.text_prompt.show_table')
+    @patch('src.poker.prompts.text_prompt.clear_screen')
+    @patch('src.poker.utils.io_utils.input_no_return', return_value='')
+    def test_unrendered_hands_do_not_stop(self, continue_prompt, *_):
+        game = PokerGameState(playing_styles=[ComputerPlayingStyle.SAFE, ComputerPlayingStyle.RISKY], seed=5119,
+                              pacer=Pacer(PacingMode.REALTIME, render_every=4))
+        for player in game.players:
+            player.chips = 10 ** 9
+
+        game.play(num_hands=6)
+
+        # Only hands 0 and 4 are shown, and the game asks to continue after each
+        self.assertEqual(2, continue_prompt.call_count)
+        self.assertEqual(6, game.table.hands_played)
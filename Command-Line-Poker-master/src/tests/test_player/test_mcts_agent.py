@@ -0,0 +1,114 @@
+import random
+
+from src.poker.card import Card
+from src.poker.enums.betting_move import BettingMove
+from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.enums.phase import Phase
+from src.poker.hand_state import HandState
+from src.poker.players.mcts_agent import MCTSAgent, MCTSTree, parallel_search
+from src.poker.pokergamestate import PokerGameState
+from src.poker.utils import card_utils
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+def ints(*cards):
+    return tuple(card_utils.card_to_int(Card(rank, suit)) for rank, suit in cards)
+
+
+class TestMCTSTree(PokerTestCase):
+
+    def test_search_runs_iteration_budget(self):
+        state = HandState.new_hand((2000, 2000), big_blind=100, holes=(ints((14, 'S'), (14, 'H')), None))
+        tree = MCTSTree(state, rng=random.Random(5102))
+
+        stats = tree.search(iterations=500)
+
+        self.assertEqual(500, stats.iterations)
+        self.assertEqual(500, tree.root.visits)
+        self.assertEqual(500, sum(child.visits for child in tree.root.children))
+        self.assertGreater(stats.iterations_per_second, 0)
+        self.assertIn(tree.best_move(), state.legal_actions())
+
+    def test_search_runs_time_budget(self):
+        state = HandState.new_hand((2000, 2000), big_blind=100, holes=(ints((14, 'S'), (14, 'H')), None))
+        tree = MCTSTree(state, rng=random.Random(5103))
+
+        stats = tree.search(time_limit=0.05)
+
+        self.assertGreater(stats.iterations, 0)
+        self.assertLess(stats.seconds, 0.5)
+
+    def test_search_needs_budget(self):
+        state = HandState.new_hand((2000, 2000), big_blind=100, holes=(ints((14, 'S'), (14, 'H')), None))
+
+        with self.assertRaises(ValueError):
+            MCTSTree(state).search()
+
+    def test_does_not_fold_the_nuts(self):
+        # Royal flush on the river, facing a bet
+        board = ints((10, 'S'), (11, 'S'), (12, 'S'), (2, 'D'), (5, 'C'))
+        state = HandState(stacks=(1000, 800), bets=(0, 200), committed=(500, 500), folded=0, all_in=0, locked=2,
+                          to_act=0, phase=Phase.RIVER, last_bet=200, num_raises=1,
+                          big_blind=100, dealer=1, board=board, holes=(ints((14, 'S'), (13, 'S')), None))
+        tree = MCTSTree(state, rng=random.Random(5104))
+
+        tree.search(iterations=2000)
+
+        self.assertIsNot(BettingMove.FOLDED, tree.best_move())
+
+
+class TestParallelSearch(PokerTestCase):
+
+    def test_merges_root_statistics_of_workers(self):
+        state = HandState.new_hand((2000, 2000), big_blind=100, holes=(ints((14, 'S'), (14, 'H')), None))
+
+        move, stats = parallel_search(state, num_workers=2, iterations=401, rng=random.Random(5106))
+
+        self.assertEqual(401, stats.iterations)
+        self.assertIn(move, state.legal_actions())
+
+    def test_agent_reuses_worker_pool(self):
+        random.seed(5107)
+        game = PokerGameState(headless=True, playing_styles=[ComputerPlayingStyle.SAFE, ComputerPlayingStyle.SAFE])
+        agent = MCTSAgent('Agent', game, time_limit=None, iterations=100, seed=5107, num_workers=2)
+        game.players[0] = agent
+        agent.chips = game.players[1].chips
+
+        game.play(num_hands=2)
+        executor = agent._executor
+        agent.close()
+
+        self.assertIsNotNone(executor)
+        self.assertEqual(100, agent.last_search.iterations)
+        self.assertIsNone(agent._executor)
+
+    def test_game_sets_and_shuts_down_workers(self):
+        with PokerGameState(headless=True, seed=5108, mcts_workers=2,
+                            playing_styles=[ComputerPlayingStyle.MONTE_CARLO_TREE_SEARCH,
+                                            ComputerPlayingStyle.SAFE]) as game:
+            agent = game.players[0]
+            game.play(num_hands=1)
+
+            self.assertEqual(2, agent.num_workers)
+            self.assertIsNotNone(agent._executor)
+        self.assertIsNone(agent._executor)
+
+
+class TestMCTSAgent(PokerTestCase):
+
+    def test_plays_headless_game(self):
+        random.seed(5105)
+        game = PokerGameState(headless=True, playing_styles=[ComputerPlayingStyle.MONTE_CARLO_TREE_SEARCH,
+                                                              ComputerPlayingStyle.RANDOM])
+        agent = game.players[0]
+
+        game.play(num_hands=3)
+
+        self.assertIsInstance(agent, MCTSAgent)
+        self.assertEqual(3, game.table.hands_played)
+        self.assertIsNotNone(agent.last_search)
+        self.assertEqual(PokerGameState.headless_mcts_iterations, agent.last_search.iterations)
+
+    def test_needs_budget(self):
+        with self.assertRaises(ValueError):
+            MCTSAgent('Agent', game=None, time_limit=None)
@@ -0,0 +1,95 @@
+import random
+from unittest.mock import patch
+
+from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.hand_history import HandRecorder, decode_hand
+from src.poker.pokergamestate import PokerGameState
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+class TestHeadlessPlay(PokerTestCase):
+
+    def setUp(self):
+        random.seed(5100)
+
+    def test_play_stops_after_num_hands(self):
+        game = PokerGameState(headless=True)
+        for player in game.players:
+            player.chips = 10 ** 9
+
+        game.play(num_hands=25)
+
+        self.assertEqual(25, game.table.hands_played)
+
+    def test_play_stops_on_stop_condition(self):
+        game = PokerGameState(headless=True)
+        for player in game.players:
+            player.chips = 10 ** 9
+
+        game.play(stop_condition=lambda g: g.table.hands_played == 7)
+
+        self.assertEqual(7, game.table.hands_played)
+
+    def test_play_until_one_player_left(self):
+        game = PokerGameState(headless=True)
+
+        game.play()
+
+        self.assertEqual(1, len(game.get_active_players()))
+        self.assertGreater(game.get_active_players()[0].chips, 0)
+
+    @patch('src.poker.utils.io_utils.input_no_return', side_effect=AssertionError('prompted for input'))
+    @patch('src.poker.prompts.text_prompt.sleep', side_effect=AssertionError('paused'))
+    @patch('src.poker.prompts.text_prompt.clear_screen', side_effect=AssertionError('cleared the screen'))
+    def test_headless_never_renders_or_waits(self, *_):
+        game = PokerGameState(headless=True)
+
+        game.play(num_hands=10)
+
+        self.assertTrue(all(isinstance(card, int) for card in game.table.community))
+
+
+class HandList:
+    """Collects the hands a HandRecorder writes."""
+
+    def __init__(self):
+        self.hands = []
+
+    def write_encoded(self, data):
+        self.hands.append(decode_hand(data))
+
+
+def play_recorded(game, num_hands):
+    hands = HandList()
+    game.events.subscribe(HandRecorder(hands))
+    game.play(num_hands=num_hands)
+    return hands.hands
+
+
+class TestSeededReplay(PokerTestCase):
+
+    playing_styles = [ComputerPlayingStyle.SAFE, ComputerPlayingStyle.RISKY, ComputerPlayingStyle.RANDOM] * 2 + [
+        ComputerPlayingStyle.EXPECTIMINIMAX]
+
+    def make_game(self, seed):
+        game = PokerGameState(headless=True, playing_styles=self.playing_styles, seed=seed)
+        for player in game.players:
+            player.chips = 10 ** 9
+        return game
+
+    def test_same_seed_plays_same_game(self):
+        random.seed(1)
+        first = play_recorded(self.make_game(seed=2323), num_hands=20)
+        random.seed(2)
+        second = play_recorded(self.make_game(seed=2323), num_hands=20)
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, play_recorded(self.make_game(seed=2324), num_hands=20))
+
+    def test_fast_forward_replays_recorded_hand(self):
+        hands = play_recorded(self.make_game(seed=2323), num_hands=40)
+        for hand in hands:
+            game = self.make_game(seed=2323)
+            game.fast_forward(hand)
+
+            self.assertEqual([hand], play_recorded(game, num_hands=1))
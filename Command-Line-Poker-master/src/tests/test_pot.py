@@ -0,0 +1,58 @@
+import random
+
+from src.poker.pot import Pot, build_pots, seat_pots, split_pot
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+def layered_pots(contributions, folded):
+    """Builds pots one chip level at a time, as a reference."""
+    pots = []
+    for level in range(1, max(contributions) + 1):
+        amount = sum(1 for c in contributions if c >= level)
+        eligible = sum(1 << seat for seat, c in enumerate(contributions) if c >= level and not folded >> seat & 1)
+        if pots and (pots[-1][1] == eligible or not eligible):
+            pots[-1][0] += amount
+        else:
+            pots.append([amount, eligible])
+    return [Pot(amount, eligible) for amount, eligible in pots]
+
+
+class TestBuildPots(PokerTestCase):
+
+    def test_no_contributions(self):
+        self.assertListEqual([Pot(0, 0b101)], build_pots([0, 0, 0], folded=0b010))
+
+    def test_side_pots(self):
+        self.assertListEqual([Pot(400, 0b1101), Pot(300, 0b1100), Pot(200, 0b0100)],
+                             build_pots([100, 300, 300, 200], folded=0b0010))
+
+    def test_chips_only_folded_players_matched_join_the_pot_below(self):
+        self.assertListEqual([Pot(30, 0b101), Pot(200, 0b100)], build_pots([10, 200, 20], folded=0b010))
+
+    def test_ten_handed_all_ins_match_reference(self):
+        rng = random.Random(1700)
+        for _ in range(300):
+            contributions = [rng.choice([0, 5, 20, 20, 50, 75, 100, 100, 250]) for _ in range(10)]
+            folded = rng.getrandbits(10)
+            if not max(contributions):
+                continue
+            pots = build_pots(contributions, folded)
+
+            self.assertListEqual(layered_pots(contributions, folded), pots)
+            self.assertEqual(sum(contributions), sum(pot.amount for pot in pots))
+
+
+class TestPotQueries(PokerTestCase):
+
+    def test_seat_pots(self):
+        pots = [Pot(400, 0b1111), Pot(600, 0b1110), Pot(400, 0b1100)]
+
+        self.assertEqual([0b001, 0b011, 0b111, 0b111], seat_pots(pots, 4))
+        self.assertEqual([1, 2, 3], pots[1].eligible_seats())
+        self.assertTrue(pots[2].is_eligible(3))
+        self.assertFalse(pots[2].is_eligible(1))
+
+    def test_split_pot_odd_chips(self):
+        self.assertEqual([34, 34, 33], split_pot(101, 3))
+        self.assertEqual([50, 50], split_pot(100, 2))
+        self.assertEqual([7], split_pot(7, 1))
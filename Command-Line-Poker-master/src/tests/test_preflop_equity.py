@@ -0,0 +1,63 @@
+from itertools import combinations
+
+import numpy as np
+
+from src.poker.card import Card
+from src.poker.utils import card_utils
+from src.poker.utils.equity import sample_equity
+from src.poker.utils.preflop_equity import (NUM_STARTING_HANDS, _estimate_entry, preflop_equity,
+                                            representative_hole_cards, starting_hand_index, starting_hand_name)
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+class TestStartingHandClasses(PokerTestCase):
+
+    def test_every_hole_card_pair_has_a_class(self):
+        counts = np.bincount([starting_hand_index(hole_cards) for hole_cards in combinations(range(52), 2)],
+                             minlength=NUM_STARTING_HANDS)
+
+        self.assertEqual(NUM_STARTING_HANDS, len(counts))
+        names = [starting_hand_name(index) for index in range(NUM_STARTING_HANDS)]
+        self.assertEqual(NUM_STARTING_HANDS, len(set(names)))
+        for name, count in zip(names, counts):
+            expected = 6 if len(name) == 2 else 4 if name.endswith('s') else 12
+            self.assertEqual(expected, count, name)
+
+    def test_names(self):
+        self.assertEqual('AA', starting_hand_name(starting_hand_index([Card(14, 'S'), Card(14, 'H')])))
+        self.assertEqual('AKs', starting_hand_name(starting_hand_index([Card(13, 'D'), Card(14, 'D')])))
+        self.assertEqual('72o', starting_hand_name(starting_hand_index([Card(2, 'C'), Card(7, 'H')])))
+
+    def test_representatives_belong_to_their_class(self):
+        for index in range(NUM_STARTING_HANDS):
+            self.assertEqual(index, starting_hand_index(representative_hole_cards(index)))
+
+
+class TestPreflopEquity(PokerTestCase):
+
+    def test_lookup_matches_rollouts(self):
+        hole_cards = card_utils.cards_to_ints([Card(12, 'H'), Card(11, 'H')])
+        for num_opponents in (1, 4, 9):
+            rollouts = sample_equity(hole_cards, [], num_opponents, samples=20000, rng=np.random.default_rng(5112))
+
+            self.assertAlmostEqual(rollouts.equity, preflop_equity(hole_cards, num_opponents), delta=0.015)
+
+    def test_aces_are_best_and_equity_falls_with_opponents(self):
+        aces = [Card(14, 'S'), Card(14, 'H')]
+        equities = [preflop_equity(aces, num_opponents) for num_opponents in range(1, 10)]
+
+        self.assertAlmostEqual(0.85, equities[0], delta=0.01)
+        self.assertListEqual(sorted(equities, reverse=True), equities)
+        for index in range(NUM_STARTING_HANDS):
+            self.assertLessEqual(preflop_equity(representative_hole_cards(index), 1), equities[0])
+
+    def test_number_of_opponents_is_checked(self):
+        with self.assertRaises(ValueError):
+            preflop_equity([Card(14, 'S'), Card(14, 'H')], 10)
+
+    def test_table_is_reproducible(self):
+        index = starting_hand_index([Card(9, 'C'), Card(8, 'C')])
+
+        # The shipped table was generated with the defaults of generate_table
+        self.assertEqual(np.float32(_estimate_entry(index, 9, samples=50000, seed=0)),
+                         np.float32(preflop_equity(representative_hole_cards(index), 9)))
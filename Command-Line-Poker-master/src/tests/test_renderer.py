@@ -0,0 +1,83 @@
+import io
+from unittest.mock import patch
+
+from blessed import Terminal
+
+from src.poker.players.player import Player
+from src.poker.prompts import text_prompt
+from src.poker.prompts.renderer import TableRenderer
+from src.poker.table import Table
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+class MockConcretePlayerClass(Player):
+    def choose_next_move(self, table_raise_amount, num_times_table_raised, table_last_bet):
+        pass
+
+
+class TestTableRenderer(PokerTestCase):
+
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.term = Terminal(kind='xterm-256color', stream=self.stream, force_styling=True)
+        self.renderer = TableRenderer(self.term)
+
+    def test_first_frame_is_drawn_in_full(self):
+        self.renderer.draw(['a', 'b', 'c'])
+
+        self.assertTrue(self.stream.getvalue().startswith(self.term.home + self.term.clear))
+        self.assertEqual(3, self.renderer.lines_drawn)
+
+    def test_only_changed_lines_are_redrawn(self):
+        self.renderer.draw(['a', 'b', 'c'])
+        self.stream.truncate(0)
+        self.stream.seek(0)
+
+        self.renderer.draw(['a', 'B', 'c', 'd'])
+
+        output = self.stream.getvalue()
+        self.assertEqual(5, self.renderer.lines_drawn)
+        self.assertIn(self.term.move_yx(1, 0) + 'B' + self.term.clear_eol, output)
+        self.assertIn(self.term.move_yx(3, 0) + 'd' + self.term.clear_eol, output)
+        self.assertNotIn(self.term.move_yx(0, 0) + 'a', output)
+        self.assertTrue(output.endswith(self.term.move_yx(4, 0) + self.term.clear_eos))
+
+    def test_invalidate_redraws_everything(self):
+        self.renderer.draw(['a', 'b'])
+        self.renderer.invalidate()
+
+        self.renderer.draw(['a', 'b'])
+
+        self.assertEqual(4, self.renderer.lines_drawn)
+
+    def test_plain_output_prints_every_frame(self):
+        stream = io.StringIO()
+        renderer = TableRenderer(Terminal(stream=stream), stream)
+
+        renderer.draw(['a', 'b'])
+        renderer.draw(['a', 'c'])
+
+        self.assertEqual('a\nb\na\nc\n', stream.getvalue())
+
+
+class TestShowTable(PokerTestCase):
+
+    @patch('src.poker.prompts.text_prompt.sleep')
+    @patch('os.system', side_effect=AssertionError('started a process'))
+    def test_bet_only_redraws_its_player(self, *_):
+        players = [MockConcretePlayerClass(name) for name in ('Alice', 'Bob', 'Carol')]
+        for player in players:
+            player.chips = 1000
+        table = Table()
+        table.big_blind = 50
+        table.reset(players)
+        stream = io.StringIO()
+        renderer = TableRenderer(Terminal(kind='xterm-256color', stream=stream, force_styling=True))
+
+        with patch('src.poker.prompts.text_prompt.table_renderer', renderer):
+            text_prompt.show_table(players, table)
+            lines_drawn = renderer.lines_drawn
+            players[1].match_bet(100)
+            text_prompt.show_table(players, table)
+
+        self.assertEqual(1, renderer.lines_drawn - lines_drawn)
@@ -1,27 +1,43 @@
 from unittest.mock import Mock
 
 from src.poker.card import Card
+from src.poker.enums.betting_move import BettingMove
+from src.poker.players.player import Player
+from src.poker.pot import Pot
 from src.poker.table import Table
 from src.tests.test_utils.test_utils import PokerTestCase
 
 
+class MockConcretePlayerClass(Player):
+    def choose_next_move(self, table_raise_amount, num_times_table_raised, table_last_bet):
+        pass
+
+
+def make_players(*chips):
+    players = []
+    for i, amount in enumerate(chips):
+        player = MockConcretePlayerClass(f'Player {i}')
+        player.chips = amount
+        players.append(player)
+    return players
+
+
 class TestTableReset(PokerTestCase):
 
     def test_reset(self):
-        active_players = []
+        active_players = make_players(1000, 1000)
         table = Table()
         table.big_blind = 50
         table.community = [Card(3, 'D'), Card(9, 'H')]
-        table.pots = [[300, active_players]]
-        table.pot_transfers = [300, 400]
+        table.pots = [Pot(300, 0b11), Pot(100, 0b10)]
         table.last_bet = 100
         table.num_times_raised = 1
 
         table.reset(active_players)
 
         self.assertEqual([], table.community)
-        self.assertListEqual([[0, active_players]], table.pots)
-        self.assertEqual([], table.pot_transfers)
+        self.assertListEqual([Pot(0, 0b11)], table.pots)
+        self.assertEqual(active_players, table.seats)
         self.assertEqual(0, table.last_bet)
         self.assertEqual(0, table.num_times_raised)
         self.assertEqual(table.big_blind, table.raise_amount)
@@ -70,4 +86,64 @@ class TestTableCheckIncreaseBigBlind(PokerTestCase):
         self.assertFalse(table.check_increase_big_blind())
 
         table.hands_played = 11
-        self.assertFalse(table.check_increase_big_blind())
\ No newline at end of file
+        self.assertFalse(table.check_increase_big_blind())
+
+
+class TestTableSidePots(PokerTestCase):
+
+    def test_all_ins_at_different_levels(self):
+        players = make_players(100, 300, 1000, 1000)
+        table = Table()
+        table.reset(players)
+        table.last_bet = 500
+        for player in players[:2]:
+            table.take_bet(player, BettingMove.ALL_IN)
+        for player in players[2:]:
+            table.take_bet(player, BettingMove.CALLED)
+
+        table.collect_bets(players)
+
+        self.assertListEqual([Pot(400, 0b1111), Pot(600, 0b1110), Pot(400, 0b1100)], table.pots)
+        self.assertEqual(1400, table.pot_total)
+        self.assertTrue(all(player.bet == 0 for player in players))
+        self.assertEqual(0b001, table.eligible_pots(players[0]))
+        self.assertEqual(0b111, table.eligible_pots(players[3]))
+        self.assertEqual(players[1:], table.eligible_players(1))
+
+    def test_all_ins_at_same_level_share_a_pot(self):
+        players = make_players(200, 200, 1000)
+        table = Table()
+        table.reset(players)
+        table.last_bet = 200
+        table.take_bet(players[0], BettingMove.ALL_IN)
+        table.take_bet(players[1], BettingMove.ALL_IN)
+        table.take_bet(players[2], BettingMove.CALLED)
+
+        table.collect_bets(players)
+
+        self.assertListEqual([Pot(600, 0b111)], table.pots)
+
+    def test_folded_players_chips_stay_in_pots(self):
+        players = make_players(1000, 1000, 50)
+        table = Table()
+        table.reset(players)
+        players[0].match_bet(100)
+        players[1].match_bet(100)
+        players[2].go_all_in()
+        table.collect_bets(players)
+        players[0].match_bet(200)
+        players[1].fold()
+        table.collect_bets(players)
+
+        self.assertListEqual([Pot(150, 0b101), Pot(300, 0b001)], table.pots)
+
+    def test_odd_chips_go_left_of_dealer(self):
+        players = make_players(0, 0, 0, 0)
+        table = Table()
+        table.reset(players)
+        players[2].is_dealer = True
+        table.pots = [Pot(101, 0b1111)]
+
+        table.award_pot(0, [players[1], players[0], players[3]])
+
+        self.assertEqual([34, 33, 0, 34], [player.chips for player in players])
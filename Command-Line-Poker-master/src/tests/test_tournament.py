@@ -0,0 +1,38 @@
+from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.tournament import run_tournament
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+class TestRunTournament(PokerTestCase):
+
+    def test_run_tournament(self):
+        styles = [ComputerPlayingStyle.SAFE, ComputerPlayingStyle.RISKY, ComputerPlayingStyle.RANDOM]
+
+        result = run_tournament(styles, num_hands=500, num_workers=1, seed=7, hands_per_match=50)
+
+        self.assertEqual(10, result.matches)
+        self.assertLessEqual(result.hands_played, 500)
+        self.assertEqual(styles, [seat.playing_style for seat in result.seats])
+        for seat in result.seats:
+            low, high = seat.confidence_interval
+            self.assertLessEqual(low, seat.chips_per_100)
+            self.assertGreaterEqual(high, seat.chips_per_100)
+        # Chips only move between players
+        self.assertEqual(0, sum(seat.chips_won for seat in result.seats))
+
+    def test_seats_search_agents(self):
+        styles = [ComputerPlayingStyle.EXPECTIMINIMAX, ComputerPlayingStyle.RISKY]
+
+        result = run_tournament(styles, num_hands=4, num_workers=1, seed=7, hands_per_match=2)
+
+        self.assertEqual(2, result.matches)
+        self.assertEqual(styles, [seat.playing_style for seat in result.seats])
+
+    def test_results_do_not_depend_on_workers(self):
+        styles = [ComputerPlayingStyle.SAFE, ComputerPlayingStyle.RISKY]
+
+        single = run_tournament(styles, num_hands=200, num_workers=1, seed=3, hands_per_match=20)
+        parallel = run_tournament(styles, num_hands=200, num_workers=2, seed=3, hands_per_match=20)
+
+        self.assertEqual(single.hands_played, parallel.hands_played)
+        self.assertListEqual([seat.chips_won for seat in single.seats], [seat.chips_won for seat in parallel.seats])